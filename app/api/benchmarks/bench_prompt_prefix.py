@@ -0,0 +1,82 @@
+"""
+Measure how much of each websocket request repeats the previous one.
+
+Run from app/api:
+
+    python -m benchmarks.bench_prompt_prefix
+
+Consecutive requests are rendered for every action type with different
+activity, and the shared prefix between consecutive requests of an action is
+reported. This is a local approximation of what a provider-side prompt cache
+can reuse: the static instructions should be shared, the activity should not.
+"""
+import argparse
+import json
+from typing import Dict
+
+from services.prompt_builder import build_prompt, build_system_prompt, render_request, shared_prefix_length
+
+SAMPLES = [
+    "2025-03-14:\n - [Commit] in repo-a: Fix login\n",
+    "2025-03-15:\n - [Commit] in repo-b: Add export\n - [Issue] in repo-b: Crash on save\n",
+    "2025-03-16:\n - [Pull Request] in repo-a: Refactor auth (PR #7)\n",
+]
+
+
+class PrefixReuseTracker:
+    """Shared prefix between consecutive requests of each action type."""
+
+    def __init__(self):
+        self._last: Dict[str, str] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def record(self, action_type: str, request_text: str) -> float:
+        """
+        Record a request and return the fraction of it shared with the previous one.
+
+        Args:
+            action_type: The websocket action type.
+            request_text: Output of `render_request`.
+
+        Returns:
+            float: Shared prefix length over request length (0 for the first request).
+        """
+        previous = self._last.get(action_type)
+        shared = shared_prefix_length(previous, request_text) if previous is not None else 0
+        self._last[action_type] = request_text
+
+        stats = self._stats.setdefault(action_type, {"requests": 0, "shared_chars": 0, "total_chars": 0})
+        stats["requests"] += 1
+        stats["shared_chars"] += shared
+        stats["total_chars"] += len(request_text)
+        return shared / len(request_text) if request_text else 0.0
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Return per action counters and the overall prefix reuse ratio."""
+        return {
+            action_type: {
+                **stats,
+                "reuse_ratio": stats["shared_chars"] / stats["total_chars"] if stats["total_chars"] else 0.0
+            }
+            for action_type, stats in self._stats.items()
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.parse_args()
+
+    tracker = PrefixReuseTracker()
+    for action_type in ("recap", "release", "pull_request"):
+        for i, actions in enumerate(SAMPLES):
+            request_text = render_request(
+                build_system_prompt(action_type),
+                build_prompt(action_type, actions, n=3 + i, src_branch="feature", target_branch="main")
+            )
+            ratio = tracker.record(action_type, request_text)
+            print(f"{action_type:<13} request {i + 1}: {ratio:6.1%} shared prefix")
+    print(json.dumps(tracker.stats(), indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Compare the per-request overhead and memory of the rate-limiting middleware
+against the previous BaseHTTPMiddleware implementation.
+
+Run from app/api:
+
+    python -m benchmarks.bench_rate_limiter --requests 20000 --clients 1000
+
+Both middlewares wrap the same minimal ASGI app and are driven directly
+through the ASGI interface, so the timings exclude the HTTP server. The
+previous implementation is reproduced below as `LegacyRateLimitMiddleware`.
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+from collections import defaultdict
+
+from fastapi import HTTPException, Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from midleware import OriginAndRateLimitMiddleware
+
+
+async def endpoint(scope, receive, send):
+    """Minimal ASGI app answering 200 with an empty JSON object."""
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+class LegacyRateLimitMiddleware(BaseHTTPMiddleware):
+    """The previous implementation: a list of timestamps per IP, rebuilt on every request."""
+
+    def __init__(self, app, rate_limit: int, window_seconds: int):
+        super().__init__(app)
+        self.rate_limit = rate_limit
+        self.window_seconds = window_seconds
+        self.request_logs = defaultdict(list)
+
+    async def dispatch(self, request: Request, call_next):
+        client_ip = request.client.host
+        now = time.time()
+        self.request_logs[client_ip] = [
+            t for t in self.request_logs[client_ip] if now - t < self.window_seconds
+        ]
+        if len(self.request_logs[client_ip]) >= self.rate_limit:
+            raise HTTPException(status_code=429, detail="Too Many Requests")
+        self.request_logs[client_ip].append(now)
+        return await call_next(request)
+
+
+async def drive(app, n_requests: int, n_clients: int) -> float:
+    """Send n_requests GET requests spread over n_clients IPs; return seconds elapsed."""
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    start = time.perf_counter()
+    for i in range(n_requests):
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": "/repos",
+            "raw_path": b"/repos",
+            "query_string": b"session_id=abc",
+            "root_path": "",
+            "headers": [(b"host", b"localhost")],
+            "client": (f"10.0.{(i % n_clients) // 256}.{(i % n_clients) % 256}", 50000),
+            "server": ("localhost", 7860),
+        }
+        await app(scope, receive, send)
+    return time.perf_counter() - start
+
+
+def measure(name: str, app, n_requests: int, n_clients: int) -> None:
+    tracemalloc.start()
+    elapsed = asyncio.run(drive(app, n_requests, n_clients))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<10} {elapsed / n_requests * 1e6:8.1f} us/request  peak {peak / 1024:8.0f} KiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--window", type=int, default=60)
+    args = parser.parse_args()
+
+    # High enough that no request is rejected: only the bookkeeping is measured
+    limit = args.requests
+    measure("legacy", LegacyRateLimitMiddleware(endpoint, limit, args.window), args.requests, args.clients)
+    measure(
+        "asgi",
+        OriginAndRateLimitMiddleware(endpoint, allowed_origins=[], rate_limit=limit, window_seconds=args.window, session_limit=limit),
+        args.requests,
+        args.clients
+    )
+
+
+if __name__ == "__main__":
+    main()
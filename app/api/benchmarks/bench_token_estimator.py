@@ -0,0 +1,139 @@
+"""
+Compare the calibrated token estimator against the configured tokenizer.
+
+Run from app/api:
+
+    python -m benchmarks.bench_token_estimator --repo /path/to/repo
+    python -m benchmarks.bench_token_estimator --encoding cl100k_base --model gpt-4o
+    python -m benchmarks.bench_token_estimator --tokenizer-file tokenizer.json --model deepseek-chat
+
+Without --encoding or --tokenizer-file the tokenizer of the LLM configured through the environment
+(the one `/actions` uses) is benchmarked. The printed calibration can be copied
+into `services.token_estimator.TOKEN_RATIOS`.
+"""
+import argparse
+import subprocess
+import time
+from datetime import datetime, timezone
+
+from git_recap.utils import parse_entries_to_txt
+from services.llm_service import trim_messages
+from services.token_estimator import (
+    calibrate,
+    estimate_tokens,
+    estimation_errors,
+    get_model_family,
+)
+
+
+def load_entries(repo: str, limit: int):
+    """Build activity entries from the commit history of a local repository."""
+    output = subprocess.run(
+        ["git", "-C", repo, "log", "--all", f"-n{limit}", "--format=%H%x1f%an%x1f%at%x1f%B%x1e"],
+        capture_output=True,
+        text=True,
+        check=True
+    ).stdout
+    entries = []
+    for record in output.split("\x1e"):
+        if not record.strip():
+            continue
+        sha, author, timestamp, message = record.strip("\n").split("\x1f", 3)
+        entries.append({
+            "type": "commit",
+            "repo": repo.rstrip("/").split("/")[-1],
+            "message": message.strip(),
+            "sha": sha,
+            "author": author,
+            "timestamp": datetime.fromtimestamp(int(timestamp), tz=timezone.utc).isoformat()
+        })
+    entries.sort(key=lambda entry: entry["timestamp"])
+    return entries
+
+
+def load_tokenizer(encoding: str, tokenizer_file: str, model: str):
+    """Return (tokenizer_fn, model) for the requested tokenizer."""
+    if tokenizer_file:
+        from tokenizers import Tokenizer
+        tokenizer = Tokenizer.from_file(tokenizer_file)
+        return lambda text: tokenizer.encode(text, add_special_tokens=False).ids, model
+    if encoding:
+        import tiktoken
+        return tiktoken.get_encoding(encoding).encode, model
+
+    from aicore.config import Config
+    from aicore.llm import Llm
+    llm = Llm.from_config(Config.from_environment().llm)
+    return llm.tokenizer, llm.config.model
+
+
+class CountingTokenizer:
+    """Wrap a tokenizer to count calls."""
+
+    def __init__(self, tokenizer_fn):
+        self.tokenizer_fn = tokenizer_fn
+        self.calls = 0
+
+    def __call__(self, text):
+        self.calls += 1
+        return self.tokenizer_fn(text)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repo", default=".", help="Repository whose history is used as sample text")
+    parser.add_argument("--limit", type=int, default=5000, help="Maximum number of commits to sample")
+    parser.add_argument("--encoding", default=None, help="tiktoken encoding to use instead of the configured LLM")
+    parser.add_argument("--tokenizer-file", default=None, help="Hugging Face tokenizer.json to use instead of the configured LLM")
+    parser.add_argument("--model", default="gpt-4o", help="Model name used with --encoding or --tokenizer-file")
+    parser.add_argument("--max-tokens", type=int, default=16000, help="Budget used for the trimming comparison")
+    args = parser.parse_args()
+
+    entries = load_entries(args.repo, args.limit)
+    texts = [line for line in parse_entries_to_txt(entries).splitlines() if line.strip()]
+    tokenizer_fn, model = load_tokenizer(args.encoding, args.tokenizer_file, args.model)
+    print(f"{len(texts)} sample lines, model {model} (family {get_model_family(model)})")
+
+    start = time.perf_counter()
+    exact_total = sum(len(tokenizer_fn(text)) for text in texts)
+    exact_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    estimated_total = sum(estimate_tokens(text, model) for text in texts)
+    estimate_seconds = time.perf_counter() - start
+
+    print(f"exact tokenizer : {exact_total:>9} tokens in {exact_seconds * 1000:9.2f} ms")
+    print(f"estimator       : {estimated_total:>9} tokens in {estimate_seconds * 1000:9.2f} ms")
+    print(f"total error     : {(estimated_total - exact_total) / max(1, exact_total):+.2%}")
+    for name, value in estimation_errors(texts, tokenizer_fn, model).items():
+        print(f"{name:<16}: {value:.2%}")
+    print(f"calibration     : {calibrate(texts, tokenizer_fn)}")
+
+    # Trimming: every entry tokenized once (a lower bound of the previous
+    # implementation, which re-tokenized the whole list per removed entry)
+    # against the estimator-first trimming.
+    start = time.perf_counter()
+    counts = [len(tokenizer_fn(str(entry))) for entry in entries]
+    kept, total = 0, 0
+    for count in reversed(counts):
+        if total + count > args.max_tokens:
+            break
+        total += count
+        kept += 1
+    baseline_seconds = time.perf_counter() - start
+
+    counting = CountingTokenizer(tokenizer_fn)
+    start = time.perf_counter()
+    trimmed = trim_messages(list(entries), counting, args.max_tokens, model)
+    trim_seconds = time.perf_counter() - start
+    trimmed_tokens = sum(len(tokenizer_fn(str(entry))) for entry in trimmed)
+
+    print(f"baseline trim   : kept {kept:>6} entries, {len(entries):>6} tokenizer calls, {baseline_seconds * 1000:9.2f} ms")
+    print(
+        f"estimator trim  : kept {len(trimmed):>6} entries, {counting.calls:>6} tokenizer calls, "
+        f"{trim_seconds * 1000:9.2f} ms ({trimmed_tokens} tokens)"
+    )
+
+
+if __name__ == "__main__":
+    main()
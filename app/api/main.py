@@ -1,20 +1,47 @@
 from fastapi import FastAPI
 from fastapi.responses import RedirectResponse
 from fastapi.middleware.cors import CORSMiddleware
+from contextlib import asynccontextmanager
 import asyncio
+import logging
+import os
 
 from server.routes import router as api_router
-from services.llm_service import simulate_llm_response
+from services.llm_service import simulate_llm_response, llm_sessions
+from services.fetcher_service import clone_manager, fetchers, live_clone_dirs, single_flight
+from services.executors import executor_stats, git_executor, loop_lag
+from services.result_cache import result_cache
+from services.recap_service import warm_ups
+from services.session_backend import session_backend
+from services.session_expiry import session_expiry
 from server.websockets import router as websocket_router
 from midleware import OriginAndRateLimitMiddleware, ALLOWED_ORIGIN
 
+# Worker processes; sessions are shared through SESSION_BACKEND_URL
+UVICORN_WORKERS = int(os.getenv("UVICORN_WORKERS", "1"))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Remove clones leaked by a previous crash or restart (done once, before
+    # forking, when running several workers)
+    if UVICORN_WORKERS == 1:
+        await git_executor.run(clone_manager.sweep_orphans, live_clone_dirs())
+    # Single sweeper expiring idle sessions across LLM clients, fetchers and websockets
+    session_expiry.start()
+    loop_lag.start()
+    yield
+    await loop_lag.stop()
+    await session_expiry.stop()
+
 # Initialize FastAPI app
-app = FastAPI(title="LLM Service API")
+app = FastAPI(title="LLM Service API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
     allow_origins=ALLOWED_ORIGIN,
-    allow_methods=["GET", "POST", "OPTIONS"]
+    allow_methods=["GET", "POST", "OPTIONS"],
+    allow_headers=["If-None-Match"],
+    expose_headers=["ETag"]
 )
 app.add_middleware(OriginAndRateLimitMiddleware)
 
@@ -29,7 +56,16 @@ async def root():
 # Health check endpoint
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
+    return {
+        "status": "healthy",
+        "sessions": {store.name: store.stats() for store in (llm_sessions, fetchers)},
+        "expiry": session_expiry.stats(),
+        "clones": await clone_manager.astats(),
+        "executors": executor_stats(),
+        "result_cache": result_cache.stats(),
+        "single_flight": single_flight.stats(),
+        "warm_ups": warm_ups.stats()
+    }
 
 @app.get("/health2")
 async def stream_health_check():
@@ -41,4 +77,10 @@ if __name__ == "__main__":
     import uvicorn
 
     load_dotenv()
-    uvicorn.run(app, host="0.0.0.0", port=7860)
+    if UVICORN_WORKERS > 1:
+        if not session_backend.shared:
+            logging.warning("Several workers with the memory session backend: set SESSION_BACKEND_URL to share sessions")
+        clone_manager.sweep_orphans()
+        uvicorn.run("main:app", host="0.0.0.0", port=7860, workers=UVICORN_WORKERS)
+    else:
+        uvicorn.run(app, host="0.0.0.0", port=7860)
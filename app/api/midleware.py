@@ -1,36 +1,165 @@
+import json
+import math
 import os
 import time
-from fastapi import Request, HTTPException
-from starlette.middleware.base import BaseHTTPMiddleware
-from collections import defaultdict
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
 
 ALLOWED_ORIGIN = [
     os.getenv("VITE_FRONTEND_HOST")
 ]
 RATE_LIMIT = int(os.getenv("RATE_LIMIT", "30"))  # Max requests per time window
 WINDOW_SECONDS = int(os.getenv("WINDOW_SECONDS", "3"))  # Time window in seconds
+RATE_LIMIT_SESSION = int(os.getenv("RATE_LIMIT_SESSION", "0"))  # Max requests per window per session (0: off)
+RATE_LIMIT_ROUTES = os.getenv("RATE_LIMIT_ROUTES", "")  # e.g. "/clone-repo=5,/actions=10", per IP and route
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))  # Counters kept before evicting the idlest
 
-# Store timestamps of requests per IP
-request_logs = defaultdict(list)
 
+def parse_route_limits(spec: str) -> Dict[str, int]:
+    """
+    Parse per-route limits written as "path=limit,path=limit".
 
-class OriginAndRateLimitMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        origin = request.headers.get("origin")
-        if origin and origin not in ALLOWED_ORIGIN:
-            raise HTTPException(status_code=403, detail="Forbidden: origin not allowed")
+    Args:
+        spec: The limits, e.g. "/clone-repo=5,/actions=10".
 
-        # Rate limiting logic based on client IP
-        client_ip = request.client.host
-        now = time.time()
+    Returns:
+        Dict[str, int]: Limit per path prefix.
+    """
+    limits = {}
+    for item in spec.split(","):
+        path, _, limit = item.strip().partition("=")
+        if path and limit:
+            limits[path.strip()] = int(limit)
+    return limits
 
-        # Clean up old request timestamps outside the current window
-        request_logs[client_ip] = [
-            t for t in request_logs[client_ip] if now - t < WINDOW_SECONDS
+
+class SlidingWindowLimiter:
+    """
+    Sliding-window counter rate limiter with constant memory per key.
+
+    Each key keeps the request counts of the current and previous fixed
+    windows; the previous count is weighted by how much of it still overlaps
+    the sliding window. Keys are kept in least-recently-used order, so idle
+    keys (no request for two windows) are evicted from the front in O(1), and
+    at most max_keys counters are kept.
+    """
+
+    def __init__(self, limit: int, window_seconds: float, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.max_keys = max_keys
+        # key -> [window start, previous window count, current window count]
+        self._counters: "OrderedDict[str, List[float]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._counters)
+
+    def _evict(self, now: float) -> None:
+        horizon = now - 2 * self.window_seconds
+        while self._counters:
+            key, counter = next(iter(self._counters.items()))
+            if counter[0] >= horizon and len(self._counters) <= self.max_keys:
+                break
+            self._counters.popitem(last=False)
+
+    def hit(self, key: str, now: Optional[float] = None) -> float:
+        """
+        Count a request for key, unless it exceeds the limit.
+
+        Args:
+            key: The rate-limited key (client IP, session, ...).
+            now: Current time (default: time.monotonic()).
+
+        Returns:
+            float: 0 if the request is allowed, else seconds until it would be.
+        """
+        now = time.monotonic() if now is None else now
+        window_start = now - now % self.window_seconds
+        counter = self._counters.get(key)
+        if counter is None:
+            counter = self._counters[key] = [window_start, 0, 0]
+            self._evict(now)
+        else:
+            self._counters.move_to_end(key)
+            if counter[0] != window_start:
+                elapsed_windows = round((window_start - counter[0]) / self.window_seconds)
+                counter[1] = counter[2] if elapsed_windows == 1 else 0
+                counter[2] = 0
+                counter[0] = window_start
+        overlap = 1 - (now - window_start) / self.window_seconds
+        if counter[1] * overlap + counter[2] >= self.limit:
+            return window_start + self.window_seconds - now
+        counter[2] += 1
+        return 0
+
+
+class OriginAndRateLimitMiddleware:
+    """
+    Pure ASGI middleware rejecting foreign origins and rate limiting requests.
+
+    Requests are limited per client IP, and optionally per session
+    (`session_id` query parameter) and per IP and route prefix. Websocket and
+    lifespan events are passed through untouched, and the response (including
+    streamed ones) is never wrapped.
+    """
+
+    def __init__(
+        self,
+        app,
+        allowed_origins: Optional[List[str]] = None,
+        rate_limit: int = RATE_LIMIT,
+        window_seconds: float = WINDOW_SECONDS,
+        session_limit: int = RATE_LIMIT_SESSION,
+        route_limits: Optional[Dict[str, int]] = None
+    ):
+        self.app = app
+        self.allowed_origins = {
+            origin.encode("latin-1") for origin in (ALLOWED_ORIGIN if allowed_origins is None else allowed_origins) if origin
+        }
+        self.ip_limiter = SlidingWindowLimiter(rate_limit, window_seconds)
+        self.session_limiter = SlidingWindowLimiter(session_limit, window_seconds) if session_limit else None
+        route_limits = parse_route_limits(RATE_LIMIT_ROUTES) if route_limits is None else route_limits
+        self.route_limiters: List[Tuple[str, SlidingWindowLimiter]] = [
+            (path, SlidingWindowLimiter(limit, window_seconds)) for path, limit in route_limits.items()
         ]
 
-        if len(request_logs[client_ip]) >= RATE_LIMIT:
-            raise HTTPException(status_code=429, detail="Too Many Requests")
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                if value not in self.allowed_origins:
+                    await self._reject(send, 403, "Forbidden: origin not allowed")
+                    return
+                break
+
+        client = scope.get("client")
+        client_ip = client[0] if client else "unknown"
+        retry_after = self.ip_limiter.hit(client_ip)
+        if not retry_after and self.route_limiters:
+            path = scope["path"]
+            for prefix, limiter in self.route_limiters:
+                if path.startswith(prefix):
+                    retry_after = limiter.hit(f"{prefix}|{client_ip}")
+                    break
+        if not retry_after and self.session_limiter and scope.get("query_string"):
+            session_id = parse_qs(scope["query_string"].decode("latin-1")).get("session_id")
+            if session_id:
+                retry_after = self.session_limiter.hit(session_id[0])
+        if retry_after:
+            await self._reject(send, 429, "Too Many Requests", retry_after)
+            return
+
+        await self.app(scope, receive, send)
 
-        request_logs[client_ip].append(now)
-        return await call_next(request)
+    @staticmethod
+    async def _reject(send, status_code: int, detail: str, retry_after: float = 0) -> None:
+        body = json.dumps({"detail": detail}).encode("utf-8")
+        headers = [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode("latin-1"))]
+        if retry_after:
+            headers.append((b"retry-after", str(math.ceil(retry_after)).encode("latin-1")))
+        await send({"type": "http.response.start", "status": status_code, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
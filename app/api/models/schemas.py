@@ -5,7 +5,8 @@ import re
 
 class CloneRequest(BaseModel):
     """Request model for repository cloning endpoint."""
-    url: str
+    url: Optional[str] = None
+    urls: List[str] = Field(default_factory=list, description="Repository URLs recapped together in one session.")
 
 class ChatRequest(BaseModel):
     session_id: str = ""
@@ -209,4 +210,19 @@ class ActionsResponse(BaseModel):
                 "trimmed_count": 15,
                 "total_count": 50
             }
-        }
\ No newline at end of file
+        }
+
+# --- Bootstrap Response Schema ---
+class BootstrapResponse(BaseModel):
+    """
+    Response of the bootstrap endpoint: the first screen's data in one request.
+    
+    Sections that were not requested or that failed are None; the reason of
+    each failure is in errors.
+    """
+    session_id: str = Field(..., description="Session identifier")
+    repos: Optional[List[str]] = Field(None, description="Repository names of the session")
+    current_author: Optional[GetCurrentAuthorResponse] = Field(None, description="Authenticated user, if any")
+    authors: Optional[GetAuthorsResponse] = Field(None, description="Authors of the selected repositories")
+    actions: Optional[ActionsResponse] = Field(None, description="Actions of the default recap window")
+    errors: Dict[str, str] = Field(default_factory=dict, description="Error detail of each failed section")
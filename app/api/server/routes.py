@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException, Request, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict
+from typing import Awaitable, Optional, List, Dict, TypeVar
 
 from models.schemas import (
     BranchListResponse,
@@ -15,46 +16,111 @@ from models.schemas import (
     AuthorInfo,
     ActionsResponse,
     GetCurrentAuthorResponse,
+    BootstrapResponse,
     CloneRequest
 )
 
-from services.llm_service import set_llm, get_llm, trim_messages
-from services.fetcher_service import store_fetcher, get_fetcher
+from services.llm_service import set_llm, aget_llm, trim_messages, get_max_history_tokens
+from services.executors import provider_executor
+from services.recap_service import (
+    BOOTSTRAP_SECTIONS,
+    aiter_bootstrap,
+    bootstrap,
+    default_query,
+    recap_actions,
+    start_warm_up,
+)
+from services.result_cache import conditional_response, result_cache
+from services.fetcher_service import (
+    aget_authored_messages,
+    aget_authors,
+    aget_current_author,
+    aget_fetcher,
+    aget_repos,
+    arun_fetcher,
+    astore_fetcher,
+    astore_url_fetcher,
+    clone_manager,
+)
 from git_recap.utils import parse_entries_to_txt, parse_releases_to_txt
 from aicore.llm.config import LlmConfig
 from datetime import datetime, timezone
 import requests
+import asyncio
+import json
 import os
 
 router = APIRouter()
 
+T = TypeVar("T")
+
 
 GITHUB_ACCESS_TOKEN_URL = 'https://github.com/login/oauth/access_token'
 
 
+async def cancel_on_disconnect(request: Request, coro: Awaitable[T], poll_seconds: float = 0.5) -> T:
+    """
+    Await coro, cancelling it if the client disconnects first.
+    
+    Cancelling the git helpers kills their git processes, so an abandoned
+    request does not keep cloning or reading history.
+    
+    Args:
+        request: The incoming request.
+        coro: The work to run on behalf of the request.
+        poll_seconds: How often the connection is checked.
+    
+    Returns:
+        The result of coro.
+    
+    Raises:
+        HTTPException: 499 if the client disconnected.
+    """
+    task = asyncio.ensure_future(coro)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=poll_seconds)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                task.cancel()
+                raise HTTPException(status_code=499, detail="Client disconnected")
+    finally:
+        if not task.done():
+            task.cancel()
+
+
 @router.post("/clone-repo")
-async def clone_repository(request: CloneRequest):
+async def clone_repository(request: CloneRequest, http_request: Request):
     """
-    Endpoint for cloning a repository from a URL.
+    Endpoint for cloning one or several repositories from URLs.
     
     Args:
-        request: CloneRequest containing the repository URL
+        request: CloneRequest containing the repository URL (or URLs, cloned
+            concurrently and recapped as one session)
         
     Returns:
         dict: Contains session_id for subsequent operations
         
     Raises:
-        HTTPException: 400 for invalid URL, 500 for cloning failure
+        HTTPException: 400 for invalid URL, 503 when the clone disk quota is
+            exhausted, 500 for cloning failure
     """
-    try:
-        response = await create_llm_session()
-        session_id = response.get("session_id")
-        store_fetcher(session_id, request.url, "URL")
-        return {"session_id": session_id}
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to clone repository: {str(e)}")
+    urls = [url for url in [request.url, *request.urls] if url]
+    if not urls:
+        raise HTTPException(status_code=400, detail="At least one repository URL is required")
+    async with clone_manager.admit(len(urls)):
+        try:
+            response = await create_llm_session()
+            session_id = response.get("session_id")
+            await cancel_on_disconnect(http_request, astore_url_fetcher(session_id, urls))
+            return {"session_id": session_id}
+        except HTTPException:
+            raise
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Failed to clone repository: {str(e)}")
 
 
 @router.get("/external-signup")
@@ -87,7 +153,9 @@ async def external_signup(app: str, accessToken: str, provider: str):
         "Accept-Encoding": "application/json"
     }
     
-    response = requests.get(GITHUB_ACCESS_TOKEN_URL, params=params, headers=headers)
+    response = await provider_executor.run(
+        requests.get, GITHUB_ACCESS_TOKEN_URL, params=params, headers=headers, timeout=30
+    )
     
     if response.status_code != 200:
         raise HTTPException(status_code=response.status_code, detail="Error fetching token from GitHub")
@@ -108,6 +176,9 @@ async def store_fetcher_endpoint(request: Request):
     """
     Endpoint to store the PAT associated with a session.
     
+    Starts a background warm-up of the session (repositories, current user
+    and the default 7-day actions), shared with the requests that follow.
+    
     Args:
         request: Contains JSON payload with 'session_id' and 'pat'
         
@@ -129,7 +200,9 @@ async def store_fetcher_endpoint(request: Request):
     
     response = await create_llm_session()  
     session_id = response.get("session_id")
-    username = store_fetcher(session_id, token, provider)
+    username = await astore_fetcher(session_id, token, provider)
+    # Prefetch the first screen while the user picks filters
+    start_warm_up(session_id, await aget_fetcher(session_id))
     return {"session_id": session_id, "username": username}
 
 
@@ -170,17 +243,19 @@ async def get_repos(session_id: str):
     Raises:
         HTTPException: 404 if session not found
     """
-    fetcher = get_fetcher(session_id)
-    return {"repos": fetcher.repos_names}
+    fetcher = await aget_fetcher(session_id)
+    return {"repos": await aget_repos(session_id, fetcher)}
 
 
 @router.get("/actions", response_model=ActionsResponse)
 async def get_actions(
+    request: Request,
     session_id: str,
     start_date: Optional[str] = Query(None),
     end_date: Optional[str] = Query(None),
     repo_filter: Optional[List[str]] = Query(None),
-    authors: Optional[List[str]] = Query(None)
+    authors: Optional[List[str]] = Query(None),
+    map_reduce: bool = Query(False)
 ):
     """
     Get actions for the specified session with optional filters.
@@ -195,6 +270,8 @@ async def get_actions(
         end_date: Optional end date filter
         repo_filter: Optional list of repositories to filter
         authors: Optional list of authors to filter
+        map_reduce: Whether the actions will be summarized with the websocket
+            map_reduce mode, which allows a much larger token budget
         
     Returns:
         ActionsResponse: Structured response with actions, message, and metadata
@@ -206,59 +283,25 @@ async def get_actions(
         repo_filter = sum([repo.split(",") for repo in repo_filter], [])
     if authors is not None:
         authors = sum([author.split(",") for author in authors], [])
-    fetcher = get_fetcher(session_id)
+    fetcher = await aget_fetcher(session_id)
     
     start_dt = datetime.fromisoformat(start_date).replace(tzinfo=timezone.utc) if start_date else None
     end_dt = datetime.fromisoformat(end_date).replace(tzinfo=timezone.utc) if end_date else None
 
-    if start_dt:
-        fetcher.start_date = start_dt
-    if end_dt:
-        fetcher.end_dt = end_dt
-    if repo_filter is not None:
-        fetcher.repo_filter = repo_filter
-    if authors is not None:
-        fetcher.authors = authors
+    # The fetcher is shared by the session's requests, so filters go in a query
+    query = fetcher.make_query(start_date=start_dt, end_date=end_dt, repos=repo_filter, authors=authors)
 
-    llm = get_llm(session_id)
-    actions = fetcher.get_authored_messages()
-    
-    # Store original count before trimming
-    original_count = len(actions)
-    
-    # Apply token limit trimming
-    trimmed_actions = trim_messages(actions, llm.tokenizer)
-    
-    # Calculate how many items were removed
-    trimmed_count = original_count - len(trimmed_actions)
-    
-    # Generate user-facing message if trimming occurred
-    message = None
-    if trimmed_count > 0:
-        message = (
-            f"We're running the free version with a maximum token limit for contextual input. "
-            f"To stay within this limit, we automatically trimmed {trimmed_count} older Git "
-            f"actionable{'s' if trimmed_count != 1 else ''} from the context. "
-            f"We hope you understand!"
-        )
-    
-    # Parse actions to text format
-    actions_txt = parse_entries_to_txt(trimmed_actions)
-    
-    # Return structured response
-    return ActionsResponse(
-        actions=actions_txt,
-        message=message,
-        trimmed_count=trimmed_count,
-        total_count=original_count
-    )
+    etag, payload = await cancel_on_disconnect(request, recap_actions(session_id, fetcher, query, map_reduce))
+    return conditional_response(request, etag, payload)
 
 
 @router.get("/release_notes")
 async def get_release_notes(
+    request: Request,
     session_id: str,
     repo_filter: Optional[List[str]] = Query(None),
-    num_old_releases: int = Query(..., ge=1)
+    num_old_releases: int = Query(..., ge=1),
+    map_reduce: bool = Query(False)
 ):
     """
     Generate release notes for the latest release of a single repository.
@@ -267,6 +310,8 @@ async def get_release_notes(
         session_id: The session identifier
         repo_filter: Must contain exactly one repository name
         num_old_releases: Number of previous releases to include for context
+        map_reduce: Whether the actions will be summarized with the websocket
+            map_reduce mode, which allows a much larger token budget
         
     Returns:
         dict: Contains actions and release notes text
@@ -279,12 +324,27 @@ async def get_release_notes(
     repo = repo_filter[0]
 
     try:
-        fetcher = get_fetcher(session_id)
+        fetcher = await aget_fetcher(session_id)
     except HTTPException:
         raise
 
+    llm = await aget_llm(session_id)
+    cache_key = result_cache.make_key(
+        session_id,
+        "release_notes",
+        provider=type(fetcher).__name__,
+        repo=repo,
+        num_old_releases=num_old_releases,
+        map_reduce=map_reduce,
+        model=llm.config.model
+    )
+    cached = result_cache.get(cache_key)
+    if cached is not None:
+        return conditional_response(request, *cached)
+
+    query = fetcher.make_query(repos=[repo])
     try:
-        releases = fetcher.fetch_releases()
+        releases = await arun_fetcher(fetcher, fetcher.fetch_releases, query)
     except NotImplementedError:
         raise HTTPException(status_code=400, detail="Release fetching is not supported for this provider.")
     except Exception as e:
@@ -320,16 +380,13 @@ async def get_release_notes(
         except Exception:
             raise HTTPException(status_code=500, detail="Release date is not a valid ISO format.")
 
-    fetcher.start_date = datetime.fromisoformat(start_date_iso)
-    fetcher.end_dt = None
-    fetcher.repo_filter = [repo]
-
-    llm = get_llm(session_id)
-    actions = fetcher.get_authored_messages()
-    actions = trim_messages(actions, llm.tokenizer)
+    query = query.with_dates(datetime.fromisoformat(start_date_iso), None)
+    actions = await cancel_on_disconnect(request, aget_authored_messages(session_id, fetcher, query))
+    actions = trim_messages(actions, llm.tokenizer, get_max_history_tokens(map_reduce), llm.config.model)
     actions_txt = parse_entries_to_txt(actions)
 
-    return {"actions": "\n\n".join([actions_txt, releases_txt])}
+    payload = {"actions": "\n\n".join([actions_txt, releases_txt])}
+    return conditional_response(request, result_cache.set(cache_key, payload), payload)
 
 
 @router.get("/branches", response_model=BranchListResponse)
@@ -347,10 +404,9 @@ async def get_branches(session_id: str, repo: str):
     Raises:
         HTTPException: 400 if not supported, 404 if session not found, 500 for errors
     """
-    fetcher = get_fetcher(session_id)
+    fetcher = await aget_fetcher(session_id)
     try:
-        fetcher.repo_filter = [repo]
-        branches = fetcher.get_branches()
+        branches = await arun_fetcher(fetcher, fetcher.get_branches, fetcher.make_query(repos=[repo]))
     except NotImplementedError:
         raise HTTPException(status_code=400, detail="Branch listing is not supported for this provider.")
     except Exception as e:
@@ -372,10 +428,14 @@ async def get_valid_target_branches(req: ValidTargetBranchesRequest):
     Raises:
         HTTPException: 400 for validation errors, 404 if session not found, 500 for errors
     """
-    fetcher = get_fetcher(req.session_id)
+    fetcher = await aget_fetcher(req.session_id)
     try:
-        fetcher.repo_filter = [req.repo]
-        valid_targets = fetcher.get_valid_target_branches(req.source_branch)
+        valid_targets = await arun_fetcher(
+            fetcher,
+            fetcher.get_valid_target_branches,
+            req.source_branch,
+            fetcher.make_query(repos=[req.repo])
+        )
     except NotImplementedError:
         raise HTTPException(status_code=400, detail="Target branch validation is not supported for this provider.")
     except ValueError as e:
@@ -399,12 +459,13 @@ async def create_pull_request(req: CreatePullRequestRequest):
     Raises:
         HTTPException: 400 for validation errors, 404 if session not found, 500 for errors
     """
-    fetcher = get_fetcher(req.session_id)
-    fetcher.repo_filter = [req.repo]
+    fetcher = await aget_fetcher(req.session_id)
     if not req.description or not req.description.strip():
         raise HTTPException(status_code=400, detail="Description is required for pull request creation.")
     try:
-        result = fetcher.create_pull_request(
+        result = await arun_fetcher(
+            fetcher,
+            fetcher.create_pull_request,
             head_branch=req.source_branch,
             base_branch=req.target_branch,
             title=req.title or f"Merge {req.source_branch} into {req.target_branch}",
@@ -413,6 +474,7 @@ async def create_pull_request(req: CreatePullRequestRequest):
             reviewers=req.reviewers,
             assignees=req.assignees,
             labels=req.labels,
+            query=fetcher.make_query(repos=[req.repo]),
         )
     except NotImplementedError:
         raise HTTPException(status_code=400, detail="Pull request creation is not supported for this provider.")
@@ -441,17 +503,21 @@ async def get_pull_request_diff(req: GetPullRequestDiffRequest):
         dict: Contains formatted commit actions between branches
         
     Raises:
-        HTTPException: 400 if not supported or GitHub only, 404 if session not found, 500 for errors
+        HTTPException: 400 if not supported or a branch does not exist, 404 if session not found, 500 for errors
     """
-    fetcher = get_fetcher(req.session_id)
-    fetcher.repo_filter = [req.repo]
-    provider = type(fetcher).__name__.lower()
-    if "github" not in provider:
-        raise HTTPException(status_code=400, detail="Pull request diff is only supported for GitHub provider.")
+    fetcher = await aget_fetcher(req.session_id)
     try:
-        commits = fetcher.fetch_branch_diff_commits(req.source_branch, req.target_branch)
+        commits = await arun_fetcher(
+            fetcher,
+            fetcher.fetch_branch_diff_commits,
+            req.source_branch,
+            req.target_branch,
+            fetcher.make_query(repos=[req.repo])
+        )
     except NotImplementedError:
         raise HTTPException(status_code=400, detail="Branch diff is not supported for this provider.")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch pull request diff: {str(e)}")
     return {"actions": parse_entries_to_txt(commits)}
@@ -472,7 +538,7 @@ async def get_authors(request: GetAuthorsRequest):
         HTTPException: 404 if session not found, 500 for fetcher errors
     """
     try:
-        fetcher = get_fetcher(request.session_id)
+        fetcher = await aget_fetcher(request.session_id)
         
         if not fetcher:
             raise HTTPException(
@@ -480,7 +546,7 @@ async def get_authors(request: GetAuthorsRequest):
                 detail=f"Session {request.session_id} not found or expired"
             )
         
-        authors_data = fetcher.get_authors(request.repo_names or [])
+        authors_data = await aget_authors(request.session_id, fetcher, request.repo_names or [])
         
         authors = [
             AuthorInfo(name=author["name"], email=author["email"])
@@ -519,7 +585,7 @@ async def get_current_author(session_id: str = Query(..., description="Session i
         HTTPException: 404 if session not found, 500 for errors
     """
     try:
-        fetcher = get_fetcher(session_id)
+        fetcher = await aget_fetcher(session_id)
         
         if not fetcher:
             raise HTTPException(
@@ -528,9 +594,7 @@ async def get_current_author(session_id: str = Query(..., description="Session i
             )
         
         try:
-            author_info = fetcher.get_current_author()
-        except NotImplementedError:
-            author_info = None
+            author_info = await aget_current_author(session_id, fetcher)
         except Exception as e:
             raise HTTPException(
                 status_code=500,
@@ -545,4 +609,66 @@ async def get_current_author(session_id: str = Query(..., description="Session i
         raise HTTPException(
             status_code=500,
             detail=f"Error fetching current author: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+
+@router.get("/bootstrap", response_model=BootstrapResponse)
+async def get_bootstrap(
+    request: Request,
+    session_id: str,
+    start_date: Optional[str] = Query(None),
+    end_date: Optional[str] = Query(None),
+    repo_filter: Optional[List[str]] = Query(None),
+    authors: Optional[List[str]] = Query(None),
+    sections: Optional[List[str]] = Query(None),
+    map_reduce: bool = Query(False),
+    stream: bool = Query(False)
+):
+    """
+    Return the data of the first screen (repos, current author, authors and
+    actions) in one request, computing the sections concurrently.
+    
+    Args:
+        session_id: The session identifier
+        start_date: Optional start date of the actions (default: 7 days ago)
+        end_date: Optional end date of the actions (default: today)
+        repo_filter: Optional list of repositories for the actions and authors
+        authors: Optional list of authors to filter the actions
+        sections: Optional subset of the sections to compute (default: all
+            but authors, which are only included when repo_filter is set)
+        map_reduce: Whether the actions will be summarized with the websocket
+            map_reduce mode, which allows a much larger token budget
+        stream: Stream each section as an NDJSON line as soon as it completes,
+            instead of one JSON response once all are done
+        
+    Returns:
+        BootstrapResponse, or an application/x-ndjson stream of
+        {"section": ..., "data": ...} / {"section": ..., "error": ...} lines
+        
+    Raises:
+        HTTPException: 400 for unknown sections, 404 if session not found
+    """
+    if repo_filter is not None:
+        repo_filter = sum([repo.split(",") for repo in repo_filter], [])
+    if authors is not None:
+        authors = sum([author.split(",") for author in authors], [])
+    if sections is not None:
+        sections = sum([section.split(",") for section in sections], [])
+        unknown = [section for section in sections if section not in BOOTSTRAP_SECTIONS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown sections: {', '.join(unknown)}")
+    fetcher = await aget_fetcher(session_id)
+
+    query = default_query(fetcher, repos=repo_filter, authors=authors)
+    if start_date or end_date:
+        query = query.with_dates(
+            datetime.fromisoformat(start_date).replace(tzinfo=timezone.utc) if start_date else query.start_date,
+            datetime.fromisoformat(end_date).replace(tzinfo=timezone.utc) if end_date else query.end_date
+        )
+
+    if stream:
+        async def lines():
+            async for item in aiter_bootstrap(session_id, fetcher, query, sections, map_reduce):
+                yield json.dumps(item, default=str, ensure_ascii=False) + "\n"
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+    return await cancel_on_disconnect(request, bootstrap(session_id, fetcher, query, sections, map_reduce))
@@ -1,20 +1,20 @@
 from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
 import json
-from typing import Literal, Optional
+from typing import List, Literal, Optional
 import asyncio
 
-from services.prompts import (
-    PR_DESCRIPTION_SYSTEM,
-    SELECT_QUIRKY_REMARK_SYSTEM,
-    SYSTEM,
-    RELEASE_NOTES_SYSTEM,
-    quirky_remarks,
-)
 from services.llm_service import (
-    get_random_quirky_remarks,
     run_concurrent_tasks,
-    get_llm,
+    aget_llm,
+)
+from services.prompt_builder import (
+    build_system_prompt,
+    build_prompt,
 )
+from services.summary_service import map_reduce_actions, incremental_summarize_actions
+from services.fetcher_service import aget_fetcher
+from services.session_expiry import session_expiry
+from services.response_cache import response_cache
 from aicore.const import SPECIAL_TOKENS, STREAM_END_TOKEN
 
 router = APIRouter()
@@ -22,35 +22,8 @@ router = APIRouter()
 # WebSocket connection storage
 active_connections = {}
 active_histories = {}
-
-TRIGGER_PROMPT = """
-Consider the following history of actionables from Git and return me the summary with N = '{N}' bullet points:
-
-{ACTIONS}
-"""
-
-TRIGGER_RELEASE_PROMPT = """
-Consider the following history of actionables from Git and the previous Release Notes (if available).
-Generate me the next Release Notes based on the new Git Actionables matching the format of the previous releases:
-
-{ACTIONS}
-"""
-
-TRIGGER_PULL_REQUEST_PROMPT = """
-You will now receive a list of commit messages between two branches.
-Using the system instructions provided above, generate a clear, concise, and professional **Pull Request Description** summarizing all changes from branch `{SRC}` to be merged into `{TARGET}`.
-
-Commits:
-{COMMITS}
-
-Please follow these steps:
-1. Read and analyze the commit messages.
-2. Identify and group related changes under appropriate markdown headers (e.g., Features, Bug Fixes, Improvements, Documentation, Tests).
-3. Write a short **summary paragraph** explaining the overall purpose of this pull request.
-4. Format the final output as a complete markdown-formatted PR description, ready to paste into GitHub.
-
-Begin your response directly with the formatted PR description—no extra commentary or explanation.
-"""
+# Event loop serving each connection, on which expiry closes it
+connection_loops = {}
 
 
 @router.websocket("/ws/{session_id}/{action_type}")
@@ -66,6 +39,14 @@ async def websocket_endpoint(
     - recap: Generate commit summaries with quirky remarks
     - release: Generate release notes based on git history
     - pull_request: Generate PR descriptions from commit diffs
+
+    Messages for recap and release may set `"mode": "map_reduce"` to have the
+    actions summarized per week/repo chunk before the final prompt, for windows
+    that do not fit `MAX_HISTORY_TOKENS` (see `/actions?map_reduce=true`), or
+    `"mode": "daily"` to summarize each day separately, reusing the persistent
+    per-day summary cache across overlapping windows. Daily messages should
+    also send the `"authors"` the actions were fetched for, which key that
+    cache (default: the session's default authors).
     
     Args:
         websocket: WebSocket connection instance
@@ -78,57 +59,70 @@ async def websocket_endpoint(
     await websocket.accept()
 
     # Select appropriate system prompt based on action type
-    if action_type == "recap":
-        QUIRKY_SYSTEM = SELECT_QUIRKY_REMARK_SYSTEM.format(
-            examples=json.dumps(get_random_quirky_remarks(quirky_remarks), indent=4)
-        )
-        system = [SYSTEM, QUIRKY_SYSTEM]
-    elif action_type == "release":
-        system = RELEASE_NOTES_SYSTEM
-    elif action_type == "pull_request":
-        system = PR_DESCRIPTION_SYSTEM
-    else:
+    try:
+        system = build_system_prompt(action_type)
+    except ValueError:
         raise HTTPException(status_code=404, detail="Invalid action type")
 
     # Store the active WebSocket connection
     active_connections[session_id] = websocket
+    connection_loops[session_id] = asyncio.get_running_loop()
 
     # Initialize LLM session
-    llm = get_llm(session_id)
+    llm = await aget_llm(session_id)
 
     try:
         while True:
             # Receive message from client
             message = await websocket.receive_text()
+            session_expiry.touch(session_id)
             msg_json = json.loads(message)
             message_content = msg_json.get("actions")
             N = msg_json.get("n", 5)
             src_branch = msg_json.get("src")
             target_branch = msg_json.get("target")
+            mode = msg_json.get("mode", "direct")
 
             # Validate inputs
             assert int(N) <= 15, "N must be <= 15"
             assert message_content, "Message content is required"
+            assert mode in ("direct", "map_reduce", "daily"), f"Unsupported mode: {mode}"
+
+            if mode == "map_reduce" and action_type in ("recap", "release"):
+                message_content = await map_reduce_actions(llm, message_content)
+            elif mode == "daily" and action_type in ("recap", "release"):
+                # The authors the actions were fetched for (the session's are only the default)
+                authors = msg_json.get("authors")
+                if isinstance(authors, str):
+                    authors = [author for author in authors.split(",") if author]
+                if authors is None:
+                    authors = await get_session_authors(session_id)
+                message_content = await incremental_summarize_actions(
+                    llm,
+                    message_content,
+                    authors=authors
+                )
             
-            # Build history/prompt based on action type
-            if action_type == "recap":
-                history = [
-                    TRIGGER_PROMPT.format(
-                        N=N,
-                        ACTIONS=message_content
-                    )
-                ]
-            elif action_type == "release":
-                history = [
-                    TRIGGER_RELEASE_PROMPT.format(ACTIONS=message_content)
-                ]
-            elif action_type == "pull_request":
-                history = [
-                    TRIGGER_PULL_REQUEST_PROMPT.format(
-                        SRC=src_branch,
-                        TARGET=target_branch,
-                        COMMITS=message_content)
-                ]
+            # Build history/prompt based on action type, variable content last
+            history = [
+                build_prompt(
+                    action_type,
+                    message_content,
+                    n=N,
+                    src_branch=src_branch,
+                    target_branch=target_branch
+                )
+            ]
+
+            # Replay an identical previous completion, if any
+            cache_key = response_cache.make_key(llm.config, system, history)
+            response = response_cache.get(cache_key)
+            if response is not None:
+                for chunk in response:
+                    await websocket.send_text(json.dumps({"chunk": chunk}))
+                await websocket.send_text(json.dumps({"chunk": STREAM_END_TOKEN}))
+                history.append("".join(response))
+                continue
 
             # Stream LLM response back to client
             response = []
@@ -139,6 +133,7 @@ async def websocket_endpoint(
             ):
                 if chunk == STREAM_END_TOKEN:
                     await websocket.send_text(json.dumps({"chunk": chunk}))
+                    response_cache.set(cache_key, response)
                     break
                 elif chunk in SPECIAL_TOKENS:
                     continue
@@ -147,6 +142,7 @@ async def websocket_endpoint(
 
             # Store response in history for potential follow-up
             history.append("".join(response))
+            session_expiry.touch(session_id)
 
     except WebSocketDisconnect:
         # Clean up connection on disconnect
@@ -164,16 +160,37 @@ async def websocket_endpoint(
             del active_connections[session_id]
 
 
+async def get_session_authors(session_id: str) -> List[str]:
+    """
+    Return the default authors of the session's fetcher.
+    
+    Args:
+        session_id: The session identifier
+        
+    Returns:
+        List of author identifiers, empty if the session has no fetcher
+    """
+    try:
+        return list((await aget_fetcher(session_id)).authors)
+    except HTTPException:
+        return []
+
+
 def close_websocket_connection(session_id: str):
     """
     Clean up and close the active WebSocket connection associated with the given session_id.
     
     This function is called during session expiration to ensure proper cleanup
-    of WebSocket resources.
+    of WebSocket resources. Expiry hooks run in a worker thread, so the close
+    is scheduled on the event loop serving the connection.
     
     Args:
         session_id: The session identifier whose WebSocket connection should be closed
     """
     websocket = active_connections.pop(session_id, None)
-    if websocket:
-        asyncio.create_task(websocket.close())
\ No newline at end of file
+    loop = connection_loops.pop(session_id, None)
+    if websocket and loop and not loop.is_closed():
+        asyncio.run_coroutine_threadsafe(websocket.close(), loop)
+
+
+session_expiry.add_hook(close_websocket_connection)
\ No newline at end of file
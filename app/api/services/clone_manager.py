@@ -0,0 +1,181 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from typing import Iterable, List, Optional
+
+from fastapi import HTTPException
+
+from services.executors import MonitoredExecutor, git_executor
+
+CLONE_DISK_QUOTA_MB = int(os.environ.get("CLONE_DISK_QUOTA_MB", 20480))
+CLONE_ESTIMATE_MB = int(os.environ.get("CLONE_ESTIMATE_MB", 200))
+CLONE_ADMISSION_WAIT_SECONDS = float(os.environ.get("CLONE_ADMISSION_WAIT_SECONDS", 30))
+CLONE_ORPHAN_MIN_AGE_SECONDS = int(os.environ.get("CLONE_ORPHAN_MIN_AGE_SECONDS", 600))
+
+# Prefix of the per-session clones made by URLFetcher (tempfile.mkdtemp)
+CLONE_DIR_PREFIX = "gitrecap_"
+
+
+class CloneManager:
+    """
+    Disk accounting and admission control for repository clones.
+
+    Disk usage is the size of the per-session clone directories plus the
+    shared mirror cache, measured in the git executor so the directory walk
+    never blocks the event loop. A new clone is admitted only while the usage, plus an
+    estimate for every clone still in progress, fits the quota; otherwise it
+    waits for sessions to expire (and their clones to be removed) for up to
+    `max_wait_seconds`, and is then rejected with a 503.
+    """
+
+    def __init__(
+        self,
+        quota_bytes: int = CLONE_DISK_QUOTA_MB * 1024 ** 2,
+        clone_estimate_bytes: int = CLONE_ESTIMATE_MB * 1024 ** 2,
+        max_wait_seconds: float = CLONE_ADMISSION_WAIT_SECONDS,
+        temp_root: Optional[str] = None,
+        extra_dirs: Iterable[str] = (),
+        usage_ttl_seconds: float = 5.0,
+        poll_seconds: float = 1.0,
+        executor: MonitoredExecutor = git_executor
+    ):
+        self.quota_bytes = quota_bytes
+        self.clone_estimate_bytes = clone_estimate_bytes
+        self.max_wait_seconds = max_wait_seconds
+        self.temp_root = temp_root or tempfile.gettempdir()
+        self.extra_dirs = list(extra_dirs)
+        self.usage_ttl_seconds = usage_ttl_seconds
+        self.poll_seconds = poll_seconds
+        self.executor = executor
+        self.reserved_bytes = 0
+        self.rejected = 0
+        self._usage = 0
+        self._usage_at = 0.0
+        self._condition: Optional[asyncio.Condition] = None
+        self._measure_lock: Optional[asyncio.Lock] = None
+
+    @staticmethod
+    def _dir_size(path: str) -> int:
+        total = 0
+        for dirpath, _, filenames in os.walk(path):
+            for filename in filenames:
+                try:
+                    total += os.lstat(os.path.join(dirpath, filename)).st_size
+                except OSError:
+                    continue
+        return total
+
+    def clone_dirs(self) -> List[str]:
+        """Return the per-session clone directories currently on disk."""
+        try:
+            entries = os.listdir(self.temp_root)
+        except OSError:
+            return []
+        return [
+            os.path.join(self.temp_root, entry)
+            for entry in entries
+            if entry.startswith(CLONE_DIR_PREFIX) and os.path.isdir(os.path.join(self.temp_root, entry))
+        ]
+
+    def measure(self) -> int:
+        """Walk the clone and mirror directories and return their size in bytes (blocking)."""
+        return sum(self._dir_size(path) for path in [*self.clone_dirs(), *self.extra_dirs])
+
+    async def ausage(self) -> int:
+        """Return the disk usage in bytes of clones and mirrors (cached briefly)."""
+        if self._measure_lock is None:
+            self._measure_lock = asyncio.Lock()
+        # Concurrent callers wait for a single walk instead of starting their own
+        async with self._measure_lock:
+            if time.monotonic() - self._usage_at > self.usage_ttl_seconds:
+                started = time.monotonic()
+                self._usage = await self.executor.run(self.measure)
+                self._usage_at = started
+        return self._usage
+
+    def invalidate(self) -> None:
+        """Forget the cached usage, e.g. after a clone was removed."""
+        self._usage_at = 0.0
+
+    async def astats(self) -> dict:
+        """Return the disk usage and admission state."""
+        return {
+            "usage_bytes": await self.ausage(),
+            "reserved_bytes": self.reserved_bytes,
+            "quota_bytes": self.quota_bytes,
+            "rejected": self.rejected
+        }
+
+    async def _fits(self, reservation: int) -> bool:
+        return await self.ausage() + self.reserved_bytes + reservation <= self.quota_bytes
+
+    @asynccontextmanager
+    async def admit(self, n_clones: int = 1):
+        """
+        Reserve disk budget for n_clones clones for the duration of the block.
+
+        Args:
+            n_clones: Number of repositories about to be cloned.
+
+        Raises:
+            HTTPException: 503 if the budget did not become available in time.
+        """
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        # Capped so a large multi-URL request can still run once the disk is free
+        reservation = min(n_clones * self.clone_estimate_bytes, self.quota_bytes)
+        deadline = time.monotonic() + self.max_wait_seconds
+        async with self._condition:
+            while not await self._fits(reservation):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.rejected += 1
+                    raise HTTPException(
+                        status_code=503,
+                        detail="Clone disk quota exceeded, please retry later.",
+                        headers={"Retry-After": "30"}
+                    )
+                try:
+                    await asyncio.wait_for(self._condition.wait(), timeout=min(remaining, self.poll_seconds))
+                except asyncio.TimeoutError:
+                    self.invalidate()
+            self.reserved_bytes += reservation
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self.reserved_bytes -= reservation
+                self.invalidate()
+                self._condition.notify_all()
+
+    def sweep_orphans(self, live_dirs: Iterable[str] = (), min_age_seconds: int = CLONE_ORPHAN_MIN_AGE_SECONDS) -> List[str]:
+        """
+        Remove clone directories left behind by crashed or restarted workers.
+
+        Args:
+            live_dirs: Clone directories of live sessions, which are kept.
+            min_age_seconds: Directories modified more recently are kept, as
+                they may belong to another worker process.
+
+        Returns:
+            List[str]: The removed directories.
+        """
+        live = {os.path.abspath(path) for path in live_dirs if path}
+        removed = []
+        now = time.time()
+        for path in self.clone_dirs():
+            if os.path.abspath(path) in live:
+                continue
+            try:
+                if now - os.path.getmtime(path) < min_age_seconds:
+                    continue
+            except OSError:
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            removed.append(path)
+        if removed:
+            self.invalidate()
+        return removed
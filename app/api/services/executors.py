@@ -0,0 +1,146 @@
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+PROVIDER_IO_WORKERS = int(os.getenv("PROVIDER_IO_WORKERS", "32"))
+GIT_WORKERS = int(os.getenv("GIT_WORKERS", "8"))
+
+T = TypeVar("T")
+
+
+class MonitoredExecutor:
+    """
+    Sized thread pool for blocking calls made from async handlers.
+
+    Tracks how many calls are running and queued and how long calls wait for
+    a thread, so saturation shows up in /health before it shows up as latency.
+    """
+
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.running = 0
+        self.queued = 0
+        self.completed = 0
+        self.max_wait_seconds = 0.0
+        self._total_wait_seconds = 0.0
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f"gitrecap-{name}")
+
+    def _dequeue(self, state: Dict[str, bool]) -> None:
+        """Leave the queue once, whether the call started or was cancelled first (lock held)."""
+        if not state["dequeued"]:
+            state["dequeued"] = True
+            self.queued -= 1
+
+    def _call(self, submitted_at: float, state: Dict[str, bool], fn: Callable[..., T]) -> T:
+        wait = time.monotonic() - submitted_at
+        with self._lock:
+            self._dequeue(state)
+            self.running += 1
+            self.max_wait_seconds = max(self.max_wait_seconds, wait)
+            self._total_wait_seconds += wait
+        try:
+            return fn()
+        finally:
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run a blocking function in the pool without blocking the event loop.
+
+        Context variables are propagated, as with `asyncio.to_thread`.
+
+        Args:
+            fn: The blocking function.
+            *args: Positional arguments of fn.
+            **kwargs: Keyword arguments of fn.
+
+        Returns:
+            The result of fn.
+        """
+        call = functools.partial(contextvars.copy_context().run, fn, *args, **kwargs)
+        state = {"dequeued": False}
+        with self._lock:
+            self.queued += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._pool, self._call, time.monotonic(), state, call
+            )
+        finally:
+            with self._lock:
+                self._dequeue(state)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the occupancy of the pool and the time calls waited for a thread."""
+        with self._lock:
+            started = self.completed + self.running
+            return {
+                "max_workers": self.max_workers,
+                "running": self.running,
+                "queued": self.queued,
+                "saturation": round(self.running / self.max_workers, 3),
+                "completed": self.completed,
+                "avg_wait_ms": round(self._total_wait_seconds / started * 1000, 3) if started else 0.0,
+                "max_wait_ms": round(self.max_wait_seconds * 1000, 3)
+            }
+
+
+class LoopLagMonitor:
+    """Measures how late the event loop wakes up a sleeping task, i.e. how long it is blocked."""
+
+    def __init__(self, interval_seconds: float = 0.5):
+        self.interval_seconds = interval_seconds
+        self.last_lag_seconds = 0.0
+        self.max_lag_seconds = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval_seconds)
+            self.last_lag_seconds = max(0.0, loop.time() - start - self.interval_seconds)
+            self.max_lag_seconds = max(self.max_lag_seconds, self.last_lag_seconds)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "last_lag_ms": round(self.last_lag_seconds * 1000, 3),
+            "max_lag_ms": round(self.max_lag_seconds * 1000, 3)
+        }
+
+
+# Provider SDK and HTTP calls (GitHub, Azure DevOps, GitLab, OAuth)
+provider_executor = MonitoredExecutor("provider_io", PROVIDER_IO_WORKERS)
+# Synchronous git subprocess work (local clones, branch listing, authors)
+git_executor = MonitoredExecutor("git", GIT_WORKERS)
+loop_lag = LoopLagMonitor()
+
+
+def executor_stats() -> Dict[str, Any]:
+    """Return the stats of the executors and the event loop lag."""
+    return {
+        provider_executor.name: provider_executor.stats(),
+        git_executor.name: git_executor.stats(),
+        "event_loop": loop_lag.stats()
+    }
@@ -1,19 +1,72 @@
-from typing import Dict, Optional
+import asyncio
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, TypeVar, Union
 from fastapi import HTTPException
 from git_recap.providers.base_fetcher import BaseFetcher
-from git_recap.providers import GitHubFetcher, AzureFetcher, GitLabFetcher, URLFetcher
+from git_recap.providers import GitHubFetcher, AzureFetcher, GitLabFetcher, LocalRepoFetcher, URLFetcher, MultiURLFetcher
+from git_recap.providers.async_git import set_git_concurrency
+from git_recap.providers.mirror_cache import MirrorCache
+from git_recap.providers.query import RecapQuery
+from services.clone_manager import CloneManager
+from services.executors import MonitoredExecutor, git_executor, provider_executor
+from services.session_backend import decrypt_secret, encrypt_secret, session_backend
+from services.session_expiry import session_expiry
+from services.session_store import SessionStore, create_session_store
+from services.single_flight import SingleFlight
+import tempfile
 import ulid
+import os
 
-# In-memory store mapping session_id to its respective fetcher instance
-fetchers: Dict[str, BaseFetcher] = {}
+def _release_fetcher(session_id: str, fetcher: BaseFetcher) -> None:
+    """Eviction hook of the fetcher store: release clones held by the fetcher (blocking)."""
+    if hasattr(fetcher, 'clear'):
+        fetcher.clear()
+        clone_manager.invalidate()
+
+# Session store mapping session_id to its respective fetcher instance
+fetchers: SessionStore = create_session_store("fetchers", on_evict=_release_fetcher)
+
+# Bare mirrors shared by all URL sessions, so repeat clones only fetch
+url_mirror_cache = MirrorCache(
+    root_dir=os.getenv("URL_MIRROR_CACHE_DIR", os.path.join(tempfile.gettempdir(), "gitrecap-mirrors")),
+    quota_bytes=int(os.getenv("URL_MIRROR_CACHE_QUOTA_MB", "10240")) * 1024 ** 2
+)
+
+# Disk budget and admission control shared by per-session clones and mirrors
+clone_manager = CloneManager(extra_dirs=[url_mirror_cache.root_dir])
+
+# Multi-URL sessions: concurrent clones per session and URLs accepted per session
+URL_CLONE_WORKERS = int(os.getenv("URL_CLONE_WORKERS", "4"))
+MAX_URLS_PER_SESSION = int(os.getenv("MAX_URLS_PER_SESSION", "10"))
+
+# Git processes run concurrently by the non-blocking git helpers
+set_git_concurrency(int(os.getenv("GIT_CONCURRENCY", "8")))
+
+# Identical concurrent fetches of a session share one provider sweep
+single_flight = SingleFlight()
+
+def _build_fetcher(provider: Optional[str], pat: Union[str, List[str]]) -> BaseFetcher:
+    """Build the fetcher of a provider (URL repositories are cloned before returning)."""
+    if provider == "GitHub":
+        return GitHubFetcher(pat=pat)
+    elif provider == "Azure Devops":
+        return AzureFetcher(pat=pat)
+    elif provider == "GitLab":
+        return GitLabFetcher(pat=pat)
+    elif provider == "URL":
+        return _build_url_fetcher(pat, clone=True)
+    raise HTTPException(status_code=400, detail="Unsupported provider")
 
-def store_fetcher(session_id: str, pat: str, provider: Optional[str] = "GitHub") -> str:
+def store_fetcher(session_id: str, pat: Union[str, List[str]], provider: Optional[str] = "GitHub") -> str:
     """
     Store the provided PAT associated with the given session_id.
     
+    The provider and the (encrypted) PAT are also stored in the session
+    backend, so any worker can rebuild the fetcher.
+    
     Args:
         session_id: The session identifier tied to the active session.
-        pat: The Personal Access Token to be stored (or URL for URL provider).
+        pat: The Personal Access Token to be stored (or URL, or list of URLs, for URL provider).
         provider: The provider identifier (default is "GitHub"). 
                  Can be "Azure Devops", "GitLab", or "URL".
     
@@ -25,18 +78,13 @@ def store_fetcher(session_id: str, pat: str, provider: Optional[str] = "GitHub")
     
     try:
         username = "unknown"
+        fetcher = _build_fetcher(provider, pat)
         if provider == "GitHub":
-            fetchers[session_id] = GitHubFetcher(pat=pat)
-            username = fetchers[session_id].user.login
-        elif provider == "Azure Devops":
-            fetchers[session_id] = AzureFetcher(pat=pat)
-        elif provider == "GitLab":
-            fetchers[session_id] = GitLabFetcher(pat=pat)
-        elif provider == "URL":
-            fetchers[session_id] = URLFetcher(url=pat)
-        else:
-            raise HTTPException(status_code=400, detail="Unsupported provider")
+            username = fetcher.user.login
+        _save_fetcher(session_id, fetcher, provider, pat)
         return username
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -45,10 +93,133 @@ def store_fetcher(session_id: str, pat: str, provider: Optional[str] = "GitHub")
             detail=f"Failed to initialize {provider} fetcher: {str(e)}"
         )
 
+def _descriptor(fetcher: BaseFetcher, provider: Optional[str], pat: Union[str, List[str]]) -> dict:
+    """Return the descriptor from which any worker can rebuild a fetcher."""
+    return {
+        "provider": provider,
+        "token": encrypt_secret(pat),
+        "filters": {
+            "start_date": fetcher.start_date.isoformat() if fetcher.start_date else None,
+            "end_date": fetcher.end_date.isoformat() if fetcher.end_date else None,
+            "repo_filter": list(fetcher.repo_filter),
+            "authors": list(fetcher.authors)
+        }
+    }
+
+def _save_fetcher(session_id: str, fetcher: BaseFetcher, provider: Optional[str], pat: Union[str, List[str]]) -> None:
+    """Store a fetcher locally and its descriptor in the session backend."""
+    fetchers.set(session_id, fetcher)
+    session_backend.set(f"fetcher:{session_id}", _descriptor(fetcher, provider, pat), session_expiry.ttl_seconds)
+
+async def _asave_fetcher(session_id: str, fetcher: BaseFetcher, provider: Optional[str], pat: Union[str, List[str]]) -> None:
+    """Async counterpart of `_save_fetcher`."""
+    await fetchers.aset(session_id, fetcher)
+    await session_backend.aset(f"fetcher:{session_id}", _descriptor(fetcher, provider, pat), session_expiry.ttl_seconds)
+
+def _decrypt_descriptor(descriptor: Optional[dict]) -> Optional[dict]:
+    if descriptor is None:
+        return None
+    descriptor["token"] = decrypt_secret(descriptor["token"])
+    return descriptor if descriptor["token"] else None
+
+def _load_descriptor(session_id: str) -> Optional[dict]:
+    """Return the fetcher descriptor of a session with its token decrypted, or None."""
+    return _decrypt_descriptor(session_backend.get(f"fetcher:{session_id}"))
+
+async def _aload_descriptor(session_id: str) -> Optional[dict]:
+    """Async counterpart of `_load_descriptor`."""
+    return _decrypt_descriptor(await session_backend.aget(f"fetcher:{session_id}"))
+
+def _restored(session_id: str, fetcher: BaseFetcher, descriptor: dict) -> BaseFetcher:
+    """Apply the stored filters to a rebuilt fetcher and keep it locally."""
+    filters = descriptor.get("filters") or {}
+    if filters.get("start_date"):
+        fetcher.start_date = datetime.fromisoformat(filters["start_date"])
+    if filters.get("end_date"):
+        fetcher.end_date = datetime.fromisoformat(filters["end_date"])
+    fetcher.repo_filter = filters.get("repo_filter") or []
+    fetcher.authors = filters.get("authors") or []
+    existing = fetchers.get(session_id)
+    if existing is not None:
+        # Another request restored the session first
+        _release_fetcher(session_id, fetcher)
+        return existing
+    fetchers.set(session_id, fetcher)
+    return fetcher
+
+def _restore_fetcher(session_id: str, descriptor: Optional[dict] = None) -> Optional[BaseFetcher]:
+    """Rebuild the fetcher of a session created by another worker (or evicted), if any."""
+    if descriptor is None:
+        descriptor = _load_descriptor(session_id)
+    if descriptor is None:
+        return None
+    try:
+        fetcher = _build_fetcher(descriptor["provider"], descriptor["token"])
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to restore session: {str(e)}")
+    return _restored(session_id, fetcher, descriptor)
+
+def _build_url_fetcher(urls: Union[str, List[str]], clone: bool) -> Union[URLFetcher, MultiURLFetcher]:
+    """Build the fetcher of a URL session (one URLFetcher, or a MultiURLFetcher for several URLs)."""
+    urls = [urls] if isinstance(urls, str) else list(dict.fromkeys(urls))
+    if len(urls) > MAX_URLS_PER_SESSION:
+        raise ValueError(f"At most {MAX_URLS_PER_SESSION} repository URLs are allowed per session")
+    if len(urls) == 1:
+        return URLFetcher(url=urls[0], mirror_cache=url_mirror_cache, clone=clone)
+    return MultiURLFetcher(
+        urls=urls,
+        mirror_cache=url_mirror_cache,
+        max_workers=URL_CLONE_WORKERS,
+        clone=clone
+    )
+
+async def astore_fetcher(session_id: str, pat: Union[str, List[str]], provider: Optional[str] = "GitHub") -> str:
+    """
+    Async counterpart of `store_fetcher`: URL repositories are cloned on the
+    event loop, and provider SDK clients are built in the provider I/O pool.
+    
+    Returns:
+        str: The username of the authenticated user ("unknown" if not available).
+    """
+    if provider == "URL":
+        await astore_url_fetcher(session_id, pat)
+        return "unknown"
+    return await provider_executor.run(store_fetcher, session_id, pat, provider)
+
+async def astore_url_fetcher(session_id: str, urls: Union[str, List[str]]) -> None:
+    """
+    Clone the repositories of a URL session without blocking the event loop.
+    
+    Cancelling the awaiting task (e.g. when the client disconnects) kills the
+    running git processes and removes the partial clones.
+    
+    Args:
+        session_id: The session identifier tied to the active session.
+        urls: Repository URL or URLs.
+    
+    Raises:
+        HTTPException: If the URLs are invalid or cloning fails.
+    """
+    if not session_id or not urls:
+        raise HTTPException(status_code=400, detail="Invalid session_id or PAT/URL")
+    try:
+        fetcher = _build_url_fetcher(urls, clone=False)
+        await fetcher.aclone()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=500, detail=f"Failed to initialize URL fetcher: {str(e)}")
+    await _asave_fetcher(session_id, fetcher, "URL", urls)
+
 def get_fetcher(session_id: str) -> BaseFetcher:
     """
     Retrieve the stored fetcher instance for the provided session_id.
     
+    A session created by another worker is rebuilt from its descriptor (which
+    clones URL repositories again; async routes should use `aget_fetcher`).
+    
     Args:
         session_id: The session identifier.
     
@@ -59,23 +230,211 @@ def get_fetcher(session_id: str) -> BaseFetcher:
         HTTPException: If no fetcher is found for the given session_id.
     """
     fetcher = fetchers.get(session_id)
-    if not fetcher:
+    if fetcher is None:
+        fetcher = _restore_fetcher(session_id)
+    if fetcher is None:
         raise HTTPException(status_code=404, detail="Session not found")
+    _touch(session_id)
+    return fetcher
+
+async def aget_fetcher(session_id: str) -> BaseFetcher:
+    """
+    Async counterpart of `get_fetcher`, which rebuilds sessions without
+    blocking the event loop. The fetcher is held for the current task (see
+    `hold_fetcher`).
+    
+    Args:
+        session_id: The session identifier.
+    
+    Returns:
+        The fetcher instance associated with the session_id.
+    
+    Raises:
+        HTTPException: If no fetcher is found for the given session_id.
+    """
+    fetcher = fetchers.get(session_id)
+    if fetcher is None:
+        descriptor = await _aload_descriptor(session_id)
+        if descriptor is None:
+            raise HTTPException(status_code=404, detail="Session not found")
+        if descriptor["provider"] == "URL":
+            fetcher = _build_url_fetcher(descriptor["token"], clone=False)
+            try:
+                await fetcher.aclone()
+            except RuntimeError as e:
+                raise HTTPException(status_code=500, detail=f"Failed to restore session: {str(e)}")
+            fetcher = await git_executor.run(_restored, session_id, fetcher, descriptor)
+        else:
+            fetcher = await provider_executor.run(_restore_fetcher, session_id, descriptor)
+            if fetcher is None:
+                raise HTTPException(status_code=404, detail="Session not found")
+    hold_fetcher(fetcher)
+    await _atouch(session_id)
     return fetcher
 
+def hold_fetcher(fetcher: BaseFetcher) -> None:
+    """
+    Keep the clones of a fetcher until the current task (request, websocket
+    or warm-up) finishes, even if its session is evicted or expires meanwhile.
+    
+    Args:
+        fetcher: The fetcher used by the current task.
+    """
+    fetchers.acquire(fetcher)
+    asyncio.current_task().add_done_callback(lambda _: fetchers.release_in_background(fetcher))
+
+T = TypeVar("T")
+
+def executor_for(fetcher: BaseFetcher) -> MonitoredExecutor:
+    """Return the pool for blocking calls of a fetcher: git for local clones, provider I/O otherwise."""
+    if isinstance(fetcher, (URLFetcher, MultiURLFetcher, LocalRepoFetcher)):
+        return git_executor
+    return provider_executor
+
+async def arun_fetcher(fetcher: BaseFetcher, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a blocking fetcher method in the pool matching the fetcher.
+    
+    Args:
+        fetcher: The fetcher the call is made on.
+        fn: The blocking function (usually a bound method of fetcher).
+        *args: Positional arguments of fn.
+        **kwargs: Keyword arguments of fn.
+    
+    Returns:
+        The result of fn.
+    """
+    return await executor_for(fetcher).run(fn, *args, **kwargs)
+
+async def aget_authored_messages(session_id: str, fetcher: BaseFetcher, query: RecapQuery) -> List[Dict[str, Any]]:
+    """
+    Fetch the authored messages of a fetcher without blocking the event loop.
+    
+    Fetchers with a native async implementation (URL repositories) are
+    awaited directly; the others run in their pool (see `executor_for`).
+    Identical concurrent calls for the session share one fetch.
+    
+    Args:
+        session_id: The session identifier.
+        fetcher: The fetcher of the session.
+        query: What to recap (see `BaseFetcher.make_query`).
+    
+    Returns:
+        List[Dict[str, Any]]: Entries sorted chronologically (a list owned by the caller).
+    """
+    async def fetch() -> List[Dict[str, Any]]:
+        if type(fetcher).aget_authored_messages is not BaseFetcher.aget_authored_messages:
+            return await fetcher.aget_authored_messages(query)
+        return await arun_fetcher(fetcher, fetcher.get_authored_messages, query)
+
+    key = single_flight.make_key(
+        session_id,
+        "authored_messages",
+        start_date=query.start_date,
+        end_date=query.end_date,
+        repos=query.repos,
+        authors=query.authors,
+        kinds=query.kinds
+    )
+    # Callers trim the list in place, so each gets its own copy
+    return list(await single_flight.do(key, fetch))
+
+async def aget_authors(session_id: str, fetcher: BaseFetcher, repo_names: List[str]) -> List[Dict[str, str]]:
+    """
+    Retrieve the unique authors of the given repositories (all if empty)
+    without blocking the event loop. Identical concurrent calls for the
+    session share one scan.
+    
+    Args:
+        session_id: The session identifier.
+        fetcher: The fetcher of the session.
+        repo_names: Names of the repositories to scan.
+    
+    Returns:
+        List[Dict[str, str]]: Authors with name and email.
+    """
+    key = single_flight.make_key(session_id, "authors", repo_names=repo_names, start_date=fetcher.start_date)
+    return list(await single_flight.do(key, lambda: arun_fetcher(fetcher, fetcher.get_authors, repo_names)))
+
+async def aget_repos(session_id: str, fetcher: BaseFetcher) -> List[str]:
+    """
+    Retrieve the repository names of the session without blocking the event
+    loop (listing them is a provider round trip for hosted providers).
+    Identical concurrent calls for the session share one listing.
+
+    Args:
+        session_id: The session identifier.
+        fetcher: The fetcher of the session.
+
+    Returns:
+        List[str]: Repository names.
+    """
+    key = single_flight.make_key(session_id, "repos")
+    return list(await single_flight.do(key, lambda: arun_fetcher(fetcher, lambda: list(fetcher.repos_names))))
+
+async def aget_current_author(session_id: str, fetcher: BaseFetcher) -> Optional[Dict[str, str]]:
+    """
+    Retrieve the authenticated user of the session without blocking the event
+    loop. Identical concurrent calls for the session share one lookup.
+
+    Args:
+        session_id: The session identifier.
+        fetcher: The fetcher of the session.
+
+    Returns:
+        Optional[Dict[str, str]]: The user's name and email, or None if the
+        provider has no notion of a current user.
+    """
+    async def lookup() -> Optional[Dict[str, str]]:
+        try:
+            return await arun_fetcher(fetcher, fetcher.get_current_author)
+        except NotImplementedError:
+            return None
+
+    key = single_flight.make_key(session_id, "current_author")
+    return await single_flight.do(key, lookup)
+
+def _touch(session_id: str) -> None:
+    """Renew the expiry of a session on activity."""
+    session_expiry.touch(session_id)
+    session_backend.touch(f"fetcher:{session_id}", session_expiry.ttl_seconds)
+
+async def _atouch(session_id: str) -> None:
+    """Async counterpart of `_touch`."""
+    session_expiry.touch(session_id)
+    await session_backend.atouch(f"fetcher:{session_id}", session_expiry.ttl_seconds)
+
 def expire_fetcher(session_id: str) -> None:
     """
     Remove the fetcher associated with the given session_id.
     
     This function is used for cleaning up resources by expiring the stored fetcher instance
-    when its corresponding session is expired.
+    when its corresponding session is expired (once no in-flight request holds it). The session's descriptor is
+    deleted too, unless another worker renewed it, so the session (and its
+    token) cannot be restored afterwards.
     
     Args:
         session_id: The session identifier whose associated fetcher should be removed.
     """
-    fetcher = fetchers.pop(session_id, None)
-    if fetcher and hasattr(fetcher, 'clear'):
-        fetcher.clear()
+    fetchers.evict(session_id)
+    session_backend.expire(f"fetcher:{session_id}")
+
+session_expiry.add_hook(expire_fetcher)
+
+def live_clone_dirs() -> List[str]:
+    """
+    Return the clone directories of the live sessions.
+    
+    Returns:
+        List[str]: Temporary clone directories that must not be swept.
+    """
+    dirs = []
+    for fetcher in fetchers.values():
+        for url_fetcher in getattr(fetcher, "fetchers", {fetcher: fetcher}).values():
+            temp_dir = getattr(url_fetcher, "temp_dir", None)
+            if temp_dir:
+                dirs.append(temp_dir)
+    return dirs
 
 def generate_session_id() -> str:
     """
@@ -1,16 +1,23 @@
 import json
 import os
 import uuid
-from typing import Dict, List, Optional, Union
+from typing import List, Optional, Union
 from fastapi import HTTPException
 import asyncio
 import random
+from datetime import date, datetime, timezone
 
 from aicore.logger import _logger
 from aicore.config import Config
 from aicore.llm import Llm
 from aicore.llm.config import LlmConfig
 
+from services.executors import provider_executor
+from services.session_backend import decrypt_secret, encrypt_secret, session_backend
+from services.session_expiry import session_expiry
+from services.session_store import SessionStore, create_session_store
+from services.token_estimator import estimate_tokens, upper_bound_tokens
+
 def get_random_quirky_remarks(remarks_list, n=5):
     """
     Returns a list of n randomly selected quirky remarks.
@@ -24,13 +31,51 @@ def get_random_quirky_remarks(remarks_list, n=5):
     """
     return random.sample(remarks_list, min(n, len(remarks_list)))
 
-# LLM session storage
-llm_sessions: Dict[str, Llm] = {}
+def get_daily_quirky_remarks(remarks_list, n=5, day: Optional[date] = None):
+    """
+    Returns a list of n quirky remarks that only changes once per day.
+    
+    Keeping the selection stable within a day keeps the recap system prompt
+    byte-identical across requests, so provider prompt caching can reuse it.
+    
+    Args:
+        remarks_list (list): The full list of quirky remarks.
+        n (int): Number of remarks to select (default is 5).
+        day (date): Day used to seed the selection (default is today, UTC).
+        
+    Returns:
+        list: Quirky remarks selected for the day.
+    """
+    day = day or datetime.now(timezone.utc).date()
+    return random.Random(day.isoformat()).sample(remarks_list, min(n, len(remarks_list)))
+
+# LLM session storage (least recently used sessions are evicted under the caps)
+llm_sessions: SessionStore = create_session_store("llm_sessions")
+
+def expire_llm(session_id: str) -> None:
+    """Expiry hook: drop the LLM client of a session and its idle descriptor."""
+    llm_sessions.pop(session_id)
+    session_backend.expire(f"llm:{session_id}")
+
+session_expiry.add_hook(expire_llm)
+
+def _build_llm(session_id: str, config_dict: Optional[dict] = None) -> Llm:
+    """Build the LLM client of a session from a custom configuration, or from the environment."""
+    if config_dict:
+        llm = Llm.from_config(config_dict)
+    else:
+        config = Config.from_environment()
+        llm = Llm.from_config(config.llm)
+    llm.session_id = session_id
+    return llm
 
 async def initialize_llm_session(session_id: str, config: Optional[LlmConfig] = None) -> Llm:
     """
     Initialize or retrieve an LLM session.
     
+    The configuration is also stored in the session backend (encrypted, as it
+    may hold an API key), so any worker can rebuild the client.
+    
     Args:
         session_id: The session identifier.
         config: Optional custom LLM configuration.
@@ -38,19 +83,33 @@ async def initialize_llm_session(session_id: str, config: Optional[LlmConfig] =
     Returns:
         An initialized LLM instance.
     """
-    if session_id in llm_sessions:
-        return llm_sessions[session_id]
+    llm = llm_sessions.get(session_id)
+    if llm is not None:
+        return llm
     
-    # Initialize LLM based on whether custom config is provided.
-    if config:
-        # Convert Pydantic model to dict and use for LLM initialization.
-        config_dict = config.dict(exclude_none=True)
-        llm = Llm.from_config(config_dict)
-    else:
-        config = Config.from_environment()
-        llm = Llm.from_config(config.llm)
-    llm.session_id = session_id
-    llm_sessions[session_id] = llm
+    # Convert Pydantic model to dict and use for LLM initialization.
+    config_dict = config.dict(exclude_none=True) if config else None
+    llm = _build_llm(session_id, config_dict)
+    await llm_sessions.aset(session_id, llm)
+    await session_backend.aset(
+        f"llm:{session_id}",
+        {"config": encrypt_secret(config_dict) if config_dict else None},
+        session_expiry.ttl_seconds
+    )
+    return llm
+
+def _restore_llm(session_id: str) -> Optional[Llm]:
+    """Rebuild the LLM client of a session created by another worker (or evicted), if any."""
+    descriptor = session_backend.get(f"llm:{session_id}")
+    if descriptor is None:
+        return None
+    config_dict = None
+    if descriptor.get("config"):
+        config_dict = decrypt_secret(descriptor["config"])
+        if config_dict is None:
+            return None
+    llm = _build_llm(session_id, config_dict)
+    llm_sessions.set(session_id, llm)
     return llm
 
 async def set_llm(config: Optional[LlmConfig] = None) -> str:
@@ -70,8 +129,8 @@ async def set_llm(config: Optional[LlmConfig] = None) -> str:
         # Initialize the LLM with the provided configuration.
         await initialize_llm_session(session_id, config)
         
-        # Schedule session expiration exactly 5 minutes after session creation.
-        asyncio.create_task(schedule_session_expiration(session_id))
+        # Expire the session once it has been idle for the session TTL.
+        session_expiry.touch(session_id)
         
         return session_id
     except Exception as e:
@@ -91,25 +150,103 @@ def get_llm(session_id: str) -> Optional[Llm]:
     Raises:
         HTTPException: If the session is not found.
     """
-    if session_id not in llm_sessions:
+    llm = llm_sessions.get(session_id)
+    if llm is None:
+        llm = _restore_llm(session_id)
+    if llm is None:
         raise HTTPException(status_code=404, detail="Session not found")
-    return llm_sessions.get(session_id)
+    session_expiry.touch(session_id)
+    session_backend.touch(f"llm:{session_id}", session_expiry.ttl_seconds)
+    return llm
+
+async def aget_llm(session_id: str) -> Llm:
+    """
+    Async counterpart of `get_llm`, which reads the session backend without
+    blocking the event loop.
     
-def trim_messages(messages, tokenizer_fn, max_tokens: Optional[int] = None):
+    Args:
+        session_id: The session identifier.
+        
+    Returns:
+        The LLM instance.
+        
+    Raises:
+        HTTPException: If the session is not found.
+    """
+    llm = llm_sessions.get(session_id)
+    if llm is None:
+        llm = await provider_executor.run(_restore_llm, session_id)
+    if llm is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    session_expiry.touch(session_id)
+    await session_backend.atouch(f"llm:{session_id}", session_expiry.ttl_seconds)
+    return llm
+
+def get_max_history_tokens(map_reduce: bool = False) -> int:
+    """
+    Return the token budget for the actions sent to the LLM.
+    
+    Args:
+        map_reduce: Whether the actions will be summarized in chunks first, in
+            which case the much larger MAP_REDUCE_MAX_TOKENS budget applies.
+        
+    Returns:
+        The maximum number of tokens allowed.
+    """
+    if map_reduce:
+        return int(os.environ.get("MAP_REDUCE_MAX_TOKENS", 200000))
+    return int(os.environ.get("MAX_HISTORY_TOKENS", 16000))
+    
+def trim_messages(messages, tokenizer_fn, max_tokens: Optional[int] = None, model: Optional[str] = None):
     """
     Trim messages to ensure that the total token count does not exceed max_tokens.
     
+    Oldest messages are dropped first. The cut is located with the calibrated
+    estimator and settled with exact per-message counts, so the (possibly slow
+    or remote) tokenizer only runs on the kept messages and the ones next to
+    the cut, each at most once.
+    
     Args:
         messages: List of messages.
         tokenizer_fn: Function to tokenize messages.
         max_tokens: Maximum allowed tokens.
+        model: Model name used to pick the estimator calibration.
     
     Returns:
         Trimmed list of messages.
     """
-    max_tokens = max_tokens or int(os.environ.get("MAX_HISTORY_TOKENS", 16000))
-    while messages and sum(len(tokenizer_fn(str(msg))) for msg in messages) > max_tokens:
-        messages.pop(0)  # Remove from the beginning
+    max_tokens = max_tokens or get_max_history_tokens()
+    texts = [str(msg) for msg in messages]
+    estimates = [estimate_tokens(text, model) for text in texts]
+
+    # Cheap path: the calibrated upper bound of the whole list already fits.
+    if upper_bound_tokens(sum(estimates), model, count=len(estimates)) <= max_tokens:
+        return messages
+
+    # Estimated cut: keep the newest messages whose estimate fits.
+    cut = len(messages)
+    estimated = 0
+    while cut > 0 and estimated + estimates[cut - 1] <= max_tokens:
+        estimated += estimates[cut - 1]
+        cut -= 1
+
+    # Settle the boundary with exact counts, summed per message on both sides
+    # of the cut so that what is added and removed matches the total.
+    counts = {}
+    def count(index: int) -> int:
+        if index not in counts:
+            counts[index] = len(tokenizer_fn(texts[index]))
+        return counts[index]
+
+    total = sum(count(index) for index in range(cut, len(texts)))
+    while total > max_tokens and cut < len(texts):
+        total -= count(cut)
+        cut += 1
+    while cut > 0 and total + count(cut - 1) <= max_tokens:
+        total += count(cut - 1)
+        cut -= 1
+
+    del messages[:cut]  # Remove from the beginning
     return messages
     
 async def run_concurrent_tasks(llm, message, system_prompt :Union[str, List[str]]):
@@ -156,34 +293,20 @@ def cleanup_llm_sessions():
     """Clean up all LLM sessions."""
     llm_sessions.clear()
 
-async def schedule_session_expiration(session_id: str):
-    """
-    Schedule the expiration of a session exactly 5 minutes after its creation.
-    
-    Args:
-        session_id: The session identifier.
-    """
-    # Wait for 5 minutes (300 seconds) before expiring the session.
-    await asyncio.sleep(300)
-    await expire_session(session_id)
-
 async def expire_session(session_id: str):
     """
     Expire a session by removing it from storage and cleaning up associated resources.
     
+    The LLM client, the fetcher and any active websocket connection of the
+    session are released by the hooks registered on `session_expiry`, and
+    its descriptors are deleted even if another worker renewed them.
+    
     Args:
         session_id: The session identifier.
     """
-    # Remove the expired session from storage.
-    llm_sessions.pop(session_id, None)
-
-    # Expire any associated fetcher in fetcher_service.
-    from services.fetcher_service import expire_fetcher
-    expire_fetcher(session_id)
-
-    # Expire any active websocket connections associated with session_id.
-    from server.websockets import close_websocket_connection
-    close_websocket_connection(session_id)
+    await session_expiry.aexpire([session_id])
+    for key in (f"llm:{session_id}", f"fetcher:{session_id}"):
+        await session_backend.adelete(key)
 
 
 # --- LLM PR Description Generation Utility ---
@@ -204,7 +327,7 @@ async def generate_pr_description_from_commits(commit_messages: List[str], sessi
     if not commit_messages:
         raise ValueError("No commit messages provided for PR description generation.")
 
-    llm = get_llm(session_id)
+    llm = await aget_llm(session_id)
 
     pr_prompt = (
         "You are an AI assistant tasked with generating a concise, clear, and professional pull request description "
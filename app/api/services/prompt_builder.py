@@ -0,0 +1,129 @@
+import json
+from datetime import date
+from typing import List, Optional, Union
+
+from services.prompts import (
+    PR_DESCRIPTION_SYSTEM,
+    SELECT_QUIRKY_REMARK_SYSTEM,
+    SYSTEM,
+    RELEASE_NOTES_SYSTEM,
+    quirky_remarks,
+)
+from services.llm_service import get_daily_quirky_remarks
+
+# The templates keep every static instruction first and the request specific
+# values last, so consecutive requests share the longest possible prefix and
+# providers with prompt caching can reuse it.
+TRIGGER_PROMPT = """
+Consider the following history of actionables from Git and return me the summary with exactly N bullet points, where N is given right before the history.
+
+N = '{N}'
+
+{ACTIONS}
+"""
+
+TRIGGER_RELEASE_PROMPT = """
+Consider the following history of actionables from Git and the previous Release Notes (if available).
+Generate me the next Release Notes based on the new Git Actionables matching the format of the previous releases:
+
+{ACTIONS}
+"""
+
+TRIGGER_PULL_REQUEST_PROMPT = """
+You will now receive a list of commit messages between two branches.
+Using the system instructions provided above, generate a clear, concise, and professional **Pull Request Description** summarizing all changes from the source branch to be merged into the target branch.
+
+Please follow these steps:
+1. Read and analyze the commit messages.
+2. Identify and group related changes under appropriate markdown headers (e.g., Features, Bug Fixes, Improvements, Documentation, Tests).
+3. Write a short **summary paragraph** explaining the overall purpose of this pull request.
+4. Format the final output as a complete markdown-formatted PR description, ready to paste into GitHub.
+
+Begin your response directly with the formatted PR description—no extra commentary or explanation.
+
+Source branch: `{SRC}`
+Target branch: `{TARGET}`
+
+Commits:
+{COMMITS}
+"""
+
+
+def build_system_prompt(action_type: str, day: Optional[date] = None) -> Union[str, List[str]]:
+    """
+    Build the system prompt for a websocket action.
+
+    The recap prompt embeds a remark set that only changes once per day, so the
+    system prompt is byte-identical for every request of that day.
+
+    Args:
+        action_type: One of "recap", "release" or "pull_request".
+        day: Day used to select the quirky remarks (defaults to today, UTC).
+
+    Returns:
+        The system prompt(s) for the action.
+
+    Raises:
+        ValueError: If action_type is not supported.
+    """
+    if action_type == "recap":
+        quirky_system = SELECT_QUIRKY_REMARK_SYSTEM.format(
+            examples=json.dumps(get_daily_quirky_remarks(quirky_remarks, day=day), indent=4)
+        )
+        return [SYSTEM, quirky_system]
+    elif action_type == "release":
+        return RELEASE_NOTES_SYSTEM
+    elif action_type == "pull_request":
+        return PR_DESCRIPTION_SYSTEM
+    raise ValueError(f"Invalid action type: {action_type}")
+
+
+def build_prompt(
+    action_type: str,
+    actions: str,
+    n: Union[int, str] = 5,
+    src_branch: Optional[str] = None,
+    target_branch: Optional[str] = None
+) -> str:
+    """
+    Render the user prompt for a websocket action, with the variable part last.
+
+    Args:
+        action_type: One of "recap", "release" or "pull_request".
+        actions: Actions (or commits) text.
+        n: Number of bullet points for recaps.
+        src_branch: Source branch for pull requests.
+        target_branch: Target branch for pull requests.
+
+    Returns:
+        The rendered prompt.
+
+    Raises:
+        ValueError: If action_type is not supported.
+    """
+    if action_type == "recap":
+        return TRIGGER_PROMPT.format(N=n, ACTIONS=actions)
+    elif action_type == "release":
+        return TRIGGER_RELEASE_PROMPT.format(ACTIONS=actions)
+    elif action_type == "pull_request":
+        return TRIGGER_PULL_REQUEST_PROMPT.format(SRC=src_branch, TARGET=target_branch, COMMITS=actions)
+    raise ValueError(f"Invalid action type: {action_type}")
+
+
+def render_request(system_prompt: Union[str, List[str]], prompt: str) -> str:
+    """Return the request text in the order it is sent to the provider."""
+    system = system_prompt if isinstance(system_prompt, str) else "".join(system_prompt)
+    return system + prompt
+
+
+def shared_prefix_length(a: str, b: str) -> int:
+    """Return the number of leading characters a and b have in common."""
+    # Binary search on slice equality, which compares in C rather than per character
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        mid = (low + high + 1) // 2
+        if a[low:mid] == b[low:mid]:
+            low = mid
+        else:
+            high = mid - 1
+    return low
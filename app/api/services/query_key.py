@@ -0,0 +1,24 @@
+import hashlib
+import json
+from typing import Any, Tuple
+
+
+def make_query_key(session_id: str, name: str, **query: Any) -> Tuple[str, str]:
+    """
+    Build the key of a per-session request from its name and normalized query.
+
+    Args:
+        session_id: The session identifier.
+        name: Name of the endpoint or operation.
+        **query: Parameters the result depends on; lists are compared as
+            sets and dates in ISO format.
+
+    Returns:
+        Tuple[str, str]: (session_id, hex digest of the normalized query).
+    """
+    normalized = {
+        key: sorted(set(value)) if isinstance(value, (list, tuple, set)) else value
+        for key, value in query.items()
+    }
+    payload = json.dumps([name, normalized], sort_keys=True, default=str, ensure_ascii=False)
+    return session_id, hashlib.sha256(payload.encode("utf-8")).hexdigest()
@@ -0,0 +1,256 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+from git_recap.providers.base_fetcher import BaseFetcher
+from git_recap.providers.query import RecapQuery
+from git_recap.utils import parse_entries_to_txt
+from models.schemas import ActionsResponse
+from services.fetcher_service import aget_authored_messages, aget_authors, aget_current_author, aget_repos, hold_fetcher
+from services.llm_service import aget_llm, get_max_history_tokens, trim_messages
+from services.result_cache import result_cache
+from services.session_expiry import session_expiry
+from services.warm_up import SessionWarmUp
+
+# Sections of /bootstrap, i.e. the calls the frontend makes after login
+BOOTSTRAP_SECTIONS = ("repos", "current_author", "authors", "actions")
+# Sections computed when none are requested. Authors walk every commit of the
+# scanned repositories, so they are only added when a repo_filter narrows them.
+DEFAULT_BOOTSTRAP_SECTIONS = ("repos", "current_author", "actions")
+# Sections computed in the background as soon as a session is created
+WARMUP_SECTIONS = ("repos", "current_author", "actions")
+# The frontend recaps the last 7 days by default
+DEFAULT_WINDOW_DAYS = 7
+
+logger = logging.getLogger(__name__)
+
+warm_ups = SessionWarmUp()
+session_expiry.add_hook(warm_ups.cancel)
+
+
+def default_query(
+    fetcher: BaseFetcher,
+    repos: Optional[List[str]] = None,
+    authors: Optional[List[str]] = None
+) -> RecapQuery:
+    """
+    Build the query of the frontend's default recap: the last DEFAULT_WINDOW_DAYS
+    days, from midnight UTC to midnight UTC, as /actions parses its dates.
+
+    Args:
+        fetcher: The fetcher of the session.
+        repos: Repositories to include (default: the fetcher's repo_filter).
+        authors: Authors to include (default: the fetcher's authors).
+
+    Returns:
+        RecapQuery: The query.
+    """
+    today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    return fetcher.make_query(
+        start_date=today - timedelta(days=DEFAULT_WINDOW_DAYS),
+        end_date=today,
+        repos=repos,
+        authors=authors
+    )
+
+
+async def recap_actions(
+    session_id: str,
+    fetcher: BaseFetcher,
+    query: RecapQuery,
+    map_reduce: bool = False
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Build the /actions payload of a query: the entries trimmed to the token
+    budget and formatted as text. Results are served from and stored in the
+    result cache.
+
+    Args:
+        session_id: The session identifier.
+        fetcher: The fetcher of the session.
+        query: What to recap.
+        map_reduce: Whether the actions will be summarized with the websocket
+            map_reduce mode, which allows a much larger token budget.
+
+    Returns:
+        Tuple[str, Dict[str, Any]]: The ETag and the ActionsResponse payload.
+
+    Raises:
+        HTTPException: 404 if the LLM session is not found.
+    """
+    llm = await aget_llm(session_id)
+    cache_key = result_cache.make_key(
+        session_id,
+        "actions",
+        provider=type(fetcher).__name__,
+        start_date=query.start_date,
+        end_date=query.end_date,
+        repos=query.repos,
+        authors=query.authors,
+        map_reduce=map_reduce,
+        model=llm.config.model
+    )
+    cached = result_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    actions = await aget_authored_messages(session_id, fetcher, query)
+
+    # Store original count before trimming
+    original_count = len(actions)
+
+    # Apply token limit trimming
+    trimmed_actions = trim_messages(actions, llm.tokenizer, get_max_history_tokens(map_reduce), llm.config.model)
+
+    # Calculate how many items were removed
+    trimmed_count = original_count - len(trimmed_actions)
+
+    # Generate user-facing message if trimming occurred
+    message = None
+    if trimmed_count > 0:
+        message = (
+            f"We're running the free version with a maximum token limit for contextual input. "
+            f"To stay within this limit, we automatically trimmed {trimmed_count} older Git "
+            f"actionable{'s' if trimmed_count != 1 else ''} from the context. "
+            f"We hope you understand!"
+        )
+
+    # Parse actions to text format
+    actions_txt = parse_entries_to_txt(trimmed_actions)
+
+    # Structured response, cached for identical requests
+    payload = ActionsResponse(
+        actions=actions_txt,
+        message=message,
+        trimmed_count=trimmed_count,
+        total_count=original_count
+    ).model_dump()
+    return result_cache.set(cache_key, payload), payload
+
+
+async def _authors_section(session_id: str, fetcher: BaseFetcher, repo_names: List[str]) -> Dict[str, Any]:
+    authors = await aget_authors(session_id, fetcher, repo_names)
+    return {"authors": authors, "total_count": len(authors), "repo_count": len(repo_names)}
+
+
+async def _current_author_section(session_id: str, fetcher: BaseFetcher) -> Dict[str, Any]:
+    return {"author": await aget_current_author(session_id, fetcher)}
+
+
+async def _actions_section(session_id: str, fetcher: BaseFetcher, query: RecapQuery, map_reduce: bool) -> Dict[str, Any]:
+    _, payload = await recap_actions(session_id, fetcher, query, map_reduce)
+    return payload
+
+
+async def _run_section(name: str, call: Callable[[], Awaitable[Any]]) -> Dict[str, Any]:
+    """Run a section, reporting its failure instead of failing the whole bootstrap."""
+    try:
+        return {"section": name, "data": await call()}
+    except HTTPException as e:
+        return {"section": name, "error": str(e.detail)}
+    except Exception as e:
+        return {"section": name, "error": str(e)}
+
+
+def default_sections(query: RecapQuery) -> Tuple[str, ...]:
+    """Return the sections computed when none are requested (see DEFAULT_BOOTSTRAP_SECTIONS)."""
+    return BOOTSTRAP_SECTIONS if query.repos else DEFAULT_BOOTSTRAP_SECTIONS
+
+
+async def aiter_bootstrap(
+    session_id: str,
+    fetcher: BaseFetcher,
+    query: RecapQuery,
+    sections: Optional[Sequence[str]] = None,
+    map_reduce: bool = False
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Compute the sections of the first screen concurrently and yield each one
+    as soon as it completes.
+
+    The sections share the session's in-flight calls (see `single_flight`),
+    so the repository listing and the user lookup happen once even if the
+    standalone endpoints are called at the same time, and the actions come
+    from (and go to) the result cache.
+
+    Args:
+        session_id: The session identifier.
+        fetcher: The fetcher of the session.
+        query: The recap of the actions section; its repositories also
+            select the repositories scanned for authors.
+        sections: Names of the sections to compute, among BOOTSTRAP_SECTIONS
+            (default: `default_sections`).
+        map_reduce: Token budget of the actions section (see `recap_actions`).
+
+    Yields:
+        Dict[str, Any]: {"section": name, "data": result} or
+        {"section": name, "error": detail}, in completion order.
+    """
+    calls = {
+        "repos": lambda: aget_repos(session_id, fetcher),
+        "current_author": lambda: _current_author_section(session_id, fetcher),
+        "authors": lambda: _authors_section(session_id, fetcher, list(query.repos)),
+        "actions": lambda: _actions_section(session_id, fetcher, query, map_reduce)
+    }
+    if sections is None:
+        sections = default_sections(query)
+    tasks = [asyncio.ensure_future(_run_section(name, calls[name])) for name in sections]
+    try:
+        for done in asyncio.as_completed(tasks):
+            yield await done
+    finally:
+        # The client went away (or the caller stopped iterating)
+        for task in tasks:
+            task.cancel()
+
+
+async def bootstrap(
+    session_id: str,
+    fetcher: BaseFetcher,
+    query: RecapQuery,
+    sections: Optional[Sequence[str]] = None,
+    map_reduce: bool = False
+) -> Dict[str, Any]:
+    """
+    Compute the sections of the first screen concurrently (see `aiter_bootstrap`).
+
+    Returns:
+        Dict[str, Any]: The session_id, one key per computed section, and the
+        "errors" of the sections that failed.
+    """
+    result: Dict[str, Any] = {"session_id": session_id, "errors": {}}
+    async for item in aiter_bootstrap(session_id, fetcher, query, sections, map_reduce):
+        if "error" in item:
+            result["errors"][item["section"]] = item["error"]
+        else:
+            result[item["section"]] = item["data"]
+    return result
+
+
+async def _warm_up(session_id: str, fetcher: BaseFetcher) -> None:
+    hold_fetcher(fetcher)
+    async for item in aiter_bootstrap(session_id, fetcher, default_query(fetcher), WARMUP_SECTIONS):
+        if "error" in item:
+            logger.info(f"Warm-up of {item['section']} failed for session {session_id}: {item['error']}")
+
+
+def start_warm_up(session_id: str, fetcher: BaseFetcher) -> bool:
+    """
+    Prefetch, in the background, what a new session is likely to ask first:
+    the repository listing, the current user and the default 7-day recap.
+
+    The warm-up goes through the same single-flight calls and result cache
+    as the endpoints, so a request arriving while it runs joins it and a
+    request arriving after it is served from the cache. It is cancelled if
+    the session expires first.
+
+    Args:
+        session_id: The session identifier.
+        fetcher: The fetcher of the session.
+
+    Returns:
+        bool: Whether the warm-up was started (see `SessionWarmUp`).
+    """
+    return warm_ups.start(session_id, lambda: _warm_up(session_id, fetcher))
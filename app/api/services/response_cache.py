@@ -0,0 +1,73 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, List, Optional, Union
+
+RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get("RESPONSE_CACHE_MAX_ENTRIES", 256))
+RESPONSE_CACHE_TTL_SECONDS = int(os.environ.get("RESPONSE_CACHE_TTL_SECONDS", 3600))
+
+
+class ResponseCache:
+    """
+    Exact-match cache of streamed LLM completions with LRU + TTL eviction.
+
+    The streamed chunks are kept as received, so a hit can be replayed through
+    the websocket exactly like a live completion.
+    """
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES, ttl_seconds: int = RESPONSE_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(config: Any, system_prompt: Union[str, List[str]], prompt: Union[str, List[str]]) -> str:
+        """
+        Build the cache key for a completion request.
+
+        Args:
+            config: The LLM configuration (the API key is excluded from the key).
+            system_prompt: System prompt(s) sent with the request.
+            prompt: Rendered prompt(s) sent with the request.
+
+        Returns:
+            str: Hex digest identifying the request.
+        """
+        if hasattr(config, "model_dump"):
+            config = config.model_dump(mode="json", exclude={"api_key"})
+        payload = json.dumps([config, system_prompt, prompt], sort_keys=True, default=str, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[List[str]]:
+        """Return the cached chunks for key, or None if missing or expired."""
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None or time.monotonic() - item[0] > self.ttl_seconds:
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(item[1])
+
+    def set(self, key: str, chunks: List[str]) -> None:
+        """Store the chunks for key, evicting the least recently used entries."""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), list(chunks))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        with self._lock:
+            self._entries.clear()
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,105 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+
+from services.query_key import make_query_key
+from services.session_expiry import session_expiry
+
+RESULT_CACHE_MAX_ENTRIES = int(os.environ.get("RESULT_CACHE_MAX_ENTRIES", 512))
+RESULT_CACHE_TTL_SECONDS = int(os.environ.get("RESULT_CACHE_TTL_SECONDS", 120))
+
+
+class ResultCache:
+    """
+    Per-session cache of endpoint results (/actions, /release_notes) with LRU + TTL eviction.
+
+    Entries are keyed by session and by the normalized query, and carry an
+    ETag derived from the result, so clients can revalidate with If-None-Match.
+    The TTL is short: provider data keeps changing while a session is open.
+    """
+
+    def __init__(self, max_entries: int = RESULT_CACHE_MAX_ENTRIES, ttl_seconds: int = RESULT_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple[str, str], tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    # (session_id, digest of the name and normalized query), shared with SingleFlight
+    make_key = staticmethod(make_query_key)
+
+    @staticmethod
+    def make_etag(payload: Dict[str, Any]) -> str:
+        """Return a strong ETag for a JSON-serializable result."""
+        body = json.dumps(payload, sort_keys=True, default=str, ensure_ascii=False)
+        return '"' + hashlib.sha256(body.encode("utf-8")).hexdigest()[:32] + '"'
+
+    def get(self, key: Tuple[str, str]) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Return (etag, result) cached for key, or None if missing or expired."""
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None or time.monotonic() - item[0] > self.ttl_seconds:
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return item[1], item[2]
+
+    def set(self, key: Tuple[str, str], payload: Dict[str, Any]) -> str:
+        """
+        Store a result, evicting the least recently used entries.
+
+        Returns:
+            str: The ETag of the result.
+        """
+        etag = self.make_etag(payload)
+        with self._lock:
+            self._entries[key] = (time.monotonic(), etag, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return etag
+
+    def invalidate_session(self, session_id: str) -> None:
+        """Remove the cached results of a session."""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == session_id]:
+                del self._entries[key]
+
+    def stats(self) -> Dict[str, int]:
+        """Return the number of entries, hits and misses."""
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+def conditional_response(request: Request, etag: str, payload: Dict) -> Response:
+    """
+    Return a cached result, or a 304 if the client already holds it.
+
+    Args:
+        request: The incoming request (its If-None-Match header is checked).
+        etag: ETag of the result.
+        payload: The result.
+
+    Returns:
+        Response: 304 without a body if If-None-Match matches, else the JSON result.
+    """
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if_none_match = request.headers.get("if-none-match", "")
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if etag in tags or "*" in tags:
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(payload, headers=headers)
+
+
+result_cache = ResultCache()
+session_expiry.add_hook(result_cache.invalidate_session)
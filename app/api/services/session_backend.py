@@ -0,0 +1,312 @@
+import base64
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional, Tuple
+
+from cryptography.fernet import Fernet, InvalidToken
+
+from services.executors import provider_executor
+
+# memory:// (one process), sqlite:///path (workers on one host) or redis://host:port/db
+SESSION_BACKEND_URL = os.environ.get("SESSION_BACKEND_URL", "memory://")
+# Worker processes started by main.py, which must share the encryption key
+UVICORN_WORKERS = int(os.environ.get("UVICORN_WORKERS", "1"))
+# A worker renews its local expiry and the descriptor a moment apart, so an
+# idle session's descriptor may outlive the local deadline by this much
+EXPIRY_GRACE_SECONDS = 5.0
+
+logger = logging.getLogger(__name__)
+
+
+class SessionBackend(ABC):
+    """
+    Storage of session descriptors shared by the API worker processes.
+
+    A descriptor is a small JSON-serializable dict from which a worker can
+    rebuild the objects of a session (LLM client, fetcher) it has never seen,
+    so any worker can serve any session. Descriptors expire after their TTL
+    unless touched.
+    """
+
+    # Whether other worker processes see the descriptors
+    shared: bool = True
+    # Whether calls do I/O (a database or network round trip), so async
+    # handlers must not make them on the event loop
+    blocking: bool = True
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the descriptor stored under key, or None if missing or expired."""
+
+    @abstractmethod
+    def set(self, key: str, descriptor: Dict[str, Any], ttl_seconds: float) -> None:
+        """Store a descriptor under key for ttl_seconds."""
+
+    @abstractmethod
+    def touch(self, key: str, ttl_seconds: float) -> None:
+        """Push the expiry of the descriptor under key back to ttl_seconds from now."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove the descriptor stored under key."""
+
+    @abstractmethod
+    def expire(self, key: str, grace_seconds: float = EXPIRY_GRACE_SECONDS) -> None:
+        """
+        Remove the descriptor stored under key unless it was renewed since it
+        went idle, i.e. unless it expires more than grace_seconds from now.
+
+        Called when the session expires in one worker: a session another
+        worker keeps renewing stays restorable.
+        """
+
+    async def _arun(self, fn, *args: Any) -> Any:
+        if not self.blocking:
+            return fn(*args)
+        return await provider_executor.run(fn, *args)
+
+    async def aget(self, key: str) -> Optional[Dict[str, Any]]:
+        """Async counterpart of `get`, run in the provider I/O pool unless the backend is in-process."""
+        return await self._arun(self.get, key)
+
+    async def aset(self, key: str, descriptor: Dict[str, Any], ttl_seconds: float) -> None:
+        """Async counterpart of `set`."""
+        await self._arun(self.set, key, descriptor, ttl_seconds)
+
+    async def atouch(self, key: str, ttl_seconds: float) -> None:
+        """Async counterpart of `touch`."""
+        await self._arun(self.touch, key, ttl_seconds)
+
+    async def adelete(self, key: str) -> None:
+        """Async counterpart of `delete`."""
+        await self._arun(self.delete, key)
+
+
+class MemorySessionBackend(SessionBackend):
+    """
+    In-process backend, for single-worker deployments and tests.
+
+    Descriptors are stored serialized, so they go through the same JSON round
+    trip as with the shared backends.
+    """
+
+    shared = False
+    blocking = False
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] < time.time():
+                del self._entries[key]
+                return None
+        return json.loads(entry[0])
+
+    def set(self, key: str, descriptor: Dict[str, Any], ttl_seconds: float) -> None:
+        now = time.time()
+        with self._lock:
+            self._entries = {k: v for k, v in self._entries.items() if v[1] >= now}
+            self._entries[key] = (json.dumps(descriptor), now + ttl_seconds)
+
+    def touch(self, key: str, ttl_seconds: float) -> None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries[key] = (entry[0], time.time() + ttl_seconds)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def expire(self, key: str, grace_seconds: float = EXPIRY_GRACE_SECONDS) -> None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] <= time.time() + grace_seconds:
+                del self._entries[key]
+
+
+class SQLiteSessionBackend(SessionBackend):
+    """SQLite backend, shared by the worker processes of one host."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                " key TEXT PRIMARY KEY,"
+                " descriptor TEXT NOT NULL,"
+                " expires_at REAL NOT NULL)"
+            )
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT descriptor, expires_at FROM sessions WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or row[1] < time.time():
+            return None
+        return json.loads(row[0])
+
+    def set(self, key: str, descriptor: Dict[str, Any], ttl_seconds: float) -> None:
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM sessions WHERE expires_at < ?", (now,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sessions (key, descriptor, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(descriptor), now + ttl_seconds)
+            )
+
+    def touch(self, key: str, ttl_seconds: float) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE sessions SET expires_at = ? WHERE key = ?", (time.time() + ttl_seconds, key)
+            )
+
+    def delete(self, key: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM sessions WHERE key = ?", (key,))
+
+    def expire(self, key: str, grace_seconds: float = EXPIRY_GRACE_SECONDS) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM sessions WHERE key = ? AND expires_at <= ?", (key, time.time() + grace_seconds)
+            )
+
+
+class RedisSessionBackend(SessionBackend):
+    """
+    Redis backend (or any server speaking the Redis protocol), shared by
+    workers on any number of hosts. Requires the `redis` package.
+    """
+
+    # Checks the remaining TTL and deletes in one atomic step
+    EXPIRE_SCRIPT = (
+        "if redis.call('pttl', KEYS[1]) <= tonumber(ARGV[1]) then "
+        "return redis.call('del', KEYS[1]) end return 0"
+    )
+
+    def __init__(self, url: str, prefix: str = "gitrecap:session:"):
+        try:
+            import redis
+        except ImportError:
+            raise ImportError("The redis session backend requires the redis package: pip install redis")
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        value = self._client.get(self.prefix + key)
+        return None if value is None else json.loads(value)
+
+    def set(self, key: str, descriptor: Dict[str, Any], ttl_seconds: float) -> None:
+        self._client.set(self.prefix + key, json.dumps(descriptor), px=int(ttl_seconds * 1000))
+
+    def touch(self, key: str, ttl_seconds: float) -> None:
+        self._client.pexpire(self.prefix + key, int(ttl_seconds * 1000))
+
+    def delete(self, key: str) -> None:
+        self._client.delete(self.prefix + key)
+
+    def expire(self, key: str, grace_seconds: float = EXPIRY_GRACE_SECONDS) -> None:
+        self._client.eval(self.EXPIRE_SCRIPT, 1, self.prefix + key, int(grace_seconds * 1000))
+
+
+def create_session_backend(url: str = SESSION_BACKEND_URL) -> SessionBackend:
+    """
+    Create the session backend described by a URL.
+
+    Args:
+        url: memory://, sqlite:///absolute/path/to/file or redis://host:port/db.
+
+    Returns:
+        SessionBackend: The session backend.
+
+    Raises:
+        ValueError: If the URL scheme is not supported.
+    """
+    scheme, _, location = url.partition("://")
+    if scheme == "memory":
+        return MemorySessionBackend()
+    if scheme == "sqlite":
+        return SQLiteSessionBackend(location)
+    if scheme in ("redis", "rediss", "unix"):
+        return RedisSessionBackend(url)
+    raise ValueError(f"Unsupported session backend: {url}")
+
+
+def _load_cipher(shared: bool) -> Fernet:
+    """
+    Cipher of the secrets (access tokens, API keys) stored in descriptors.
+
+    Uses SESSION_ENCRYPTION_KEY (a Fernet key), else a key derived from
+    SECRET_KEY. Without either variable a random per-process key is used,
+    which only suits a single worker with its own backend.
+
+    Args:
+        shared: Whether other processes read the descriptors (a shared
+            backend, or several workers).
+
+    Raises:
+        RuntimeError: If shared and neither variable is set, as other
+            workers could not decrypt the descriptors.
+    """
+    key = os.environ.get("SESSION_ENCRYPTION_KEY")
+    if key:
+        return Fernet(key.encode("utf-8"))
+    secret = os.environ.get("SECRET_KEY")
+    if secret:
+        return Fernet(base64.urlsafe_b64encode(hashlib.sha256(secret.encode("utf-8")).digest()))
+    if shared:
+        raise RuntimeError(
+            "SESSION_ENCRYPTION_KEY or SECRET_KEY must be set when sessions are shared "
+            "(SESSION_BACKEND_URL other than memory://, or UVICORN_WORKERS > 1)"
+        )
+    return Fernet(Fernet.generate_key())
+
+
+def encrypt_secret(value: Any) -> str:
+    """
+    Encrypt a JSON-serializable secret for storage in a descriptor.
+
+    Args:
+        value: The secret (e.g. an access token).
+
+    Returns:
+        str: The encrypted secret.
+    """
+    return _cipher.encrypt(json.dumps(value).encode("utf-8")).decode("ascii")
+
+
+def decrypt_secret(token: str) -> Any:
+    """
+    Decrypt a secret encrypted by `encrypt_secret`.
+
+    Args:
+        token: The encrypted secret.
+
+    Returns:
+        Any: The secret, or None if it was encrypted with another key.
+    """
+    try:
+        return json.loads(_cipher.decrypt(token.encode("ascii")))
+    except InvalidToken:
+        logger.warning("Session secret was encrypted with another key")
+        return None
+
+
+# Shared by the LLM and fetcher services
+session_backend = create_session_backend()
+_cipher = _load_cipher(session_backend.shared or UVICORN_WORKERS > 1)
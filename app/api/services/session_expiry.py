@@ -0,0 +1,174 @@
+import asyncio
+import heapq
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from services.executors import MonitoredExecutor, git_executor
+
+SESSION_TTL_SECONDS = float(os.environ.get("SESSION_TTL", 300))
+SESSION_SWEEP_SECONDS = float(os.environ.get("SESSION_SWEEP_SECONDS", 5))
+
+logger = logging.getLogger(__name__)
+
+
+class SessionExpiry:
+    """
+    Sliding-TTL expiry of sessions, driven by a single background sweeper.
+
+    Each session has one deadline, pushed back by `touch` whenever it is used,
+    and one entry in a heap ordered by deadline. Touching only updates the
+    deadline; a stale heap entry is re-pushed with the current deadline when
+    the sweeper reaches it, so the heap never holds more than one entry per
+    session. Every sweep expires all sessions past their deadline in one pass,
+    calling the registered hooks (LLM sessions, fetchers, websockets) for each
+    in the executor, as they block (removing clones, deleting descriptors).
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = SESSION_TTL_SECONDS,
+        sweep_seconds: float = SESSION_SWEEP_SECONDS,
+        executor: MonitoredExecutor = git_executor
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.sweep_seconds = sweep_seconds
+        self.executor = executor
+        self.expired = 0
+        self._deadlines: Dict[str, float] = {}
+        self._heap: List[Tuple[float, str]] = []
+        self._hooks: List[Callable[[str], None]] = []
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def add_hook(self, hook: Callable[[str], None]) -> None:
+        """
+        Register a function called with the id of every expired session.
+
+        Hooks may block, and run in a worker thread unless the session is
+        expired with the synchronous `expire`.
+
+        Args:
+            hook: Releases the resources a service holds for the session.
+        """
+        self._hooks.append(hook)
+
+    def touch(self, session_id: str) -> None:
+        """
+        Start tracking a session, or push its deadline back by the TTL.
+
+        Args:
+            session_id: The session identifier.
+        """
+        deadline = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            if session_id not in self._deadlines:
+                heapq.heappush(self._heap, (deadline, session_id))
+            self._deadlines[session_id] = deadline
+
+    def discard(self, session_id: str) -> None:
+        """Stop tracking a session (its heap entry is dropped lazily)."""
+        with self._lock:
+            self._deadlines.pop(session_id, None)
+
+    def pop_expired(self, now: Optional[float] = None) -> List[str]:
+        """
+        Remove and return the sessions whose deadline has passed.
+
+        Args:
+            now: Monotonic time to compare deadlines with (default: now).
+
+        Returns:
+            List[str]: The expired session ids.
+        """
+        now = time.monotonic() if now is None else now
+        expired = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                deadline, session_id = heapq.heappop(self._heap)
+                current = self._deadlines.get(session_id)
+                if current is None:
+                    continue
+                if current > deadline:
+                    # Touched since this entry was pushed
+                    heapq.heappush(self._heap, (current, session_id))
+                    continue
+                del self._deadlines[session_id]
+                expired.append(session_id)
+        return expired
+
+    def expire(self, session_ids: List[str]) -> None:
+        """
+        Expire sessions now, releasing their resources through the hooks.
+
+        Args:
+            session_ids: The session identifiers.
+        """
+        for session_id in session_ids:
+            self.discard(session_id)
+            for hook in self._hooks:
+                try:
+                    hook(session_id)
+                except Exception:
+                    logger.exception(f"Failed to expire session {session_id}")
+        self.expired += len(session_ids)
+
+    async def aexpire(self, session_ids: List[str]) -> None:
+        """
+        Async counterpart of `expire`, which runs the hooks in the executor.
+
+        Args:
+            session_ids: The session identifiers.
+        """
+        await self.executor.run(self.expire, session_ids)
+
+    async def sweep(self) -> int:
+        """
+        Expire every session past its deadline.
+
+        Returns:
+            int: Number of sessions expired.
+        """
+        expired = self.pop_expired()
+        if expired:
+            await self.aexpire(expired)
+        return len(expired)
+
+    async def run(self) -> None:
+        """Sweep expired sessions every `sweep_seconds`, until cancelled."""
+        while True:
+            await asyncio.sleep(self.sweep_seconds)
+            try:
+                await self.sweep()
+            except Exception:
+                logger.exception("Failed to sweep expired sessions")
+
+    def start(self) -> None:
+        """Start the sweeper on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """Stop the sweeper."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the number of tracked and expired sessions."""
+        with self._lock:
+            return {
+                "tracked": len(self._deadlines),
+                "ttl_seconds": self.ttl_seconds,
+                "expired": self.expired
+            }
+
+
+# Shared by all services, so one sweep expires a session everywhere
+session_expiry = SessionExpiry()
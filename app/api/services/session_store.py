@@ -0,0 +1,278 @@
+import asyncio
+import os
+import sys
+import threading
+import types
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from services.executors import MonitoredExecutor, provider_executor
+
+SESSION_STORE_MAX_ENTRIES = int(os.environ.get("SESSION_STORE_MAX_ENTRIES", 500))
+SESSION_STORE_MAX_MB = int(os.environ.get("SESSION_STORE_MAX_MB", 256))
+
+
+# Objects shared by every session (classes, modules, functions) are not counted
+_SHARED_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+
+
+def approximate_size(obj: Any, max_objects: int = 20000) -> int:
+    """
+    Approximate the memory held by an object graph, in bytes.
+
+    Containers and instance attributes are followed (each object counted
+    once) up to max_objects objects, which bounds the cost for large graphs
+    such as SDK clients holding connection pools. The walk can take several
+    milliseconds: async code stores objects with `aset`, which runs it in a
+    worker thread.
+
+    Args:
+        obj: Root object.
+        max_objects: Maximum number of objects visited.
+
+    Returns:
+        int: Approximate size in bytes.
+    """
+    seen = set()
+    stack = [obj]
+    total = 0
+    while stack and len(seen) < max_objects:
+        current = stack.pop()
+        if id(current) in seen or isinstance(current, _SHARED_TYPES):
+            continue
+        seen.add(id(current))
+        try:
+            total += sys.getsizeof(current)
+        except TypeError:
+            continue
+        if isinstance(current, (str, bytes, bytearray, int, float, bool)):
+            continue
+        try:
+            if isinstance(current, dict):
+                stack.extend(list(current.items()))
+            elif isinstance(current, (list, tuple, set, frozenset)):
+                stack.extend(list(current))
+        except RuntimeError:
+            # Mutated by another thread during the walk
+            continue
+        if hasattr(current, "__dict__"):
+            stack.append(vars(current))
+        for slot in getattr(type(current), "__slots__", ()):
+            if isinstance(slot, str) and hasattr(current, slot):
+                stack.append(getattr(current, slot))
+    return total
+
+
+class SessionStore(ABC):
+    """
+    Storage of per-session objects (LLM clients, fetchers), keyed by session id.
+
+    Implementations bound their memory and report their occupancy, so a burst
+    of sessions evicts old ones instead of exhausting the process.
+    """
+
+    name: str
+
+    @abstractmethod
+    def get(self, session_id: str) -> Optional[Any]:
+        """Return the object of a session, or None."""
+
+    @abstractmethod
+    def set(self, session_id: str, value: Any) -> None:
+        """Store the object of a session, evicting other sessions if needed."""
+
+    @abstractmethod
+    async def aset(self, session_id: str, value: Any) -> None:
+        """Store the object of a session without blocking the event loop."""
+
+    @abstractmethod
+    def pop(self, session_id: str) -> Optional[Any]:
+        """Remove and return the object of a session, without calling the eviction hook."""
+
+    @abstractmethod
+    def evict(self, session_id: str) -> None:
+        """Remove the object of a session and pass it to the eviction hook once no lease holds it."""
+
+    @abstractmethod
+    def acquire(self, value: Any) -> None:
+        """Lease a stored object: if it is evicted, its eviction hook waits for `release`."""
+
+    @abstractmethod
+    def release(self, value: Any) -> None:
+        """Drop a lease taken with `acquire`, running the eviction hook deferred by the last one."""
+
+    @abstractmethod
+    def release_in_background(self, value: Any) -> None:
+        """Drop a lease from the event loop, running a deferred eviction hook in a worker thread."""
+
+    @abstractmethod
+    def items(self) -> List[Tuple[str, Any]]:
+        """Return a snapshot of the stored (session_id, object) pairs."""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        """Return the occupancy of the store."""
+
+    def values(self) -> List[Any]:
+        return [value for _, value in self.items()]
+
+    def clear(self) -> None:
+        for session_id, _ in self.items():
+            self.pop(session_id)
+
+    def __contains__(self, session_id: str) -> bool:
+        return self.get(session_id) is not None
+
+    def __len__(self) -> int:
+        return len(self.items())
+
+
+class InMemorySessionStore(SessionStore):
+    """
+    In-process session store with LRU eviction under entry and memory caps.
+
+    The size of each object is approximated when it is stored. When either cap
+    is exceeded the least recently used sessions are evicted and passed to the
+    `on_evict` hook (e.g. to release clones); the hook of an object leased by
+    in-flight requests runs when its last lease is released.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int = SESSION_STORE_MAX_ENTRIES,
+        max_bytes: int = SESSION_STORE_MAX_MB * 1024 ** 2,
+        on_evict: Optional[Callable[[str, Any], None]] = None,
+        size_fn: Callable[[Any], int] = approximate_size,
+        executor: MonitoredExecutor = provider_executor
+    ):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.on_evict = on_evict
+        self.size_fn = size_fn
+        self.executor = executor
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict()
+        self._bytes = 0
+        # Lease counts, and evicted objects waiting for their leases, by object id
+        self._leases: Dict[int, int] = {}
+        self._retired: Dict[int, Tuple[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                return None
+            self._entries.move_to_end(session_id)
+            return entry[0]
+
+    def set(self, session_id: str, value: Any) -> None:
+        size = self.size_fn(value)
+        evicted = []
+        with self._lock:
+            previous = self._entries.pop(session_id, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[session_id] = (value, size)
+            self._bytes += size
+            # The new session itself is never evicted
+            while len(self._entries) > 1 and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                old_id, (old_value, old_size) = self._entries.popitem(last=False)
+                self._bytes -= old_size
+                self.evictions += 1
+                evicted.extend(self._retire(old_id, old_value))
+        self._run_hook(evicted)
+
+    async def aset(self, session_id: str, value: Any) -> None:
+        # Sizing and the eviction hooks run in the executor
+        await self.executor.run(self.set, session_id, value)
+
+    def pop(self, session_id: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.pop(session_id, None)
+            if entry is None:
+                return None
+            self._bytes -= entry[1]
+            return entry[0]
+
+    def evict(self, session_id: str) -> None:
+        with self._lock:
+            entry = self._entries.pop(session_id, None)
+            if entry is None:
+                return
+            self._bytes -= entry[1]
+            evicted = self._retire(session_id, entry[0])
+        self._run_hook(evicted)
+
+    def acquire(self, value: Any) -> None:
+        with self._lock:
+            self._leases[id(value)] = self._leases.get(id(value), 0) + 1
+
+    def release(self, value: Any) -> None:
+        self._run_hook(self._unlease(value))
+
+    def release_in_background(self, value: Any) -> None:
+        evicted = self._unlease(value)
+        if evicted:
+            asyncio.ensure_future(self.executor.run(self._run_hook, evicted))
+
+    def _retire(self, session_id: str, value: Any) -> List[Tuple[str, Any]]:
+        """Return an evicted entry whose hook can run now, or keep it until released (lock held)."""
+        if self._leases.get(id(value)):
+            self._retired[id(value)] = (session_id, value)
+            return []
+        return [(session_id, value)]
+
+    def _unlease(self, value: Any) -> List[Tuple[str, Any]]:
+        """Drop a lease and return the entry whose hook it deferred, if it was the last one."""
+        with self._lock:
+            count = self._leases.pop(id(value), 0) - 1
+            if count > 0:
+                self._leases[id(value)] = count
+                return []
+            retired = self._retired.pop(id(value), None)
+            return [retired] if retired is not None else []
+
+    def _run_hook(self, evicted: List[Tuple[str, Any]]) -> None:
+        if self.on_evict:
+            for session_id, value in evicted:
+                self.on_evict(session_id, value)
+
+    def items(self) -> List[Tuple[str, Any]]:
+        with self._lock:
+            return [(session_id, value) for session_id, (value, _) in self._entries.items()]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "name": self.name,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "evictions": self.evictions,
+                "leased": len(self._leases),
+                "retired": len(self._retired)
+            }
+
+
+def create_session_store(name: str, on_evict: Optional[Callable[[str, Any], None]] = None) -> SessionStore:
+    """
+    Create the session store configured for this deployment.
+
+    Args:
+        name: Name of the store, reported in its stats.
+        on_evict: Hook called with (session_id, object) for evicted sessions.
+
+    Returns:
+        SessionStore: The session store.
+    """
+    return InMemorySessionStore(name, on_evict=on_evict)
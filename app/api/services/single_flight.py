@@ -0,0 +1,72 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+from services.query_key import make_query_key
+
+T = TypeVar("T")
+
+
+class _Call:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: "asyncio.Task"):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls into one in-flight computation.
+
+    The first caller for a key starts the computation; callers arriving while
+    it runs await the same task and get the same result (or exception). The
+    task is cancelled only when every waiter has been cancelled (e.g. all
+    clients disconnected), so one impatient client does not abort the others.
+    The key is forgotten as soon as the computation finishes: results are not
+    cached here.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    # (session_id, digest of the name and normalized query), shared with ResultCache
+    make_key = staticmethod(make_query_key)
+
+    def _forget(self, key: Hashable, call: _Call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run fn, or join the identical call already in flight.
+
+        Args:
+            key: Identity of the call (see `make_key`).
+            fn: Starts the computation when no identical call is in flight.
+
+        Returns:
+            The result of the computation.
+        """
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+            self.started += 1
+        else:
+            self.coalesced += 1
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            if call.waiters == 1 and not call.task.done():
+                call.task.cancel()
+            raise
+        finally:
+            call.waiters -= 1
+
+    def stats(self) -> Dict[str, int]:
+        """Return the number of calls in flight, started and coalesced."""
+        return {"in_flight": len(self._calls), "started": self.started, "coalesced": self.coalesced}
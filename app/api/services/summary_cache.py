@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+SUMMARY_CACHE_PATH = os.environ.get(
+    "SUMMARY_CACHE_PATH",
+    os.path.join(tempfile.gettempdir(), "gitrecap_summary_cache.sqlite3")
+)
+SUMMARY_CACHE_TTL_DAYS = int(os.environ.get("SUMMARY_CACHE_TTL_DAYS", 30))
+
+
+class SummaryCache:
+    """
+    Persistent cache of per-day intermediate summaries.
+
+    Entries are keyed by the author set, repository set, day, model and a hash
+    of the day's entries, so a day is only summarized again when its content
+    (or the scope it was summarized for) changes. The cache is stored in SQLite
+    so it survives restarts and can be shared by several workers on one host.
+    Its methods block on disk I/O: async code calls them in an executor.
+    """
+
+    def __init__(self, path: str = SUMMARY_CACHE_PATH, ttl_days: int = SUMMARY_CACHE_TTL_DAYS):
+        self.path = path
+        self.ttl_seconds = ttl_days * 24 * 3600
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS day_summaries ("
+                " key TEXT PRIMARY KEY,"
+                " day TEXT NOT NULL,"
+                " summary TEXT NOT NULL,"
+                " created_at REAL NOT NULL)"
+            )
+        self.prune()
+
+    @staticmethod
+    def make_key(
+        authors: Iterable[str],
+        repos: Iterable[str],
+        day: str,
+        entries: List[str],
+        model: Optional[str] = None
+    ) -> str:
+        """
+        Build the cache key for one day of activity.
+
+        Args:
+            authors: Authors the activity was filtered on.
+            repos: Repositories present in the day's entries.
+            day: The day (YYYY-MM-DD).
+            entries: The day's entries, as rendered for the LLM.
+            model: The model used to produce the summary.
+
+        Returns:
+            str: Hex digest identifying the summary.
+        """
+        content_hash = hashlib.sha256("\n".join(entries).encode("utf-8")).hexdigest()
+        payload = json.dumps(
+            [sorted(set(authors)), sorted(set(repos)), day, content_hash, model or ""],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached summary for key, or None if missing or expired."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT summary, created_at FROM day_summaries WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or time.time() - row[1] > self.ttl_seconds:
+            return None
+        return row[0]
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        """Return the cached, unexpired summaries of keys, by key."""
+        found = {}
+        for key in keys:
+            summary = self.get(key)
+            if summary is not None:
+                found[key] = summary
+        return found
+
+    def set(self, key: str, day: str, summary: str) -> None:
+        """Store the summary for key, replacing any previous value."""
+        self.set_many([(key, day, summary)])
+
+    def set_many(self, items: Iterable[Tuple[str, str, str]]) -> None:
+        """Store (key, day, summary) items in one transaction."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO day_summaries (key, day, summary, created_at) VALUES (?, ?, ?, ?)",
+                [(key, day, summary, now) for key, day, summary in items]
+            )
+
+    def prune(self) -> int:
+        """
+        Remove expired summaries.
+
+        Returns:
+            int: Number of removed summaries.
+        """
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM day_summaries WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+            )
+        return cursor.rowcount
+
+
+_summary_cache: Optional[SummaryCache] = None
+_summary_cache_lock = threading.Lock()
+
+
+def get_summary_cache() -> SummaryCache:
+    """
+    Return the shared summary cache, opening its database on first use.
+
+    Returns:
+        SummaryCache: The cache stored at SUMMARY_CACHE_PATH.
+    """
+    global _summary_cache
+    with _summary_cache_lock:
+        if _summary_cache is None:
+            _summary_cache = SummaryCache(SUMMARY_CACHE_PATH, SUMMARY_CACHE_TTL_DAYS)
+        return _summary_cache
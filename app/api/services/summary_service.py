@@ -0,0 +1,262 @@
+import asyncio
+import os
+import re
+from collections import defaultdict
+from datetime import date
+from typing import Callable, Dict, List, Optional, Tuple
+
+from services.prompts import CHUNK_SUMMARY_SYSTEM
+from services.executors import provider_executor
+from services.summary_cache import SummaryCache, get_summary_cache
+
+DAY_HEADER_PATTERN = re.compile(r"^(\d{4}-\d{2}-\d{2}):$")
+RELEASES_HEADER_PATTERN = re.compile(r"^Date: \d{4}-\d{2}-\d{2}$")
+ENTRY_REPO_PATTERN = re.compile(r"^ - \[[^\]]+\] in (.+?): ")
+
+MAP_REDUCE_CONCURRENCY = int(os.environ.get("MAP_REDUCE_CONCURRENCY", 4))
+MAP_CHUNK_TOKENS = int(os.environ.get("MAP_CHUNK_TOKENS", 8000))
+
+TRIGGER_CHUNK_PROMPT = """
+Condense the following slice of Git actionables into a short list of notes.
+Keep repository names, pull request and issue numbers, and drop anything repetitive.
+
+Slice: {LABEL}
+
+{ACTIONS}
+"""
+
+
+def split_actions_txt(actions_txt: str) -> Tuple[Dict[str, List[str]], str]:
+    """
+    Split the output of `parse_entries_to_txt` back into per-day entries.
+
+    Each entry keeps its continuation lines (multi-line commit messages), so it
+    can be regrouped without losing content. Anything that is not part of a day
+    block (e.g. the previous releases appended by `/release_notes`) is returned
+    untouched so it can be forwarded to the reduce step.
+
+    Args:
+        actions_txt: Text produced by `parse_entries_to_txt`, optionally followed
+            by `parse_releases_to_txt` output.
+
+    Returns:
+        Tuple of a dict mapping each day (YYYY-MM-DD) to its entries, and the
+        passthrough text.
+    """
+    days: Dict[str, List[str]] = defaultdict(list)
+    passthrough = []
+    current_day = None
+    for line in actions_txt.splitlines():
+        if RELEASES_HEADER_PATTERN.match(line):
+            current_day = None
+        match = DAY_HEADER_PATTERN.match(line)
+        if match:
+            current_day = match.group(1)
+            continue
+        if current_day is None:
+            passthrough.append(line)
+        elif line.startswith(" - [") or not days[current_day]:
+            days[current_day].append(line)
+        else:
+            days[current_day][-1] += "\n" + line
+
+    for day, entries in days.items():
+        days[day] = [entry.rstrip() for entry in entries if entry.strip()]
+
+    return dict(days), "\n".join(passthrough).strip()
+
+
+def _render_days(days: Dict[str, List[str]]) -> str:
+    """Render a {day: entries} mapping in the `parse_entries_to_txt` format."""
+    lines = []
+    for day in sorted(days):
+        lines.append(day + ":")
+        lines.extend(days[day])
+        lines.append("")
+    return "\n".join(lines)
+
+
+def _entry_repo(entry: str) -> str:
+    match = ENTRY_REPO_PATTERN.match(entry)
+    return match.group(1) if match else "N/A"
+
+
+def _split_to_budget(days: Dict[str, List[str]], count_tokens: Callable[[str], int], max_tokens: int) -> List[Dict[str, List[str]]]:
+    """Greedily pack entries, in chronological order, into parts that fit max_tokens."""
+    parts: List[Dict[str, List[str]]] = [defaultdict(list)]
+    used = 0
+    for day in sorted(days):
+        for entry in days[day]:
+            cost = count_tokens(entry) + count_tokens(day)
+            if used and used + cost > max_tokens:
+                parts.append(defaultdict(list))
+                used = 0
+            parts[-1][day].append(entry)
+            used += cost
+    return [dict(part) for part in parts if part]
+
+
+def chunk_actions(
+    days: Dict[str, List[str]],
+    tokenizer_fn: Callable[[str], List],
+    max_tokens: Optional[int] = None
+) -> List[Dict[str, str]]:
+    """
+    Group per-day entries into chunks that each fit the map step budget.
+
+    Days are first grouped by ISO week. A week that does not fit is split by
+    repository, and a repository-week that still does not fit is split at entry
+    boundaries.
+
+    Args:
+        days: Mapping of day (YYYY-MM-DD) to its entries.
+        tokenizer_fn: Function to tokenize text.
+        max_tokens: Maximum tokens per chunk.
+
+    Returns:
+        List of chunks, each a dict with a human readable `label` and its `text`.
+    """
+    max_tokens = max_tokens or MAP_CHUNK_TOKENS
+
+    def count_tokens(text: str) -> int:
+        return len(tokenizer_fn(text))
+
+    weeks: Dict[Tuple[int, int], Dict[str, List[str]]] = defaultdict(dict)
+    for day, entries in days.items():
+        iso_year, iso_week, _ = date.fromisoformat(day).isocalendar()
+        weeks[(iso_year, iso_week)][day] = entries
+
+    chunks = []
+    for (iso_year, iso_week), week_days in sorted(weeks.items()):
+        label = f"{iso_year}-W{iso_week:02d}"
+        week_txt = _render_days(week_days)
+        if count_tokens(week_txt) <= max_tokens:
+            chunks.append({"label": label, "text": week_txt})
+            continue
+
+        by_repo: Dict[str, Dict[str, List[str]]] = defaultdict(lambda: defaultdict(list))
+        for day, entries in week_days.items():
+            for entry in entries:
+                by_repo[_entry_repo(entry)][day].append(entry)
+
+        for repo, repo_days in sorted(by_repo.items()):
+            parts = _split_to_budget(repo_days, count_tokens, max_tokens)
+            for i, part in enumerate(parts, start=1):
+                suffix = f" ({i}/{len(parts)})" if len(parts) > 1 else ""
+                chunks.append({"label": f"{label} in {repo}{suffix}", "text": _render_days(part)})
+
+    return chunks
+
+
+async def summarize_chunks(llm, chunks: List[Dict[str, str]], concurrency: Optional[int] = None) -> List[str]:
+    """
+    Summarize chunks concurrently, with at most `concurrency` LLM calls in flight.
+
+    The calls are not streamed, so they never reach the session logger queue
+    that feeds the websocket.
+
+    Args:
+        llm: The LLM instance.
+        chunks: Chunks produced by `chunk_actions`.
+        concurrency: Maximum number of parallel LLM calls.
+
+    Returns:
+        List of chunk summaries, in the same order as chunks.
+    """
+    semaphore = asyncio.Semaphore(concurrency or MAP_REDUCE_CONCURRENCY)
+
+    async def _summarize(chunk: Dict[str, str]) -> str:
+        async with semaphore:
+            summary = await llm.acomplete(
+                TRIGGER_CHUNK_PROMPT.format(LABEL=chunk["label"], ACTIONS=chunk["text"]),
+                system_prompt=CHUNK_SUMMARY_SYSTEM,
+                stream=False
+            )
+        return str(summary).strip()
+
+    return await asyncio.gather(*(_summarize(chunk) for chunk in chunks))
+
+
+async def map_reduce_actions(llm, actions_txt: str, max_tokens: Optional[int] = None) -> str:
+    """
+    Condense an activity window that does not fit a single prompt.
+
+    The entries are chunked by week/repo, each chunk is summarized in parallel,
+    and the summaries are joined (with any passthrough text such as previous
+    release notes) into the text used by the final reduce prompt.
+
+    Args:
+        llm: The LLM instance.
+        actions_txt: Full, untrimmed actions text.
+        max_tokens: Maximum tokens per chunk.
+
+    Returns:
+        Condensed actions text to be used in place of the original.
+    """
+    days, passthrough = split_actions_txt(actions_txt)
+    if not days:
+        return actions_txt
+
+    chunks = chunk_actions(days, llm.tokenizer, max_tokens)
+    summaries = await summarize_chunks(llm, chunks)
+
+    sections = [f"{chunk['label']}:\n{summary}" for chunk, summary in zip(chunks, summaries)]
+    if passthrough:
+        sections.append(passthrough)
+    return "\n\n".join(sections)
+
+
+async def incremental_summarize_actions(
+    llm,
+    actions_txt: str,
+    authors: Optional[List[str]] = None,
+    cache: Optional[SummaryCache] = None
+) -> str:
+    """
+    Condense an activity window one day at a time, reusing cached day summaries.
+
+    Overlapping windows (e.g. a rolling "last 7 days" recap) share most of their
+    days, so only new or changed days trigger an LLM call. The day summaries are
+    joined (with any passthrough text) into the text used by the final prompt.
+
+    Args:
+        llm: The LLM instance.
+        actions_txt: Full actions text.
+        authors: Authors the activity was filtered on, part of the cache key.
+        cache: Summary cache to use (defaults to the shared persistent cache).
+
+    Returns:
+        Condensed actions text to be used in place of the original.
+    """
+    days, passthrough = split_actions_txt(actions_txt)
+    if not days:
+        return actions_txt
+
+    # The cache is SQLite on disk: open and query it off the event loop
+    cache = cache or await provider_executor.run(get_summary_cache)
+    model = getattr(getattr(llm, "config", None), "model", None)
+    keys = {
+        day: cache.make_key(authors or [], {_entry_repo(entry) for entry in entries}, day, entries, model)
+        for day, entries in days.items()
+    }
+    cached = await provider_executor.run(cache.get_many, list(keys.values()))
+
+    summaries: Dict[str, str] = {}
+    pending: Dict[str, List[Dict[str, str]]] = {}
+    for day, entries in days.items():
+        if keys[day] in cached:
+            summaries[day] = cached[keys[day]]
+        else:
+            pending[day] = chunk_actions({day: entries}, llm.tokenizer)
+
+    flat_chunks = [chunk for chunks in pending.values() for chunk in chunks]
+    flat_summaries = iter(await summarize_chunks(llm, flat_chunks))
+    for day, chunks in pending.items():
+        summaries[day] = "\n".join(next(flat_summaries) for _ in chunks)
+    if pending:
+        await provider_executor.run(cache.set_many, [(keys[day], day, summaries[day]) for day in pending])
+
+    sections = [f"{day}:\n{summaries[day]}" for day in sorted(summaries)]
+    if passthrough:
+        sections.append(passthrough)
+    return "\n\n".join(sections)
@@ -0,0 +1,159 @@
+import math
+import re
+import statistics
+from typing import Callable, Dict, Iterable, NamedTuple, Optional
+
+
+class TokenRatio(NamedTuple):
+    """Calibration of a tokenizer family on Git activity text."""
+    chars_per_token: float
+    # Relative error bound: exact <= estimate * (1 + rel_error) + abs_error
+    rel_error: float
+    abs_error: int
+
+
+# Calibrations for `parse_entries_to_txt` bullets (English commit/PR/issue
+# messages with repository names and code identifiers), as measured by
+# `python -m benchmarks.bench_token_estimator`; rerun it to refine a family
+# when its tokenizer changes.
+#
+# deepseek: measured with the DeepSeek tokenizer on the rbenv (2258 lines) and
+#   git-recap (345 lines) histories: total estimate -3% / +22%, mean per-line
+#   error 25%, no line above the bound.
+# Other families: not measured yet (their tokenizers need a download), so they
+#   reuse the measured error bounds around their published chars/token ratios;
+#   unknown models keep a wider relative margin.
+TOKEN_RATIOS: Dict[str, TokenRatio] = {
+    "openai": TokenRatio(chars_per_token=3.9, rel_error=0.36, abs_error=8),
+    "anthropic": TokenRatio(chars_per_token=3.4, rel_error=0.36, abs_error=8),
+    "gemini": TokenRatio(chars_per_token=4.0, rel_error=0.36, abs_error=8),
+    "mistral": TokenRatio(chars_per_token=3.5, rel_error=0.36, abs_error=8),
+    "llama": TokenRatio(chars_per_token=3.8, rel_error=0.36, abs_error=8),
+    "deepseek": TokenRatio(chars_per_token=3.49, rel_error=0.36, abs_error=8),
+    "default": TokenRatio(chars_per_token=3.3, rel_error=0.45, abs_error=8),
+}
+
+# Markers match the start of a name part (the name is split on "/", ":", "-"
+# and "_", so "openai/gpt-4o" and "meta-llama/Llama-3" match) when no letter
+# follows, e.g. "o3" matches "o3-mini" but not "o3x" or "pro3"
+MODEL_FAMILIES = (
+    ("anthropic", ("claude",)),
+    ("gemini", ("gemini", "gemma")),
+    ("mistral", ("mistral", "mixtral", "codestral", "magistral", "devstral", "ministral")),
+    ("deepseek", ("deepseek",)),
+    ("llama", ("llama", "codellama")),
+    ("openai", ("gpt", "o1", "o3", "o4", "chatgpt")),
+)
+
+
+def get_model_family(model: Optional[str]) -> str:
+    """
+    Map a model name to the tokenizer family used for estimation.
+
+    Args:
+        model: Model name from the LLM configuration.
+
+    Returns:
+        str: A key of TOKEN_RATIOS.
+    """
+    parts = [part for part in re.split(r"[/:\-_\s]+", (model or "").lower()) if part]
+    for family, markers in MODEL_FAMILIES:
+        if any(re.match(f"{marker}(?![a-z])", part) for part in parts for marker in markers):
+            return family
+    return "default"
+
+
+def estimate_tokens(text: str, model: Optional[str] = None) -> int:
+    """
+    Estimate the token count of text without running the tokenizer.
+
+    ASCII characters are converted with the family's chars/token ratio, while
+    non-ASCII characters (estimated from the UTF-8 byte overhead) count as one
+    token each, which keeps the estimate conservative for CJK text and emojis.
+
+    Args:
+        text: Text to estimate.
+        model: Model name from the LLM configuration.
+
+    Returns:
+        int: Estimated number of tokens.
+    """
+    return int(round(_estimate(text, TOKEN_RATIOS[get_model_family(model)].chars_per_token)))
+
+
+def _non_ascii(text: str) -> float:
+    return (len(text.encode("utf-8")) - len(text)) / 2
+
+
+def _estimate(text: str, chars_per_token: float) -> float:
+    non_ascii = _non_ascii(text)
+    return (len(text) - non_ascii) / chars_per_token + non_ascii
+
+
+def upper_bound_tokens(estimate: int, model: Optional[str] = None, count: int = 1) -> int:
+    """
+    Return the calibrated upper bound of the exact count for an estimate.
+
+    Args:
+        estimate: Estimated tokens (summed over `count` texts).
+        model: Model name from the LLM configuration.
+        count: Number of texts the estimate was summed over.
+
+    Returns:
+        int: Upper bound of the exact token count.
+    """
+    ratio = TOKEN_RATIOS[get_model_family(model)]
+    return math.ceil(estimate * (1 + ratio.rel_error)) + ratio.abs_error * count
+
+
+def calibrate(texts: Iterable[str], tokenizer_fn: Callable[[str], list]) -> TokenRatio:
+    """
+    Measure a tokenizer's chars/token ratio and error bounds on sample texts.
+
+    Args:
+        texts: Representative texts (e.g. activity entries).
+        tokenizer_fn: The exact tokenizer.
+
+    Returns:
+        TokenRatio: Calibration to store in TOKEN_RATIOS.
+    """
+    samples = [(text, len(tokenizer_fn(text))) for text in texts if text]
+    ascii_chars = sum(len(text) - _non_ascii(text) for text, _ in samples)
+    ascii_tokens = sum(exact - _non_ascii(text) for text, exact in samples)
+    chars_per_token = round(ascii_chars / max(1.0, ascii_tokens), 2)
+
+    # Short texts are dominated by an absolute error, longer ones by a relative
+    # one: the absolute term covers the short texts, the relative term whatever
+    # it leaves uncovered, so that every sample satisfies the bound.
+    estimates = [(int(round(_estimate(text, chars_per_token))), exact) for text, exact in samples]
+    abs_error = max(0, max([exact - estimate for estimate, exact in estimates if estimate < 8], default=0))
+    rel_error = max([(exact - abs_error - estimate) / estimate for estimate, exact in estimates if estimate], default=0.0)
+    return TokenRatio(chars_per_token, math.ceil(max(0.0, rel_error) * 100) / 100, abs_error)
+
+
+def estimation_errors(texts: Iterable[str], tokenizer_fn: Callable[[str], list], model: Optional[str] = None) -> Dict[str, float]:
+    """
+    Compare estimates against the exact tokenizer.
+
+    Args:
+        texts: Texts to compare on.
+        tokenizer_fn: The exact tokenizer.
+        model: Model name from the LLM configuration.
+
+    Returns:
+        Dict with the mean and max relative error and the fraction of texts
+        whose exact count exceeded the calibrated upper bound.
+    """
+    errors, violations, total = [], 0, 0
+    for text in texts:
+        exact = len(tokenizer_fn(text))
+        estimate = estimate_tokens(text, model)
+        if exact:
+            errors.append(abs(estimate - exact) / exact)
+        violations += exact > upper_bound_tokens(estimate, model)
+        total += 1
+    return {
+        "mean_rel_error": statistics.mean(errors) if errors else 0.0,
+        "max_rel_error": max(errors, default=0.0),
+        "bound_violations": violations / total if total else 0.0,
+    }
@@ -0,0 +1,69 @@
+import asyncio
+import logging
+import os
+from typing import Awaitable, Callable, Dict
+
+WARMUP_CONCURRENCY = int(os.environ.get("WARMUP_CONCURRENCY", 8))
+
+logger = logging.getLogger(__name__)
+
+
+class SessionWarmUp:
+    """
+    Best-effort background work started when a session is created.
+
+    At most one warm-up runs per session and at most `max_concurrent`
+    overall; beyond that new sessions are simply not warmed up, so warm-ups
+    never queue in front of interactive requests. A warm-up is cancelled when
+    its session expires. Failures are logged and otherwise ignored: the
+    regular request path does the same work if the warm-up did not.
+    """
+
+    def __init__(self, max_concurrent: int = WARMUP_CONCURRENCY):
+        self.max_concurrent = max_concurrent
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self.started = 0
+        self.skipped = 0
+        self.cancelled = 0
+
+    def _forget(self, session_id: str, task: asyncio.Task) -> None:
+        if self._tasks.get(session_id) is task:
+            del self._tasks[session_id]
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Warm-up of session {session_id} failed: {task.exception()}")
+
+    def start(self, session_id: str, warm: Callable[[], Awaitable[None]]) -> bool:
+        """
+        Start the warm-up of a session on the running event loop.
+
+        Args:
+            session_id: The session identifier.
+            warm: Starts the warm-up work.
+
+        Returns:
+            bool: Whether the warm-up was started.
+        """
+        if session_id in self._tasks or len(self._tasks) >= self.max_concurrent:
+            self.skipped += 1
+            return False
+        task = asyncio.ensure_future(warm())
+        self._tasks[session_id] = task
+        task.add_done_callback(lambda _: self._forget(session_id, task))
+        self.started += 1
+        return True
+
+    def cancel(self, session_id: str) -> None:
+        """Cancel the warm-up of a session, if it is still running."""
+        task = self._tasks.pop(session_id, None)
+        if task is not None and not task.done() and not task.get_loop().is_closed():
+            task.get_loop().call_soon_threadsafe(task.cancel)
+            self.cancelled += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Return the number of warm-ups running, started, skipped and cancelled."""
+        return {
+            "running": len(self._tasks),
+            "started": self.started,
+            "skipped": self.skipped,
+            "cancelled": self.cancelled
+        }
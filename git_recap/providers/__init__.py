@@ -1,11 +1,17 @@
 from git_recap.providers.azure_fetcher import AzureFetcher
 from git_recap.providers.github_fetcher import GitHubFetcher
 from git_recap.providers.gitlab_fetcher import GitLabFetcher
+from git_recap.providers.local_fetcher import LocalRepoFetcher
+from git_recap.providers.multi_url_fetcher import MultiURLFetcher
+from git_recap.providers.query import RecapQuery
 from git_recap.providers.url_fetcher import URLFetcher
 
 __all__ = [
     "AzureFetcher",
     "GitHubFetcher",
     "GitLabFetcher",
+    "LocalRepoFetcher",
+    "MultiURLFetcher",
+    "RecapQuery",
     "URLFetcher"
 ]
@@ -0,0 +1,186 @@
+import asyncio
+import logging
+import os
+import signal
+import subprocess
+import weakref
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+
+from git_recap.providers.git_log import (
+    FIELD_SEPARATOR,
+    READ_CHUNK_SIZE,
+    RECORD_SEPARATOR,
+    build_git_log_args,
+    parse_commit_record,
+)
+
+logger = logging.getLogger(__name__)
+
+# Git processes run concurrently by the async helpers, across all fetchers
+GIT_CONCURRENCY = 8
+
+# One semaphore per event loop, as asyncio primitives are bound to their loop
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+
+def set_git_concurrency(limit: int) -> None:
+    """
+    Set how many git processes the async helpers run at once.
+
+    Args:
+        limit: Maximum number of concurrent git processes.
+    """
+    global GIT_CONCURRENCY
+    GIT_CONCURRENCY = max(1, limit)
+    _semaphores.clear()
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _semaphores[loop] = asyncio.Semaphore(GIT_CONCURRENCY)
+    return semaphore
+
+
+async def _kill(process: asyncio.subprocess.Process) -> None:
+    """Kill git and the helpers it spawned (remote helpers, index-pack, ...)."""
+    if process.returncode is None:
+        try:
+            if hasattr(os, "killpg"):
+                os.killpg(process.pid, signal.SIGKILL)
+            else:  # pragma: no cover - Windows has no process groups
+                process.kill()
+        except ProcessLookupError:
+            pass
+        await process.wait()
+
+
+async def run_git(args: List[str], timeout: Optional[float] = 120, env: Optional[Dict[str, str]] = None) -> str:
+    """
+    Run a git command without blocking the event loop.
+
+    The process is killed when the timeout expires or when the awaiting task
+    is cancelled (e.g. because the client disconnected).
+
+    Args:
+        args: Command line, starting with "git".
+        timeout: Seconds after which the git process is killed.
+        env: Environment of the process (default: inherited).
+
+    Returns:
+        str: The standard output.
+
+    Raises:
+        subprocess.TimeoutExpired: If the timeout expired.
+        subprocess.CalledProcessError: If git exited with a non-zero status.
+    """
+    async with _get_semaphore():
+        process = await asyncio.create_subprocess_exec(
+            *args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=env,
+            start_new_session=hasattr(os, "killpg")
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
+        except asyncio.TimeoutError:
+            await _kill(process)
+            raise subprocess.TimeoutExpired(args, timeout)
+        except BaseException:
+            await _kill(process)
+            raise
+    if process.returncode:
+        raise subprocess.CalledProcessError(
+            process.returncode,
+            args,
+            stdout.decode("utf-8", errors="replace"),
+            stderr.decode("utf-8", errors="replace")
+        )
+    return stdout.decode("utf-8", errors="replace")
+
+
+async def aiter_git_records(args: List[str], timeout: Optional[float] = 120) -> AsyncIterator[List[bytes]]:
+    """
+    Stream the records of a NUL-delimited git command without blocking the event loop.
+
+    Async counterpart of `git_log.iter_git_records`: the process is killed on
+    timeout, on cancellation and when the consumer stops iterating early.
+
+    Args:
+        args: Command line, as built by `build_git_log_args`.
+        timeout: Seconds after which the git process is killed.
+
+    Yields:
+        List[bytes]: The fields of each record.
+
+    Raises:
+        subprocess.TimeoutExpired: If the timeout expired (the records yielded
+            so far are only part of the output).
+    """
+    async with _get_semaphore():
+        process = await asyncio.create_subprocess_exec(
+            *args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            start_new_session=hasattr(os, "killpg")
+        )
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout if timeout else None
+        try:
+            pending = b""
+            while True:
+                remaining = deadline - loop.time() if deadline else None
+                if remaining is not None and remaining <= 0:
+                    raise asyncio.TimeoutError
+                chunk = await asyncio.wait_for(process.stdout.read(READ_CHUNK_SIZE), timeout=remaining)
+                if not chunk:
+                    break
+                *records, pending = (pending + chunk).split(RECORD_SEPARATOR)
+                for record in records:
+                    if record:
+                        yield record.lstrip(b"\n").split(FIELD_SEPARATOR)
+            if pending.strip():
+                yield pending.lstrip(b"\n").split(FIELD_SEPARATOR)
+            await process.wait()
+        except asyncio.TimeoutError:
+            raise subprocess.TimeoutExpired(args, timeout)
+        finally:
+            await _kill(process)
+    if process.returncode not in (0, -9):
+        logger.warning(f"git exited with status {process.returncode}: {' '.join(args[:4])}")
+
+
+async def aiter_git_log(
+    repo_path: str,
+    repo_name: str,
+    revisions: Sequence[str] = ("--all",),
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    authors: Optional[List[str]] = None,
+    extra_args: Optional[List[str]] = None,
+    timeout: Optional[float] = 120
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Stream commit entries from a local repository without blocking the event loop.
+
+    Async counterpart of `git_log.iter_git_log`, with the same arguments.
+
+    Yields:
+        Dict[str, Any]: Commit entries, newest first.
+
+    Raises:
+        subprocess.TimeoutExpired: If git did not finish within the timeout.
+    """
+    args = build_git_log_args(repo_path, revisions, start_date, end_date, authors, extra_args)
+    async for fields in aiter_git_records(args, timeout):
+        entry = parse_commit_record(fields, repo_name)
+        if entry is None:
+            continue
+        if start_date and entry["timestamp"] < start_date:
+            continue
+        if end_date and entry["timestamp"] > end_date:
+            continue
+        yield entry
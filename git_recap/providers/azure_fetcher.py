@@ -4,6 +4,7 @@ from azure.devops.exceptions import AzureDevOpsServiceError
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 from git_recap.providers.base_fetcher import BaseFetcher
+from git_recap.providers.query import RecapQuery
 
 
 class AzureFetcher(BaseFetcher):
@@ -64,49 +65,23 @@ class AzureFetcher(BaseFetcher):
         """
         return [repo.name for repo in self.repos]
 
-    def _filter_by_date(self, date_obj: datetime) -> bool:
+    def fetch_commits(self, query: Optional[RecapQuery] = None) -> List[Dict[str, Any]]:
         """
-        Check if a datetime object is within the configured date range.
-
-        Args:
-            date_obj (datetime): The datetime to check.
-
-        Returns:
-            bool: True if within range, False otherwise.
-        """
-        if self.start_date and date_obj < self.start_date:
-            return False
-        if self.end_date and date_obj > self.end_date:
-            return False
-        return True
-
-    def _stop_fetching(self, date_obj: datetime) -> bool:
-        """
-        Determine if fetching should stop based on the date.
+        Fetch commits for all repositories and authors.
 
         Args:
-            date_obj (datetime): The datetime to check.
-
-        Returns:
-            bool: True if should stop, False otherwise.
-        """
-        if self.start_date and date_obj < self.start_date:
-            return True
-        return False
-
-    def fetch_commits(self) -> List[Dict[str, Any]]:
-        """
-        Fetch commits for all repositories and authors.
+            query: What to fetch (default: the fetcher's filters, see `make_query`).
 
         Returns:
             List[Dict[str, Any]]: List of commit entries.
         """
+        query = self._query(query)
         entries = []
         processed_commits = set()
         for repo in self.repos:
-            if self.repo_filter and repo.name not in self.repo_filter:
+            if not query.selects_repo(repo.name):
                 continue
-            for author in self.authors:
+            for author in query.authors:
                 try:
                     commits = self.git_client.get_commits(
                         project=repo.project.id,
@@ -117,7 +92,7 @@ class AzureFetcher(BaseFetcher):
                     continue
                 for commit in commits:
                     commit_date = commit.author.date
-                    if self._filter_by_date(commit_date):
+                    if query.in_window(commit_date):
                         sha = commit.commit_id
                         if sha not in processed_commits:
                             entry = {
@@ -129,24 +104,28 @@ class AzureFetcher(BaseFetcher):
                             }
                             entries.append(entry)
                             processed_commits.add(sha)
-                    if self._stop_fetching(commit_date):
+                    if query.before_window(commit_date):
                         break
         return entries
 
-    def fetch_pull_requests(self) -> List[Dict[str, Any]]:
+    def fetch_pull_requests(self, query: Optional[RecapQuery] = None) -> List[Dict[str, Any]]:
         """
         Fetch pull requests and their associated commits for all repositories and authors.
 
+        Args:
+            query: What to fetch (default: the fetcher's filters, see `make_query`).
+
         Returns:
             List[Dict[str, Any]]: List of pull request and commit_from_pr entries.
         """
+        query = self._query(query)
         entries = []
         processed_pr_commits = set()
         projects = self.core_client.get_projects().value
         for project in projects:
             repos = self.git_client.get_repositories(project.id)
             for repo in repos:
-                if self.repo_filter and repo.name not in self.repo_filter:
+                if not query.selects_repo(repo.name):
                     continue
                 try:
                     pull_requests = self.git_client.get_pull_requests(
@@ -156,10 +135,10 @@ class AzureFetcher(BaseFetcher):
                 except Exception:
                     continue
                 for pr in pull_requests:
-                    if pr.created_by.unique_name not in self.authors:
+                    if pr.created_by.unique_name not in query.authors:
                         continue
                     pr_date = pr.creation_date
-                    if not self._filter_by_date(pr_date):
+                    if not query.in_window(pr_date):
                         continue
 
                     pr_entry = {
@@ -181,7 +160,7 @@ class AzureFetcher(BaseFetcher):
                         pr_commits = []
                     for pr_commit in pr_commits:
                         commit_date = pr_commit.author.date
-                        if self._filter_by_date(commit_date):
+                        if query.in_window(commit_date):
                             sha = pr_commit.commit_id
                             if sha in processed_pr_commits:
                                 continue
@@ -195,20 +174,24 @@ class AzureFetcher(BaseFetcher):
                             }
                             entries.append(pr_commit_entry)
                             processed_pr_commits.add(sha)
-                    if self._stop_fetching(pr_date):
+                    if query.before_window(pr_date):
                         break
         return entries
 
-    def fetch_issues(self) -> List[Dict[str, Any]]:
+    def fetch_issues(self, query: Optional[RecapQuery] = None) -> List[Dict[str, Any]]:
         """
         Fetch issues (work items) assigned to the configured authors.
 
+        Args:
+            query: What to fetch (default: the fetcher's filters, see `make_query`).
+
         Returns:
             List[Dict[str, Any]]: List of issue entries.
         """
+        query = self._query(query)
         entries = []
         wit_client = self.connection.clients.get_work_item_tracking_client()
-        for author in self.authors:
+        for author in query.authors:
             wiql = f"SELECT [System.Id], [System.Title], [System.CreatedDate] FROM WorkItems WHERE [System.AssignedTo] CONTAINS '{author}'"
             try:
                 query_result = wit_client.query_by_wiql(wiql).work_items
@@ -217,7 +200,7 @@ class AzureFetcher(BaseFetcher):
             for item_ref in query_result:
                 work_item = wit_client.get_work_item(item_ref.id)
                 created_date = datetime.fromisoformat(work_item.fields["System.CreatedDate"])
-                if self._filter_by_date(created_date):
+                if query.in_window(created_date):
                     entry = {
                         "type": "issue",
                         "repo": "N/A",
@@ -225,11 +208,11 @@ class AzureFetcher(BaseFetcher):
                         "timestamp": created_date,
                     }
                     entries.append(entry)
-                if self._stop_fetching(created_date):
+                if query.before_window(created_date):
                     break
         return entries
 
-    def fetch_releases(self) -> List[Dict[str, Any]]:
+    def fetch_releases(self, query: Optional[RecapQuery] = None) -> List[Dict[str, Any]]:
         """
         Fetch releases for Azure DevOps repositories.
 
@@ -240,7 +223,7 @@ class AzureFetcher(BaseFetcher):
         """
         raise NotImplementedError("Release fetching is not supported for Azure DevOps (AzureFetcher).")
 
-    def get_branches(self) -> List[str]:
+    def get_branches(self, query: Optional[RecapQuery] = None) -> List[str]:
         """
         Get all branches in the repository.
         
@@ -252,7 +235,7 @@ class AzureFetcher(BaseFetcher):
         """
         raise NotImplementedError("Branch listing is not yet implemented for Azure DevOps (AzureFetcher).")
 
-    def get_valid_target_branches(self, source_branch: str) -> List[str]:
+    def get_valid_target_branches(self, source_branch: str, query: Optional[RecapQuery] = None) -> List[str]:
         """
         Get branches that can receive a pull request from the source branch.
         
@@ -262,6 +245,7 @@ class AzureFetcher(BaseFetcher):
         
         Args:
             source_branch (str): The source branch name.
+            query: Selects the repository (default: the fetcher's repo_filter).
         
         Returns:
             List[str]: List of valid target branch names.
@@ -280,7 +264,8 @@ class AzureFetcher(BaseFetcher):
         draft: bool = False,
         reviewers: Optional[List[str]] = None,
         assignees: Optional[List[str]] = None,
-        labels: Optional[List[str]] = None
+        labels: Optional[List[str]] = None,
+        query: Optional[RecapQuery] = None
     ) -> Dict[str, Any]:
         """
         Create a pull request between two branches with optional metadata.
@@ -294,6 +279,7 @@ class AzureFetcher(BaseFetcher):
             reviewers: List of reviewer usernames (optional).
             assignees: List of assignee usernames (optional).
             labels: List of label names (optional).
+            query: Selects the repository (default: the fetcher's repo_filter).
         
         Returns:
             Dict[str, Any]: Dictionary containing PR metadata (url, number, state, success) or error information.
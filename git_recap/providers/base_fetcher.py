@@ -1,6 +1,9 @@
+import asyncio
 from abc import ABC, abstractmethod
 from datetime import datetime, timezone
-from typing import List, Optional, Dict, Any
+from typing import Iterable, List, Optional, Dict, Any
+
+from git_recap.providers.query import ENTRY_KINDS, RecapQuery
 
 class BaseFetcher(ABC):
     def __init__(
@@ -26,6 +29,39 @@ class BaseFetcher(ABC):
         self.limit = -1
         self.authors = [] if authors is None else authors
 
+    def make_query(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        repos: Optional[Iterable[str]] = None,
+        authors: Optional[Iterable[str]] = None,
+        kinds: Optional[Iterable[str]] = None
+    ) -> RecapQuery:
+        """
+        Build a query, defaulting to the filters the fetcher was created with.
+
+        Args:
+            start_date: Start of the date window (default: the fetcher's start_date).
+            end_date: End of the date window (default: the fetcher's end_date).
+            repos: Repositories to include (default: the fetcher's repo_filter).
+            authors: Authors to include (default: the fetcher's authors).
+            kinds: Entry kinds to include (default: all).
+
+        Returns:
+            RecapQuery: The query.
+        """
+        return RecapQuery(
+            start_date=self.start_date if start_date is None else start_date,
+            end_date=self.end_date if end_date is None else end_date,
+            repos=tuple(self.repo_filter if repos is None else repos),
+            authors=tuple(self.authors if authors is None else authors),
+            kinds=ENTRY_KINDS if kinds is None else frozenset(kinds)
+        )
+
+    def _query(self, query: Optional[RecapQuery]) -> RecapQuery:
+        """Return the query of a call, or the fetcher's default query."""
+        return self.make_query() if query is None else query
+
     @property
     @abstractmethod
     def repos_names(self) -> List[str]:
@@ -38,40 +74,52 @@ class BaseFetcher(ABC):
         pass
 
     @abstractmethod
-    def fetch_commits(self) -> List[Dict[str, Any]]:
+    def fetch_commits(self, query: Optional[RecapQuery] = None) -> List[Dict[str, Any]]:
         """
         Fetch commit entries for the configured repositories and authors.
 
+        Args:
+            query: What to fetch (default: the fetcher's filters, see `make_query`).
+
         Returns:
             List[Dict[str, Any]]: List of commit entries.
         """
         pass
 
     @abstractmethod
-    def fetch_pull_requests(self) -> List[Dict[str, Any]]:
+    def fetch_pull_requests(self, query: Optional[RecapQuery] = None) -> List[Dict[str, Any]]:
         """
         Fetch pull request entries for the configured repositories and authors.
 
+        Args:
+            query: What to fetch (default: the fetcher's filters, see `make_query`).
+
         Returns:
             List[Dict[str, Any]]: List of pull request entries.
         """
         pass
 
     @abstractmethod
-    def fetch_issues(self) -> List[Dict[str, Any]]:
+    def fetch_issues(self, query: Optional[RecapQuery] = None) -> List[Dict[str, Any]]:
         """
         Fetch issue entries for the configured repositories and authors.
 
+        Args:
+            query: What to fetch (default: the fetcher's filters, see `make_query`).
+
         Returns:
             List[Dict[str, Any]]: List of issue entries.
         """
         pass
 
     @abstractmethod
-    def fetch_releases(self) -> List[Dict[str, Any]]:
+    def fetch_releases(self, query: Optional[RecapQuery] = None) -> List[Dict[str, Any]]:
         """
         Fetch releases for all repositories accessible to this fetcher.
 
+        Args:
+            query: Repositories to fetch releases of (default: the fetcher's repo_filter).
+
         Returns:
             List[Dict[str, Any]]: List of releases, each as a structured dictionary.
                 The dictionary should include at least:
@@ -91,10 +139,13 @@ class BaseFetcher(ABC):
         raise NotImplementedError("Release fetching is not implemented for this provider.")
 
     @abstractmethod
-    def get_branches(self) -> List[str]:
+    def get_branches(self, query: Optional[RecapQuery] = None) -> List[str]:
         """
         Get all branches in the repository.
         
+        Args:
+            query: Selects the repository (default: the fetcher's repo_filter).
+        
         Returns:
             List[str]: List of branch names.
         
@@ -104,7 +155,7 @@ class BaseFetcher(ABC):
         raise NotImplementedError("Subclasses must implement get_branches() to return all repository branches")
 
     @abstractmethod
-    def get_valid_target_branches(self, source_branch: str) -> List[str]:
+    def get_valid_target_branches(self, source_branch: str, query: Optional[RecapQuery] = None) -> List[str]:
         """
         Get branches that can receive a pull request from the source branch.
         
@@ -114,6 +165,7 @@ class BaseFetcher(ABC):
         
         Args:
             source_branch (str): The source branch name.
+            query: Selects the repository (default: the fetcher's repo_filter).
         
         Returns:
             List[str]: List of valid target branch names.
@@ -123,6 +175,28 @@ class BaseFetcher(ABC):
         """
         raise NotImplementedError("Subclasses must implement get_valid_target_branches() to return valid PR target branches for the given source branch")
 
+    def fetch_branch_diff_commits(
+        self,
+        source_branch: str,
+        target_branch: str,
+        query: Optional[RecapQuery] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch the commits of source_branch that are not in target_branch.
+
+        Args:
+            source_branch (str): The source branch name.
+            target_branch (str): The target branch name.
+            query: Selects the repository (default: the fetcher's repo_filter).
+
+        Returns:
+            List[Dict[str, Any]]: List of commit entries.
+
+        Raises:
+            NotImplementedError: If the provider does not support branch diffs.
+        """
+        raise NotImplementedError("Branch diff is not implemented for this provider.")
+
     @abstractmethod
     def create_pull_request(
         self,
@@ -133,7 +207,8 @@ class BaseFetcher(ABC):
         draft: bool = False,
         reviewers: Optional[List[str]] = None,
         assignees: Optional[List[str]] = None,
-        labels: Optional[List[str]] = None
+        labels: Optional[List[str]] = None,
+        query: Optional[RecapQuery] = None
     ) -> Dict[str, Any]:
         """
         Create a pull request between two branches with optional metadata.
@@ -147,6 +222,7 @@ class BaseFetcher(ABC):
             reviewers: List of reviewer usernames (optional).
             assignees: List of assignee usernames (optional).
             labels: List of label names (optional).
+            query: Selects the repository (default: the fetcher's repo_filter).
         
         Returns:
             Dict[str, Any]: Dictionary containing PR metadata (url, number, state, success) or error information.
@@ -186,19 +262,27 @@ class BaseFetcher(ABC):
         """
         pass
 
-    def get_authored_messages(self) -> List[Dict[str, Any]]:
+    def get_authored_messages(self, query: Optional[RecapQuery] = None) -> List[Dict[str, Any]]:
         """
         Aggregates all commit, pull request, and issue entries into a single list,
         ensuring no duplicate commits (based on SHA) are present, and then sorts
         them in chronological order based on their timestamp.
 
+        Args:
+            query: What to recap (default: the fetcher's filters, see `make_query`).
+                Only the entry kinds listed in query.kinds are fetched.
+
         Returns:
             List[Dict[str, Any]]: Aggregated and sorted list of entries.
         """
-        commit_entries = self.fetch_commits()
-        pr_entries = self.fetch_pull_requests()
+        kinds = self._query(query).kinds
+        # Without a query, fetch_* are called without arguments as well, so
+        # subclasses written before queries existed keep working
+        query_args = () if query is None else (query,)
+        commit_entries = self.fetch_commits(*query_args) if "commit" in kinds else []
+        pr_entries = self.fetch_pull_requests(*query_args) if "pull_request" in kinds else []
         try:
-            issue_entries = self.fetch_issues()
+            issue_entries = self.fetch_issues(*query_args) if "issue" in kinds else []
         except Exception:
             issue_entries = []
 
@@ -222,6 +306,21 @@ class BaseFetcher(ABC):
         final_entries.sort(key=lambda x: x["timestamp"])
         return self.convert_timestamps_to_str(final_entries)
 
+    async def aget_authored_messages(self, query: Optional[RecapQuery] = None) -> List[Dict[str, Any]]:
+        """
+        Async counterpart of `get_authored_messages`.
+
+        Providers without native async support run the blocking implementation
+        in a worker thread, so the event loop is not stalled.
+
+        Args:
+            query: What to recap (default: the fetcher's filters, see `make_query`).
+
+        Returns:
+            List[Dict[str, Any]]: Aggregated and sorted list of entries.
+        """
+        return await asyncio.to_thread(self.get_authored_messages, query)
+
     @staticmethod
     def convert_timestamps_to_str(entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
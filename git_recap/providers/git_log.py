@@ -0,0 +1,364 @@
+import functools
+import hashlib
+import logging
+import os
+import subprocess
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# One record per commit: fields are separated by US (0x1f) and, with -z, records
+# are terminated by NUL, neither of which can appear in names or subjects.
+FIELD_SEPARATOR = b"\x1f"
+RECORD_SEPARATOR = b"\x00"
+GIT_LOG_FORMAT = "%H%x1f%an%x1f%at%x1f%s"
+
+READ_CHUNK_SIZE = 64 * 1024
+
+# Revisions of the branches and tags only, ignoring other refs a bare mirror may
+# hold (e.g. GitHub's refs/pull/*)
+BRANCHES_AND_TAGS = ("--branches", "--tags")
+
+
+def build_git_log_args(
+    repo_path: str,
+    revisions: Sequence[str] = ("--all",),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    authors: Optional[List[str]] = None,
+    extra_args: Optional[List[str]] = None,
+    pretty: str = GIT_LOG_FORMAT
+) -> List[str]:
+    """
+    Build a NUL-delimited `git log` command line.
+
+    Args:
+        repo_path: Path of the repository (or bare mirror).
+        revisions: Revisions to walk, e.g. ("--all",) or ("main..feature",).
+        since: Only commits after this date.
+        until: Only commits before this date.
+        authors: Only commits whose author matches one of these (fixed) strings.
+        extra_args: Additional `git log` arguments.
+        pretty: Pretty format of each record.
+
+    Returns:
+        List[str]: The command line.
+    """
+    args = ["git", "-C", repo_path, "log", "-z", f"--pretty=format:{pretty}", "--date=unix", *revisions]
+    if since:
+        args.append(f"--since={since.isoformat()}")
+    if until:
+        args.append(f"--until={until.isoformat()}")
+    if authors:
+        args.append("--fixed-strings")
+        args.extend(f"--author={author}" for author in authors)
+    if extra_args:
+        args.extend(extra_args)
+    return args
+
+
+def iter_git_records(args: List[str], timeout: Optional[float] = 120) -> Iterator[List[bytes]]:
+    """
+    Stream the records of a NUL-delimited git command, split into fields.
+
+    The output is read incrementally from the pipe, so memory stays flat in
+    the size of the history. The process is killed when the timeout expires or
+    when the consumer stops iterating early.
+
+    Args:
+        args: Command line, as built by `build_git_log_args`.
+        timeout: Seconds after which the git process is killed.
+
+    Yields:
+        List[bytes]: The fields of each record.
+
+    Raises:
+        subprocess.TimeoutExpired: If the timeout expired (the records yielded
+            so far are only part of the output).
+    """
+    process = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    timed_out = threading.Event()
+
+    def expire() -> None:
+        timed_out.set()
+        process.kill()
+
+    timer = threading.Timer(timeout, expire) if timeout else None
+    if timer:
+        timer.start()
+    try:
+        pending = b""
+        while True:
+            chunk = process.stdout.read1(READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            *records, pending = (pending + chunk).split(RECORD_SEPARATOR)
+            for record in records:
+                if record:
+                    yield record.lstrip(b"\n").split(FIELD_SEPARATOR)
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(args, timeout)
+        if pending.strip():
+            yield pending.lstrip(b"\n").split(FIELD_SEPARATOR)
+    finally:
+        if timer:
+            timer.cancel()
+        if process.poll() is None:
+            process.kill()
+        process.stdout.close()
+        returncode = process.wait()
+        if returncode not in (0, -9):
+            logger.warning(f"git exited with status {returncode}: {' '.join(args[:4])}")
+
+
+def parse_commit_record(fields: List[bytes], repo_name: str) -> Optional[Dict[str, Any]]:
+    """
+    Convert the fields of a `GIT_LOG_FORMAT` record into a commit entry.
+
+    Args:
+        fields: Record fields (sha, author, unix timestamp, subject).
+        repo_name: Repository name reported in the entry.
+
+    Returns:
+        The commit entry, or None if the record is malformed.
+    """
+    if len(fields) != 4:
+        return None
+    sha, author, timestamp, message = fields
+    try:
+        date = datetime.fromtimestamp(int(timestamp), tz=timezone.utc)
+    except ValueError:
+        return None
+    return {
+        "type": "commit",
+        "repo": repo_name,
+        "message": message.decode("utf-8", errors="replace"),
+        "sha": sha.decode("ascii"),
+        "author": author.decode("utf-8", errors="replace"),
+        "timestamp": date
+    }
+
+
+def iter_git_log(
+    repo_path: str,
+    repo_name: str,
+    revisions: Sequence[str] = ("--all",),
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    authors: Optional[List[str]] = None,
+    extra_args: Optional[List[str]] = None,
+    timeout: Optional[float] = 120
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream commit entries from a local repository.
+
+    Args:
+        repo_path: Path of the repository (or bare mirror).
+        repo_name: Repository name reported in the entries.
+        revisions: Revisions to walk.
+        start_date: Only commits authored after this date.
+        end_date: Only commits authored before this date.
+        authors: Only commits whose author matches one of these strings.
+        extra_args: Additional `git log` arguments.
+        timeout: Seconds after which the git process is killed.
+
+    Yields:
+        Dict[str, Any]: Commit entries, newest first.
+
+    Raises:
+        subprocess.TimeoutExpired: If git did not finish within the timeout.
+    """
+    args = build_git_log_args(repo_path, revisions, start_date, end_date, authors, extra_args)
+    for fields in iter_git_records(args, timeout):
+        entry = parse_commit_record(fields, repo_name)
+        if entry is None:
+            continue
+        # --since/--until filter on the committer date, entries use the author date
+        if start_date and entry["timestamp"] < start_date:
+            continue
+        if end_date and entry["timestamp"] > end_date:
+            continue
+        yield entry
+
+
+def list_branch_refs(repo_path: str, prefer_local: bool = False) -> Dict[str, str]:
+    """
+    Map branch names to their full refs.
+
+    Branches are read from refs/heads (local branches, or every branch of a
+    bare mirror) and refs/remotes/origin (branches of a regular clone).
+
+    Args:
+        repo_path: Path of the repository (or bare mirror).
+        prefer_local: Whether refs/heads wins over refs/remotes/origin when a
+            branch exists in both.
+
+    Returns:
+        Dict[str, str]: Full ref of each branch name.
+    """
+    result = subprocess.run(
+        ["git", "-C", repo_path, "for-each-ref", "--format=%(refname)", "refs/heads", "refs/remotes/origin"],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    local, remote = {}, {}
+    for ref in result.stdout.splitlines():
+        if ref.startswith("refs/remotes/origin/"):
+            name = ref[len("refs/remotes/origin/"):]
+            if name != "HEAD":
+                remote[name] = ref
+        elif ref.startswith("refs/heads/"):
+            local[ref[len("refs/heads/"):]] = ref
+    return {**remote, **local} if prefer_local else {**local, **remote}
+
+
+def refs_containing(repo_path: str, ref: str) -> List[str]:
+    """
+    List the branch refs that contain ref, in one `for-each-ref --contains`.
+
+    A branch that does not contain ref is one ref has commits that are not in.
+
+    Args:
+        repo_path: Path of the repository (or bare mirror).
+        ref: Revision to look for.
+
+    Returns:
+        List[str]: Full refs under refs/heads and refs/remotes/origin.
+    """
+    result = subprocess.run(
+        [
+            "git", "-C", repo_path, "for-each-ref", "--format=%(refname)", "--contains", ref,
+            "refs/heads", "refs/remotes/origin"
+        ],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return result.stdout.splitlines()
+
+
+def compare_refs(repo_path: str, repo_name: str, source_ref: str, target_ref: str) -> Dict[str, Any]:
+    """
+    Compare two refs in a single walk of their symmetric difference.
+
+    Args:
+        repo_path: Path of the repository (or bare mirror).
+        repo_name: Repository name reported in the entries.
+        source_ref: Full ref of the source branch.
+        target_ref: Full ref of the target branch.
+
+    Returns:
+        Dict with the number of commits the source is "ahead" of and "behind"
+        the target, and the "commits" entries of source not in target
+        (`target..source`, newest first).
+    """
+    args = build_git_log_args(
+        repo_path,
+        revisions=("--left-right", f"{target_ref}...{source_ref}"),
+        pretty=f"%m%x1f{GIT_LOG_FORMAT}"
+    )
+    commits, behind = [], 0
+    for fields in iter_git_records(args):
+        if fields[0] == b"<":
+            behind += 1
+            continue
+        entry = parse_commit_record(fields[1:], repo_name)
+        if entry is not None:
+            commits.append(entry)
+    return {"ahead": len(commits), "behind": behind, "commits": commits}
+
+
+def ref_state(repo_path: str) -> str:
+    """
+    Hash the ref state of a repository (every ref, HEAD and the shallow boundary).
+
+    The hash changes whenever history visible to `git log --all` may have
+    changed, so it can key caches of values derived from the whole history.
+
+    Args:
+        repo_path: Path of the repository (or bare mirror).
+
+    Returns:
+        str: Hex digest of the ref state.
+    """
+    result = subprocess.run(
+        ["git", "-C", repo_path, "for-each-ref", "--format=%(objectname) %(refname)"],
+        capture_output=True,
+        check=True
+    )
+    digest = hashlib.sha256(result.stdout)
+    head = subprocess.run(["git", "-C", repo_path, "rev-parse", "--git-dir", "HEAD"], capture_output=True)
+    digest.update(head.stdout)
+    git_dir = head.stdout.split(b"\n", 1)[0].decode("utf-8", errors="replace")
+    try:
+        with open(os.path.join(repo_path, git_dir, "shallow"), "rb") as shallow:
+            digest.update(shallow.read())
+    except OSError:
+        pass
+    return digest.hexdigest()
+
+
+def iter_identities(
+    repo_path: str,
+    config: Sequence[str] = (),
+    revisions: Sequence[str] = ("--all",)
+) -> Iterator[Tuple[str, str]]:
+    """
+    Stream the (name, email) of every author and committer in one history walk.
+
+    Identities are mapped through the repository's mailmap.
+
+    Args:
+        repo_path: Path of the repository (or bare mirror).
+        config: Extra `-c key=value` git configuration, e.g. the mailmap blob
+            of repositories without a working tree.
+        revisions: Revisions to walk.
+
+    Yields:
+        Tuple[str, str]: Name and email, authors and committers interleaved.
+    """
+    args = build_git_log_args(repo_path, revisions, extra_args=["--use-mailmap"], pretty="%aN%x1f%aE%x1f%cN%x1f%cE")
+    for item in reversed(config):
+        args[1:1] = ["-c", item]
+    for fields in iter_git_records(args):
+        if len(fields) != 4:
+            continue
+        author_name, author_email, committer_name, committer_email = (
+            field.decode("utf-8", errors="replace").strip() for field in fields
+        )
+        yield author_name, author_email
+        yield committer_name, committer_email
+
+
+@functools.lru_cache(maxsize=64)
+def author_index(
+    repo_path: str,
+    state: str,
+    config: Tuple[str, ...] = (),
+    revisions: Tuple[str, ...] = ("--all",)
+) -> Tuple[Tuple[str, str], ...]:
+    """
+    Return the unique identities of a repository, cached per ref state.
+
+    Identities are deduplicated by case-insensitive email (by name when the
+    email is empty), keeping the spelling of the most recent commit.
+
+    Args:
+        repo_path: Path of the repository (or bare mirror).
+        state: `ref_state` of the repository; only used as the cache key.
+        config: Extra git configuration passed to `iter_identities`.
+        revisions: Revisions to walk.
+
+    Returns:
+        Tuple of (name, email) pairs sorted by name.
+    """
+    identities: Dict[str, Tuple[str, str]] = {}
+    for name, email in iter_identities(repo_path, config, revisions):
+        if not name and not email:
+            continue
+        key = email.lower() if email else f"name:{name.lower()}"
+        identities.setdefault(key, (name, email))
+    return tuple(sorted(identities.values(), key=lambda identity: (identity[0].lower(), identity[1].lower())))
@@ -2,7 +2,9 @@ from github import Github
 from github import GithubException
 from datetime import datetime
 from typing import List, Dict, Any, Optional
+import threading
 from git_recap.providers.base_fetcher import BaseFetcher
+from git_recap.providers.query import RecapQuery
 import logging
 
 logger = logging.getLogger(__name__)
@@ -19,36 +21,41 @@ class GitHubFetcher(BaseFetcher):
         super().__init__(pat, start_date, end_date, repo_filter, authors)
         self.github = Github(self.pat)
         self.user = self.github.get_user()
-        self.repos = self.user.get_repos(affiliation="owner,collaborator,organization_member")
+        self._repo_pages = self.user.get_repos(affiliation="owner,collaborator,organization_member")
+        self._repos = None
+        self._repos_lock = threading.Lock()
         self.authors.append(self.user.login)
 
     @property
-    def repos_names(self) -> List[str]:
-        return [repo.name for repo in self.repos]
+    def repos(self) -> List[Any]:
+        """
+        Repositories of the user, listed once.
 
-    def _stop_fetching(self, date_obj: datetime) -> bool:
-        if self.start_date and date_obj < self.start_date:
-            return True
-        return False
+        PyGithub's paginated lists load their pages while being iterated and
+        are not thread-safe, so the listing is materialized under a lock before
+        concurrent calls iterate it.
+        """
+        with self._repos_lock:
+            if self._repos is None:
+                self._repos = list(self._repo_pages)
+            return self._repos
 
-    def _filter_by_date(self, date_obj: datetime) -> bool:
-        if self.start_date and date_obj < self.start_date:
-            return False
-        if self.end_date and date_obj > self.end_date:
-            return False
-        return True
+    @property
+    def repos_names(self) -> List[str]:
+        return [repo.name for repo in self.repos]
 
-    def fetch_commits(self) -> List[Dict[str, Any]]:
+    def fetch_commits(self, query: Optional[RecapQuery] = None) -> List[Dict[str, Any]]:
+        query = self._query(query)
         entries = []
         processed_commits = set()
         for repo in self.repos:
-            if self.repo_filter and repo.name not in self.repo_filter:
+            if not query.selects_repo(repo.name):
                 continue
-            for author in self.authors:
+            for author in query.authors:
                 commits = repo.get_commits(author=author)
                 for i, commit in enumerate(commits, start=1):
                     commit_date = commit.commit.author.date
-                    if self._filter_by_date(commit_date):
+                    if query.in_window(commit_date):
                         sha = commit.sha
                         if sha not in processed_commits:
                             entry = {
@@ -60,15 +67,16 @@ class GitHubFetcher(BaseFetcher):
                             }
                             entries.append(entry)
                             processed_commits.add(sha)
-                    if self._stop_fetching(commit_date):
+                    if query.before_window(commit_date):
                         break
         return entries
 
-    def fetch_branch_diff_commits(self, source_branch: str, target_branch: str) -> List[Dict[str, Any]]:
+    def fetch_branch_diff_commits(self, source_branch: str, target_branch: str, query: Optional[RecapQuery] = None) -> List[Dict[str, Any]]:
+        query = self._query(query)
         entries = []
         processed_commits = set()
         for repo in self.repos:
-            if self.repo_filter and repo.name not in self.repo_filter:
+            if not query.selects_repo(repo.name):
                 continue
             try:
                 comparison = repo.compare(target_branch, source_branch)
@@ -90,18 +98,19 @@ class GitHubFetcher(BaseFetcher):
                 continue
         return entries
 
-    def fetch_pull_requests(self) -> List[Dict[str, Any]]:
+    def fetch_pull_requests(self, query: Optional[RecapQuery] = None) -> List[Dict[str, Any]]:
+        query = self._query(query)
         entries = []
         processed_pr_commits = set()
         for repo in self.repos:
-            if self.repo_filter and repo.name not in self.repo_filter:
+            if not query.selects_repo(repo.name):
                 continue
             pulls = repo.get_pulls(state='all')
             for i, pr in enumerate(pulls, start=1):
-                if pr.user.login not in self.authors:
+                if pr.user.login not in query.authors:
                     continue
                 pr_date = pr.updated_at
-                if not self._filter_by_date(pr_date):
+                if not query.in_window(pr_date):
                     continue
 
                 pr_entry = {
@@ -116,7 +125,7 @@ class GitHubFetcher(BaseFetcher):
                 pr_commits = pr.get_commits()
                 for pr_commit in pr_commits:
                     commit_date = pr_commit.commit.author.date
-                    if self._filter_by_date(commit_date):
+                    if query.in_window(commit_date):
                         sha = pr_commit.sha
                         if sha in processed_pr_commits:
                             continue
@@ -130,16 +139,17 @@ class GitHubFetcher(BaseFetcher):
                         }
                         entries.append(pr_commit_entry)
                         processed_pr_commits.add(sha)
-                if self._stop_fetching(pr_date):
+                if query.before_window(pr_date):
                     break
         return entries
 
-    def fetch_issues(self) -> List[Dict[str, Any]]:
+    def fetch_issues(self, query: Optional[RecapQuery] = None) -> List[Dict[str, Any]]:
+        query = self._query(query)
         entries = []
         issues = self.user.get_issues()
         for i, issue in enumerate(issues, start=1):
             issue_date = issue.created_at
-            if self._filter_by_date(issue_date):
+            if query.in_window(issue_date):
                 entry = {
                     "type": "issue",
                     "repo": issue.repository.name,
@@ -147,14 +157,17 @@ class GitHubFetcher(BaseFetcher):
                     "timestamp": issue_date,
                 }
                 entries.append(entry)
-            if self._stop_fetching(issue_date):
+            if query.before_window(issue_date):
                 break
         return entries
 
-    def fetch_releases(self) -> List[Dict[str, Any]]:
+    def fetch_releases(self, query: Optional[RecapQuery] = None) -> List[Dict[str, Any]]:
         """
         Fetch releases for all repositories accessible to the user.
 
+        Args:
+            query: Repositories to fetch releases of (default: the fetcher's repo_filter).
+
         Returns:
             List[Dict[str, Any]]: List of releases, each as a structured dictionary with:
                 - tag_name: str
@@ -168,9 +181,10 @@ class GitHubFetcher(BaseFetcher):
                 - body: str
                 - assets: List[Dict[str, Any]] (each with name, size, download_url, content_type, etc.)
         """
+        query = self._query(query)
         releases = []
         for repo in self.repos:
-            if self.repo_filter and repo.name not in self.repo_filter:
+            if not query.selects_repo(repo.name):
                 continue
             try:
                 for rel in repo.get_releases():
@@ -201,19 +215,22 @@ class GitHubFetcher(BaseFetcher):
                 continue
         return releases
 
-    def get_branches(self) -> List[str]:
+    def get_branches(self, query: Optional[RecapQuery] = None) -> List[str]:
         """
         Get all branches in the repository.
+        Args:
+            query: Selects the repository (default: the fetcher's repo_filter).
         Returns:
             List[str]: List of branch names.
         Raises:
             Exception: If API rate limits are exceeded or authentication fails.
         """
+        query = self._query(query)
         logger.debug("Fetching branches from all accessible repositories")
         try:
             branches = []
             for repo in self.repos:
-                if self.repo_filter and repo.name not in self.repo_filter:
+                if not query.selects_repo(repo.name):
                     continue
                 logger.debug(f"Fetching branches for repository: {repo.name}")
                 repo_branches = repo.get_branches()
@@ -235,7 +252,7 @@ class GitHubFetcher(BaseFetcher):
             logger.error(f"Unexpected error while fetching branches: {str(e)}")
             raise Exception(f"Failed to fetch branches: {str(e)}")
 
-    def get_valid_target_branches(self, source_branch: str) -> List[str]:
+    def get_valid_target_branches(self, source_branch: str, query: Optional[RecapQuery] = None) -> List[str]:
         """
         Get branches that can receive a pull request from the source branch.
         Validates that the source branch exists, filters out branches with existing
@@ -243,21 +260,23 @@ class GitHubFetcher(BaseFetcher):
         checks if source is ahead of target.
         Args:
             source_branch (str): The source branch name.
+            query: Selects the repository (default: the fetcher's repo_filter).
         Returns:
             List[str]: List of valid target branch names.
         Raises:
             ValueError: If source branch does not exist.
             Exception: If API errors occur during validation.
         """
+        query = self._query(query)
         logger.debug(f"Validating target branches for source branch: {source_branch}")
         try:
-            all_branches = self.get_branches()
+            all_branches = self.get_branches(query)
             if source_branch not in all_branches:
                 logger.error(f"Source branch '{source_branch}' does not exist")
                 raise ValueError(f"Source branch '{source_branch}' does not exist")
             valid_targets = []
             for repo in self.repos:
-                if self.repo_filter and repo.name not in self.repo_filter:
+                if not query.selects_repo(repo.name):
                     continue
                 logger.debug(f"Processing repository: {repo.name}")
                 repo_branches = [branch.name for branch in repo.get_branches()]
@@ -299,7 +318,8 @@ class GitHubFetcher(BaseFetcher):
         draft: bool = False,
         reviewers: Optional[List[str]] = None,
         assignees: Optional[List[str]] = None,
-        labels: Optional[List[str]] = None
+        labels: Optional[List[str]] = None,
+        query: Optional[RecapQuery] = None
     ) -> Dict[str, Any]:
         """
         Create a pull request between two branches with optional metadata.
@@ -312,14 +332,16 @@ class GitHubFetcher(BaseFetcher):
             reviewers: List of reviewer usernames (optional).
             assignees: List of assignee usernames (optional).
             labels: List of label names (optional).
+            query: Selects the repository (default: the fetcher's repo_filter).
         Returns:
             Dict[str, Any]: Dictionary containing PR metadata or error information.
         Raises:
             ValueError: If branches don't exist or PR already exists.
         """
+        query = self._query(query)
         logger.info(f"Creating pull request from {head_branch} to {base_branch}")
         try:
-            all_branches = self.get_branches()
+            all_branches = self.get_branches(query)
             if head_branch not in all_branches:
                 logger.error(f"Head branch '{head_branch}' does not exist")
                 raise ValueError(f"Head branch '{head_branch}' does not exist")
@@ -327,7 +349,7 @@ class GitHubFetcher(BaseFetcher):
                 logger.error(f"Base branch '{base_branch}' does not exist")
                 raise ValueError(f"Base branch '{base_branch}' does not exist")
             for repo in self.repos:
-                if self.repo_filter and repo.name not in self.repo_filter:
+                if not query.selects_repo(repo.name):
                     continue
                 logger.debug(f"Checking for existing PRs in repository: {repo.name}")
                 try:
@@ -404,7 +426,8 @@ class GitHubFetcher(BaseFetcher):
         Retrieve unique authors from specified GitHub repositories.
         
         Args:
-            repo_names: List of repository names (format: "owner/repo").
+            repo_names: List of repository names ("repo" for the user's
+                       repositories, or "owner/repo").
                        Empty list fetches from all accessible repositories.
         
         Returns:
@@ -414,12 +437,17 @@ class GitHubFetcher(BaseFetcher):
         
         try:
             if not repo_names:
-                repos = self.github.get_user().get_repos()
-                repo_names = [repo.full_name for repo in repos]
+                repos = list(self.repos)
+            else:
+                # Accessible repositories are already listed, others are looked up
+                known = {name: repo for repo in self.repos for name in (repo.name, repo.full_name)}
+                repos = [known.get(repo_name) or repo_name for repo_name in repo_names]
             
-            for repo_name in repo_names:
+            for repo in repos:
+                repo_name = repo if isinstance(repo, str) else repo.full_name
                 try:
-                    repo = self.github.get_repo(repo_name)
+                    if isinstance(repo, str):
+                        repo = self.github.get_repo(repo_name)
                     
                     commits = repo.get_commits()
                     
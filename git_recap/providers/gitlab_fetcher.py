@@ -2,6 +2,7 @@ import gitlab
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 from git_recap.providers.base_fetcher import BaseFetcher
+from git_recap.providers.query import RecapQuery
 
 class GitLabFetcher(BaseFetcher):
     """
@@ -47,42 +48,38 @@ class GitLabFetcher(BaseFetcher):
         """Return the list of repository names."""
         return [project.name for project in self.projects]
 
-    def _filter_by_date(self, date_str: str) -> bool:
-        """Check if a date string is within the configured date range."""
-        date_obj = datetime.fromisoformat(date_str)
-        if self.start_date and date_obj < self.start_date:
-            return False
-        if self.end_date and date_obj > self.end_date:
-            return False
-        return True
+    def _filter_by_date(self, query: RecapQuery, date_str: str) -> bool:
+        """Check if a date string is within the query's date range."""
+        return query.in_window(datetime.fromisoformat(date_str))
 
-    def _stop_fetching(self, date_str: str) -> bool:
+    def _stop_fetching(self, query: RecapQuery, date_str: str) -> bool:
         """Determine if fetching should stop based on the date string."""
-        date_obj = datetime.fromisoformat(date_str)
-        if self.start_date and date_obj < self.start_date:
-            return True
-        return False
+        return query.before_window(datetime.fromisoformat(date_str))
 
-    def fetch_commits(self) -> List[Dict[str, Any]]:
+    def fetch_commits(self, query: Optional[RecapQuery] = None) -> List[Dict[str, Any]]:
         """
         Fetch commits for all projects and authors.
 
+        Args:
+            query: What to fetch (default: the fetcher's filters, see `make_query`).
+
         Returns:
             List[Dict[str, Any]]: List of commit entries.
         """
+        query = self._query(query)
         entries = []
         processed_commits = set()
         for project in self.projects:
-            if self.repo_filter and project.name not in self.repo_filter:
+            if not query.selects_repo(project.name):
                 continue
-            for author in self.authors:
+            for author in query.authors:
                 try:
                     commits = project.commits.list(author=author)
                 except Exception:
                     continue
                 for commit in commits:
                     commit_date = commit.committed_date
-                    if self._filter_by_date(commit_date):
+                    if self._filter_by_date(query, commit_date):
                         sha = commit.id
                         if sha not in processed_commits:
                             entry = {
@@ -96,25 +93,29 @@ class GitLabFetcher(BaseFetcher):
                             processed_commits.add(sha)
         return entries
 
-    def fetch_pull_requests(self) -> List[Dict[str, Any]]:
+    def fetch_pull_requests(self, query: Optional[RecapQuery] = None) -> List[Dict[str, Any]]:
         """
         Fetch merge requests (pull requests) and their associated commits for all projects and authors.
 
+        Args:
+            query: What to fetch (default: the fetcher's filters, see `make_query`).
+
         Returns:
             List[Dict[str, Any]]: List of pull request and commit_from_pr entries.
         """
+        query = self._query(query)
         entries = []
         processed_pr_commits = set()
         for project in self.projects:
-            if self.repo_filter and project.name not in self.repo_filter:
+            if not query.selects_repo(project.name):
                 continue
             # Fetch merge requests (GitLab's pull requests)
             merge_requests = project.mergerequests.list(state='all', all=True)
             for mr in merge_requests:
-                if mr.author['username'] not in self.authors:
+                if mr.author['username'] not in query.authors:
                     continue
                 mr_date = mr.created_at
-                if not self._filter_by_date(mr_date):
+                if not self._filter_by_date(query, mr_date):
                     continue
                 mr_entry = {
                     "type": "pull_request",
@@ -130,7 +131,7 @@ class GitLabFetcher(BaseFetcher):
                     mr_commits = []
                 for mr_commit in mr_commits:
                     commit_date = mr_commit['created_at']
-                    if self._filter_by_date(commit_date):
+                    if self._filter_by_date(query, commit_date):
                         sha = mr_commit['id']
                         if sha in processed_pr_commits:
                             continue
@@ -144,25 +145,29 @@ class GitLabFetcher(BaseFetcher):
                         }
                         entries.append(mr_commit_entry)
                         processed_pr_commits.add(sha)
-                if self._stop_fetching(mr_date):
+                if self._stop_fetching(query, mr_date):
                     break
         return entries
 
-    def fetch_issues(self) -> List[Dict[str, Any]]:
+    def fetch_issues(self, query: Optional[RecapQuery] = None) -> List[Dict[str, Any]]:
         """
         Fetch issues assigned to the authenticated user for all projects.
 
+        Args:
+            query: What to fetch (default: the fetcher's filters, see `make_query`).
+
         Returns:
             List[Dict[str, Any]]: List of issue entries.
         """
+        query = self._query(query)
         entries = []
         for project in self.projects:
-            if self.repo_filter and project.name not in self.repo_filter:
+            if not query.selects_repo(project.name):
                 continue
             issues = project.issues.list(assignee_id=self.gl.user.id)
             for issue in issues:
                 issue_date = issue.created_at
-                if self._filter_by_date(issue_date):
+                if self._filter_by_date(query, issue_date):
                     entry = {
                         "type": "issue",
                         "repo": project.name,
@@ -170,11 +175,11 @@ class GitLabFetcher(BaseFetcher):
                         "timestamp": issue_date,
                     }
                     entries.append(entry)
-                if self._stop_fetching(issue_date):
+                if self._stop_fetching(query, issue_date):
                     break
         return entries
 
-    def fetch_releases(self) -> List[Dict[str, Any]]:
+    def fetch_releases(self, query: Optional[RecapQuery] = None) -> List[Dict[str, Any]]:
         """
         Fetch releases for GitLab repositories.
 
@@ -185,7 +190,7 @@ class GitLabFetcher(BaseFetcher):
         """
         raise NotImplementedError("Release fetching is not supported for GitLab (GitLabFetcher).")
 
-    def get_branches(self) -> List[str]:
+    def get_branches(self, query: Optional[RecapQuery] = None) -> List[str]:
         """
         Get all branches in the repository.
         
@@ -197,7 +202,7 @@ class GitLabFetcher(BaseFetcher):
         """
         raise NotImplementedError("Branch listing is not yet implemented for GitLab (GitLabFetcher).")
 
-    def get_valid_target_branches(self, source_branch: str) -> List[str]:
+    def get_valid_target_branches(self, source_branch: str, query: Optional[RecapQuery] = None) -> List[str]:
         """
         Get branches that can receive a pull request from the source branch.
         
@@ -207,6 +212,7 @@ class GitLabFetcher(BaseFetcher):
         
         Args:
             source_branch (str): The source branch name.
+            query: Selects the repository (default: the fetcher's repo_filter).
         
         Returns:
             List[str]: List of valid target branch names.
@@ -225,7 +231,8 @@ class GitLabFetcher(BaseFetcher):
         draft: bool = False,
         reviewers: Optional[List[str]] = None,
         assignees: Optional[List[str]] = None,
-        labels: Optional[List[str]] = None
+        labels: Optional[List[str]] = None,
+        query: Optional[RecapQuery] = None
     ) -> Dict[str, Any]:
         """
         Create a pull request (merge request) between two branches with optional metadata.
@@ -239,6 +246,7 @@ class GitLabFetcher(BaseFetcher):
             reviewers: List of reviewer usernames (optional).
             assignees: List of assignee usernames (optional).
             labels: List of label names (optional).
+            query: Selects the repository (default: the fetcher's repo_filter).
         
         Returns:
             Dict[str, Any]: Dictionary containing PR metadata (url, number, state, success) or error information.
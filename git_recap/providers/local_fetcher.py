@@ -0,0 +1,293 @@
+import heapq
+import os
+import subprocess
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from git_recap.providers.base_fetcher import BaseFetcher
+from git_recap.providers.query import RecapQuery
+from git_recap.providers.git_log import (
+    author_index,
+    compare_refs,
+    iter_git_log,
+    list_branch_refs,
+    ref_state,
+    refs_containing,
+)
+
+
+class LocalRepoFetcher(BaseFetcher):
+    """
+    Fetcher implementation for repositories that are already on disk.
+
+    The history is read directly from the existing object database of each
+    checkout (or bare repository), without cloning or copying anything and
+    without network access. The repositories are only read, never modified.
+    """
+
+    def __init__(
+        self,
+        paths: Union[str, List[str]],
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        repo_filter: Optional[List[str]] = None,
+        authors: Optional[List[str]] = None
+    ):
+        super().__init__(
+            pat="",  # No PAT needed for local repositories
+            start_date=start_date,
+            end_date=end_date,
+            repo_filter=repo_filter,
+            authors=authors
+        )
+        if isinstance(paths, str):
+            paths = [paths]
+        self.repo_paths: Dict[str, str] = {}
+        for path in paths:
+            path = os.path.abspath(os.path.expanduser(path))
+            self._validate_path(path)
+            name = os.path.basename(path.rstrip(os.sep))
+            if name.endswith(".git"):
+                name = name[:-4]
+            if name in self.repo_paths:
+                raise ValueError(f"Repository name '{name}' is used by more than one path")
+            self.repo_paths[name] = path
+
+    @staticmethod
+    def _validate_path(path: str) -> None:
+        """Check that path is a Git repository."""
+        try:
+            subprocess.run(
+                ["git", "-C", path, "rev-parse", "--git-dir"],
+                capture_output=True,
+                text=True,
+                check=True
+            )
+        except (subprocess.CalledProcessError, FileNotFoundError, NotADirectoryError) as e:
+            raise ValueError(f"Not a Git repository: {path}") from e
+
+    @property
+    def repos_names(self) -> List[str]:
+        """Return the list of repository names (directory names of the paths)."""
+        return list(self.repo_paths)
+
+    def _selected_repos(self, query: RecapQuery) -> Dict[str, str]:
+        return {
+            name: path for name, path in self.repo_paths.items()
+            if query.selects_repo(name)
+        }
+
+    def iter_commits(self, query: Optional[RecapQuery] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream commits from all branches of the selected repositories.
+
+        The per-repository streams are merged, so memory does not grow with
+        the size of the history. Each repository streams in `git log`
+        (committer date) order, so rebased or cherry-picked commits may be out
+        of (author) timestamp order; `fetch_commits` sorts them exactly.
+
+        Args:
+            query: What to fetch (default: the fetcher's filters, see `make_query`).
+
+        Yields:
+            Dict[str, Any]: Commit entries, newest first.
+        """
+        query = self._query(query)
+        streams = [
+            iter_git_log(
+                path,
+                name,
+                start_date=query.start_date,
+                end_date=query.end_date,
+                authors=list(query.authors)
+            )
+            for name, path in self._selected_repos(query).items()
+        ]
+        return heapq.merge(*streams, key=lambda entry: entry["timestamp"], reverse=True)
+
+    def fetch_commits(self, query: Optional[RecapQuery] = None) -> List[Dict[str, Any]]:
+        """Fetch commits from all branches of the selected repositories, newest first."""
+        return sorted(self.iter_commits(query), key=lambda entry: entry["timestamp"], reverse=True)
+
+    def fetch_pull_requests(self, query: Optional[RecapQuery] = None) -> List[Dict[str, Any]]:
+        """Fetch pull requests (not available for local repositories)."""
+        return []
+
+    def fetch_issues(self, query: Optional[RecapQuery] = None) -> List[Dict[str, Any]]:
+        """Fetch issues (not available for local repositories)."""
+        return []
+
+    def fetch_releases(self, query: Optional[RecapQuery] = None) -> List[Dict[str, Any]]:
+        """
+        Fetch releases for the repositories.
+        Not implemented for local repositories.
+        Raises:
+            NotImplementedError: Always, since local repositories have no releases.
+        """
+        raise NotImplementedError("Release fetching is not supported for local repositories (LocalRepoFetcher).")
+
+    def _repo_for_branches(self, query: Optional[RecapQuery]) -> Tuple[str, str]:
+        """Return (name, path) of the repository branch operations apply to."""
+        selected = self._selected_repos(self._query(query))
+        if not selected:
+            raise ValueError("No repository matches the repository filter")
+        return next(iter(selected.items()))
+
+    def _branch_ref(self, branches: Dict[str, str], branch: str) -> str:
+        ref = branches.get(branch)
+        if ref is None:
+            raise ValueError(f"Branch '{branch}' does not exist")
+        return ref
+
+    def get_branches(self, query: Optional[RecapQuery] = None) -> List[str]:
+        """
+        Get all branches of the selected repositories (local and origin's).
+
+        Args:
+            query: Selects the repositories (default: the fetcher's repo_filter).
+
+        Returns:
+            List[str]: List of branch names.
+        """
+        branches = set()
+        for path in self._selected_repos(self._query(query)).values():
+            branches.update(list_branch_refs(path, prefer_local=True))
+        return sorted(branches)
+
+    def get_valid_target_branches(self, source_branch: str, query: Optional[RecapQuery] = None) -> List[str]:
+        """
+        Get branches that can receive a pull request from the source branch.
+
+        A branch is a valid target if it is not the source branch and the source
+        branch has commits that are not in it.
+
+        Args:
+            source_branch (str): The source branch name.
+            query: Selects the repository (default: the fetcher's repo_filter).
+
+        Returns:
+            List[str]: List of valid target branch names.
+
+        Raises:
+            ValueError: If the source branch does not exist.
+        """
+        _, path = self._repo_for_branches(query)
+        branches = list_branch_refs(path, prefer_local=True)
+        source_ref = self._branch_ref(branches, source_branch)
+        containing = set(refs_containing(path, source_ref))
+        return [
+            branch for branch in sorted(branches)
+            if branch != source_branch and branches[branch] not in containing
+        ]
+
+    def compare_branches(
+        self,
+        source_branch: str,
+        target_branch: str,
+        query: Optional[RecapQuery] = None
+    ) -> Dict[str, Any]:
+        """
+        Compare two branches in a single walk of their symmetric difference.
+
+        Args:
+            source_branch (str): The source branch name.
+            target_branch (str): The target branch name.
+            query: Selects the repository (default: the fetcher's repo_filter).
+
+        Returns:
+            Dict with the number of commits the source is "ahead" of and "behind"
+            the target, and the "commits" entries of source not in target.
+
+        Raises:
+            ValueError: If either branch does not exist.
+        """
+        name, path = self._repo_for_branches(query)
+        branches = list_branch_refs(path, prefer_local=True)
+        return compare_refs(
+            path,
+            name,
+            self._branch_ref(branches, source_branch),
+            self._branch_ref(branches, target_branch)
+        )
+
+    def fetch_branch_diff_commits(
+        self,
+        source_branch: str,
+        target_branch: str,
+        query: Optional[RecapQuery] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch the commits of source_branch that are not in target_branch (`target..source`).
+
+        Args:
+            source_branch (str): The source branch name.
+            target_branch (str): The target branch name.
+            query: Selects the repository (default: the fetcher's repo_filter).
+
+        Returns:
+            List[Dict[str, Any]]: List of commit entries.
+
+        Raises:
+            ValueError: If either branch does not exist.
+        """
+        return self.compare_branches(source_branch, target_branch, query)["commits"]
+
+    def create_pull_request(
+        self,
+        head_branch: str,
+        base_branch: str,
+        title: str,
+        body: str,
+        draft: bool = False,
+        reviewers: Optional[List[str]] = None,
+        assignees: Optional[List[str]] = None,
+        labels: Optional[List[str]] = None,
+        query: Optional[RecapQuery] = None
+    ) -> Dict[str, Any]:
+        """
+        Create a pull request between two branches.
+
+        Raises:
+            NotImplementedError: Always, since local repositories have no pull requests.
+        """
+        raise NotImplementedError("Pull request creation is not supported for local repositories (LocalRepoFetcher).")
+
+    def get_authors(self, repo_names: List[str]) -> List[Dict[str, str]]:
+        """
+        Retrieve unique authors and committers of the repositories.
+
+        Identities are mapped through .mailmap, deduplicated by email and
+        cached until the refs of a repository move.
+
+        Args:
+            repo_names: Repositories to scan; all repositories if empty.
+
+        Returns:
+            List of unique author dictionaries with name and email.
+        """
+        authors = {}
+        for name, path in self.repo_paths.items():
+            if repo_names and name not in repo_names:
+                continue
+            for author_name, email in author_index(path, ref_state(path)):
+                authors.setdefault(email.lower() or f"name:{author_name.lower()}", (author_name, email))
+        return [{"name": name, "email": email} for name, email in sorted(authors.values())]
+
+    def get_current_author(self) -> Optional[Dict[str, str]]:
+        """
+        Retrieve the identity configured for Git in the first repository.
+
+        Returns:
+            Optional[Dict[str, str]]: The configured user.name and user.email, or
+            None if no identity is configured.
+        """
+        path = next(iter(self.repo_paths.values()))
+        identity = {}
+        for key in ("name", "email"):
+            result = subprocess.run(
+                ["git", "-C", path, "config", f"user.{key}"],
+                capture_output=True,
+                text=True
+            )
+            identity[key] = result.stdout.strip()
+        return identity if identity["name"] else None
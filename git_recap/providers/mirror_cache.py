@@ -0,0 +1,412 @@
+import asyncio
+import base64
+import hashlib
+import os
+import shutil
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, IO, List, Optional, Tuple
+from urllib.parse import unquote, urlsplit, urlunsplit
+
+from git_recap.providers.async_git import run_git
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no flock, fall back to in-process locks only
+    fcntl = None
+
+# Mirrors keep branches and tags only: hosting services publish other refs
+# (e.g. GitHub's refs/pull/*) holding commits that never landed in the repository.
+MIRROR_REFSPECS = ["+refs/heads/*:refs/heads/*", "+refs/tags/*:refs/tags/*"]
+
+
+class MirrorCache:
+    """
+    Shared cache of bare mirrors, keyed by normalized repository URL.
+
+    The first session asking for a repository creates a bare clone of its
+    branches and tags; later sessions only run an incremental `git fetch` into
+    it and read from it directly, so repeat clones of popular repositories take
+    about as long as a fetch. Credentials are part of the key, so sessions only
+    share the mirrors they could have cloned themselves, and they are never
+    written to the mirror: they are passed to each fetch as an HTTP header.
+
+    Each mirror has an update lock, held while it is cloned or fetched, and a
+    readers lock, held shared from `acquire` until `release` (both are a
+    `flock` on a lock file, so several worker processes can share the cache
+    directory). Mirrors are evicted least-recently-used first when the cache
+    exceeds its disk quota, and a commit-graph (plus bitmaps for full mirrors)
+    is refreshed periodically to keep `git log` fast.
+    """
+
+    def __init__(
+        self,
+        root_dir: str,
+        quota_bytes: int = 10 * 1024 ** 3,
+        maintenance_interval: int = 3600,
+        timeout: int = 300
+    ):
+        self.root_dir = root_dir
+        self.quota_bytes = quota_bytes
+        self.maintenance_interval = maintenance_interval
+        self.timeout = timeout
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        # Readers lock files held by this process, per key (None without flock)
+        self._in_use: Dict[str, List[Optional[IO]]] = {}
+        os.makedirs(self.root_dir, exist_ok=True)
+
+    @staticmethod
+    def normalize_url(url: str) -> str:
+        """
+        Normalize a repository URL so equivalent spellings share one mirror.
+
+        Credentials, letter case of the scheme/host, trailing slashes and the
+        `.git` suffix are ignored.
+        """
+        parts = urlsplit(url.strip())
+        host = (parts.hostname or "").lower()
+        if parts.port:
+            host = f"{host}:{parts.port}"
+        path = parts.path.rstrip("/")
+        if path.endswith(".git"):
+            path = path[:-4]
+        return urlunsplit((parts.scheme.lower(), host, path, "", ""))
+
+    @staticmethod
+    def split_credentials(url: str) -> Tuple[str, str]:
+        """
+        Split the credentials out of an HTTP(S) repository URL.
+
+        Returns:
+            Tuple[str, str]: The URL without credentials and the credentials
+            ("user:password", "token" or "" if there are none).
+        """
+        url = url.strip()
+        parts = urlsplit(url)
+        if parts.scheme.lower() not in ("http", "https") or "@" not in parts.netloc:
+            return url, ""
+        credentials, host = parts.netloc.rsplit("@", 1)
+        return urlunsplit((parts.scheme, host, parts.path, parts.query, parts.fragment)), credentials
+
+    def key(self, url: str) -> str:
+        """Return the cache key (content address) of a repository URL and its credentials."""
+        source = self.normalize_url(url)
+        _, credentials = self.split_credentials(url)
+        if credentials:
+            source = f"{source}\n{credentials}"
+        return hashlib.sha256(source.encode("utf-8")).hexdigest()[:32]
+
+    def mirror_path(self, url: str) -> str:
+        """Return the path of the bare mirror for a repository URL."""
+        return os.path.join(self.root_dir, f"{self.key(url)}.git")
+
+    def _open_lock(self, name: str, operation: int) -> Optional[IO]:
+        """Open and flock a lock file, returning None if a non-blocking operation would block."""
+        lock_file = open(os.path.join(self.root_dir, name), "w")
+        try:
+            fcntl.flock(lock_file, operation)
+        except BlockingIOError:
+            lock_file.close()
+            return None
+        except BaseException:
+            lock_file.close()
+            raise
+        return lock_file
+
+    def _hold(self, key: str, blocking: bool = True) -> Optional[Callable[[], None]]:
+        """
+        Take the update lock of a mirror.
+
+        Returns:
+            The function releasing the lock, or None if it is held elsewhere
+            (non-blocking only).
+        """
+        with self._locks_guard:
+            thread_lock = self._locks.setdefault(key, threading.Lock())
+        if not thread_lock.acquire(blocking=blocking):
+            return None
+        lock_file = None
+        if fcntl is not None:
+            try:
+                lock_file = self._open_lock(f"{key}.lock", fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BaseException:
+                thread_lock.release()
+                raise
+            if lock_file is None:
+                thread_lock.release()
+                return None
+
+        def unlock() -> None:
+            if lock_file is not None:
+                lock_file.close()
+            thread_lock.release()
+
+        return unlock
+
+    @contextmanager
+    def _lock(self, key: str, blocking: bool = True):
+        """Hold the update lock of a mirror, yielding whether it was acquired."""
+        unlock = self._hold(key, blocking)
+        try:
+            yield unlock is not None
+        finally:
+            if unlock is not None:
+                unlock()
+
+    def _read_lock(self, key: str) -> Optional[IO]:
+        """Take the readers lock of a mirror (shared), which keeps other processes from evicting it."""
+        if fcntl is None:
+            return None
+        return self._open_lock(f"{key}.readers", fcntl.LOCK_SH)
+
+    @staticmethod
+    def credentials_env(credentials: str) -> Optional[Dict[str, str]]:
+        """
+        Return the environment passing credentials to git as an HTTP
+        Authorization header, so they never appear in the mirror's config.
+        """
+        if not credentials:
+            return None
+        user, _, password = credentials.partition(":")
+        token = base64.b64encode(f"{unquote(user)}:{unquote(password)}".encode("utf-8")).decode("ascii")
+        index = int(os.environ.get("GIT_CONFIG_COUNT", 0))
+        return {
+            **os.environ,
+            "GIT_CONFIG_COUNT": str(index + 1),
+            f"GIT_CONFIG_KEY_{index}": "http.extraHeader",
+            f"GIT_CONFIG_VALUE_{index}": f"Authorization: Basic {token}"
+        }
+
+    def _update_commands(self, url: str, path: str, clone_args: Optional[List[str]]) -> Tuple[List[List[str]], Optional[str]]:
+        """
+        Return the git commands creating or refreshing the mirror of url, and
+        the temporary path to move to path once they succeed (new mirrors only).
+        """
+        remote_url, _ = self.split_credentials(url)
+        if os.path.isdir(path):
+            # Also drops credentials left in the config by older mirrors
+            return [
+                ["-C", path, "remote", "set-url", "origin", remote_url],
+                ["-C", path, "fetch", "--prune", "--quiet", "origin", *MIRROR_REFSPECS]
+            ], None
+        tmp_path = f"{path}.tmp"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        return [["clone", "--bare", "--quiet", *(clone_args or []), remote_url, tmp_path]], tmp_path
+
+    def _run_git(self, args: List[str], env: Optional[Dict[str, str]] = None) -> subprocess.CompletedProcess:
+        return subprocess.run(["git", *args], check=True, capture_output=True, text=True, timeout=self.timeout, env=env)
+
+    def acquire(self, url: str, clone_args: Optional[List[str]] = None) -> str:
+        """
+        Return an up-to-date bare mirror of url, creating it if needed.
+
+        The mirror is marked in use until `release` is called, so it is never
+        evicted while a session reads from it, by this process or another.
+
+        Args:
+            url: Repository URL, with credentials if it needs any.
+            clone_args: Extra `git clone` arguments (e.g. a partial clone filter)
+                used when the mirror is created.
+
+        Returns:
+            str: Path of the bare mirror.
+
+        Raises:
+            RuntimeError: If cloning or fetching fails.
+        """
+        key = self.key(url)
+        path = self.mirror_path(url)
+        env = self.credentials_env(self.split_credentials(url)[1])
+        reader = self._read_lock(key)
+        try:
+            with self._lock(key):
+                commands, tmp_path = self._update_commands(url, path, clone_args)
+                try:
+                    for args in commands:
+                        self._run_git(args, env)
+                except subprocess.TimeoutExpired:
+                    raise RuntimeError("Repository mirroring timed out")
+                except subprocess.CalledProcessError as e:
+                    raise RuntimeError(f"Failed to mirror repository: {e.stderr}") from e
+                if tmp_path:
+                    os.replace(tmp_path, path)
+                self._touch(path)
+                self._maybe_maintain(path, clone_args)
+        except BaseException:
+            if reader is not None:
+                reader.close()
+            raise
+
+        with self._locks_guard:
+            self._in_use.setdefault(key, []).append(reader)
+        self.evict()
+        return path
+
+    @staticmethod
+    async def _in_thread(take: Callable[..., Any], undo: Callable[[Any], None], *args: Any) -> Any:
+        """
+        Take a blocking lock in a worker thread. If the caller is cancelled
+        while waiting, the lock is undone as soon as the thread gets it.
+        """
+        future = asyncio.get_running_loop().run_in_executor(None, take, *args)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            future.add_done_callback(lambda done: done.cancelled() or done.exception() or undo(done.result()))
+            raise
+
+    async def aacquire(self, url: str, clone_args: Optional[List[str]] = None) -> str:
+        """
+        Async counterpart of `acquire`.
+
+        Only waiting for the locks happens in a worker thread; git runs on the
+        event loop, so cancelling the awaiting task kills it, releases the
+        locks and leaves the mirror unmarked.
+
+        Raises:
+            RuntimeError: If cloning or fetching fails.
+        """
+        key = self.key(url)
+        path = self.mirror_path(url)
+        env = self.credentials_env(self.split_credentials(url)[1])
+        reader = await self._in_thread(self._read_lock, lambda lock_file: lock_file and lock_file.close(), key)
+        try:
+            unlock = await self._in_thread(self._hold, lambda release: release(), key)
+            try:
+                commands, tmp_path = self._update_commands(url, path, clone_args)
+                try:
+                    for args in commands:
+                        await run_git(["git", *args], timeout=self.timeout, env=env)
+                except subprocess.TimeoutExpired:
+                    raise RuntimeError("Repository mirroring timed out")
+                except subprocess.CalledProcessError as e:
+                    raise RuntimeError(f"Failed to mirror repository: {e.stderr}") from e
+                if tmp_path:
+                    os.replace(tmp_path, path)
+                self._touch(path)
+                try:
+                    for args in self._maintenance_commands(path, clone_args):
+                        await run_git(["git", *args], timeout=self.timeout)
+                    self._mark_maintained(path)
+                except (subprocess.CalledProcessError, subprocess.TimeoutExpired):
+                    pass
+            finally:
+                unlock()
+            # Our readers lock already keeps this mirror from being evicted
+            await asyncio.to_thread(self.evict)
+        except BaseException:
+            if reader is not None:
+                reader.close()
+            raise
+
+        with self._locks_guard:
+            self._in_use.setdefault(key, []).append(reader)
+        return path
+
+    def release(self, url: str) -> None:
+        """Mark one use of the mirror of url as finished."""
+        key = self.key(url)
+        with self._locks_guard:
+            readers = self._in_use.get(key)
+            if not readers:
+                return
+            reader = readers.pop()
+            if not readers:
+                del self._in_use[key]
+        if reader is not None:
+            reader.close()
+
+    @staticmethod
+    def _touch(path: str) -> None:
+        os.utime(path, None)
+
+    def _maintenance_commands(self, path: str, clone_args: Optional[List[str]]) -> List[List[str]]:
+        """Return the git commands refreshing the commit-graph (and bitmaps of full mirrors), if it is due."""
+        marker = os.path.join(path, "gitrecap-maintenance")
+        if os.path.exists(marker) and time.time() - os.path.getmtime(marker) < self.maintenance_interval:
+            return []
+        clone_args = " ".join(clone_args or [])
+        # Changed-path filters read every tree, which treeless mirrors would fetch one by one
+        commit_graph = ["-C", path, "commit-graph", "write", "--reachable"]
+        if "--filter=tree:" not in clone_args:
+            commit_graph.append("--changed-paths")
+        commands = [commit_graph]
+        if "--filter" not in clone_args:
+            commands.append(["-C", path, "repack", "-a", "-d", "--write-bitmap-index", "--quiet"])
+        return commands
+
+    @staticmethod
+    def _mark_maintained(path: str) -> None:
+        with open(os.path.join(path, "gitrecap-maintenance"), "w"):
+            pass
+
+    def _maybe_maintain(self, path: str, clone_args: Optional[List[str]]) -> None:
+        """Refresh the commit-graph (and bitmaps of full mirrors) if it is due."""
+        try:
+            for args in self._maintenance_commands(path, clone_args):
+                self._run_git(args)
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired):
+            return
+        self._mark_maintained(path)
+
+    @staticmethod
+    def _dir_size(path: str) -> int:
+        total = 0
+        for dirpath, _, filenames in os.walk(path):
+            for filename in filenames:
+                try:
+                    total += os.lstat(os.path.join(dirpath, filename)).st_size
+                except OSError:
+                    continue
+        return total
+
+    def usage(self) -> Dict[str, int]:
+        """Return the disk usage in bytes of each mirror, keyed by cache key."""
+        return {
+            entry[:-4]: self._dir_size(os.path.join(self.root_dir, entry))
+            for entry in os.listdir(self.root_dir)
+            if entry.endswith(".git")
+        }
+
+    def evict(self) -> List[str]:
+        """
+        Remove least recently used mirrors until the cache fits its quota.
+
+        Mirrors in use by a session of any process, or being updated, are skipped.
+
+        Returns:
+            List[str]: Keys of the evicted mirrors.
+        """
+        sizes = self.usage()
+        total = sum(sizes.values())
+        if total <= self.quota_bytes:
+            return []
+
+        def last_used(key: str) -> float:
+            return os.path.getmtime(os.path.join(self.root_dir, f"{key}.git"))
+
+        evicted = []
+        for key in sorted(sizes, key=last_used):
+            if total <= self.quota_bytes:
+                break
+            if self._in_use.get(key):
+                continue
+            with self._lock(key, blocking=False) as acquired:
+                if not acquired:
+                    continue
+                readers = None
+                if fcntl is not None:
+                    readers = self._open_lock(f"{key}.readers", fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    if readers is None:
+                        continue
+                try:
+                    shutil.rmtree(os.path.join(self.root_dir, f"{key}.git"), ignore_errors=True)
+                finally:
+                    if readers is not None:
+                        readers.close()
+            total -= sizes[key]
+            evicted.append(key)
+        return evicted
@@ -0,0 +1,312 @@
+import asyncio
+import heapq
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from git_recap.providers.base_fetcher import BaseFetcher
+from git_recap.providers.mirror_cache import MirrorCache
+from git_recap.providers.query import RecapQuery
+from git_recap.providers.url_fetcher import URLFetcher
+
+
+class MultiURLFetcher(BaseFetcher):
+    """
+    Fetcher over several Git repository URLs, recapped as one activity stream.
+
+    Each URL is handled by its own URLFetcher. The repositories are cloned
+    concurrently by a bounded thread pool (git does the work in subprocesses,
+    so threads are enough), which keeps the setup time of N repositories close
+    to that of the slowest one; `aclone` does the same on the event loop.
+    Queries apply to every repository, and the repositories of a query select
+    the URLs by name. URLs whose repositories share a name (forks, or the same
+    name under several owners) are named by as much of their path as tells
+    them apart, e.g. `owner/name`.
+    """
+
+    def __init__(
+        self,
+        urls: List[str],
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        repo_filter: Optional[List[str]] = None,
+        authors: Optional[List[str]] = None,
+        clone_mode: str = "treeless",
+        mirror_cache: Optional[MirrorCache] = None,
+        max_workers: int = 4,
+        clone: bool = True
+    ):
+        super().__init__(
+            pat="",  # No PAT needed for URL fetcher
+            start_date=start_date,
+            end_date=end_date,
+            repo_filter=repo_filter,
+            authors=authors
+        )
+        urls = list(dict.fromkeys(url.strip() for url in urls if url.strip()))
+        if not urls:
+            raise ValueError("At least one repository URL is required")
+        self.max_workers = max(1, max_workers)
+        self._pending = [
+            URLFetcher(
+                url=url,
+                start_date=self.start_date,
+                end_date=self.end_date,
+                authors=self.authors,
+                clone_mode=clone_mode,
+                mirror_cache=mirror_cache,
+                clone=False
+            )
+            for url in urls
+        ]
+        self.fetchers: Dict[str, URLFetcher] = {}
+        if clone:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(urls)), thread_name_prefix="gitrecap-clone") as pool:
+                futures = [pool.submit(fetcher._clone_repo) for fetcher in self._pending]
+            self._register([future.exception() for future in futures])
+
+    @staticmethod
+    def _path_name(url: str, depth: int) -> str:
+        """Return the last `depth` segments of a URL's path, e.g. `owner/name` for depth 2."""
+        url = url[:-4] if url.endswith(".git") else url
+        parts = [part for part in re.split(r"[/:]", url) if part]
+        return "/".join(parts[-depth:])
+
+    def _disambiguate(self, fetchers: List[URLFetcher]) -> None:
+        """Name repositories that share a name by the shortest path suffix that is unique."""
+        by_name: Dict[str, List[URLFetcher]] = {}
+        for fetcher in fetchers:
+            by_name.setdefault(fetcher.repos_names[0], []).append(fetcher)
+        for same_name in by_name.values():
+            if len(same_name) < 2:
+                continue
+            for depth in range(2, max(len(re.split(r"[/:]", fetcher.url)) for fetcher in same_name) + 1):
+                names = [self._path_name(fetcher.url, depth) for fetcher in same_name]
+                if len(set(names)) == len(names):
+                    break
+            else:
+                # Same path (e.g. with and without ".git"): their URLs are their names
+                names = [fetcher.url for fetcher in same_name]
+            for fetcher, name in zip(same_name, names):
+                fetcher.repo_name = name
+
+    def _register(self, errors: List[Optional[BaseException]]) -> None:
+        """Name the cloned repositories, or release them all if any clone failed."""
+        messages = [f"{fetcher.url}: {error}" for fetcher, error in zip(self._pending, errors) if error is not None]
+        if messages:
+            self.clear()
+            self._pending = []
+            raise RuntimeError(f"Failed to clone repositories: {'; '.join(messages)}")
+        self._disambiguate(self._pending)
+        self.fetchers = {fetcher.repos_names[0]: fetcher for fetcher in self._pending}
+        self._pending = []
+
+    async def aclone(self) -> None:
+        """
+        Clone all repositories concurrently without blocking the event loop.
+
+        For fetchers created with `clone=False`; at most `max_workers`
+        repositories of the session are cloned at a time, and the number of
+        git processes of all sessions is bounded by `async_git.GIT_CONCURRENCY`.
+
+        Raises:
+            RuntimeError: If any clone fails (the other clones are released).
+        """
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def clone(fetcher: URLFetcher) -> None:
+            async with semaphore:
+                await fetcher.aclone()
+
+        try:
+            results = await asyncio.gather(
+                *(clone(fetcher) for fetcher in self._pending),
+                return_exceptions=True
+            )
+        except asyncio.CancelledError:
+            self.clear()
+            raise
+        self._register([result if isinstance(result, BaseException) else None for result in results])
+
+    @property
+    def repos_names(self) -> List[str]:
+        """Return the names of all repositories of the session."""
+        return list(self.fetchers)
+
+    def _selected(self, query: RecapQuery) -> List[URLFetcher]:
+        """Return the repositories selected by the query."""
+        return [fetcher for name, fetcher in self.fetchers.items() if query.selects_repo(name)]
+
+    def _single(self, query: Optional[RecapQuery]) -> URLFetcher:
+        """Return the repository branch operations apply to (the first one selected)."""
+        selected = self._selected(self._query(query))
+        if not selected:
+            raise ValueError("No repository matches the repository filter")
+        return selected[0]
+
+    def iter_commits(self, query: Optional[RecapQuery] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream commits of the selected repositories merged newest first.
+
+        Each repository streams in `git log` (committer date) order, so rebased
+        or cherry-picked commits may be out of (author) timestamp order;
+        `fetch_commits` sorts them exactly.
+
+        Args:
+            query: What to fetch (default: the fetcher's filters, see `make_query`).
+
+        Yields:
+            Dict[str, Any]: Commit entries.
+        """
+        query = self._query(query)
+        return heapq.merge(
+            *(fetcher.iter_commits(query) for fetcher in self._selected(query)),
+            key=lambda entry: entry["timestamp"],
+            reverse=True
+        )
+
+    def fetch_commits(self, query: Optional[RecapQuery] = None) -> List[Dict[str, Any]]:
+        """Fetch commits from all branches of the selected repositories, newest first."""
+        return sorted(self.iter_commits(query), key=lambda entry: entry["timestamp"], reverse=True)
+
+    async def afetch_commits(self, query: Optional[RecapQuery] = None) -> List[Dict[str, Any]]:
+        """Fetch commits of the selected repositories concurrently (newest first), without blocking the event loop."""
+        query = self._query(query)
+        results = await asyncio.gather(*(fetcher.afetch_commits(query) for fetcher in self._selected(query)))
+        entries = [entry for result in results for entry in result]
+        entries.sort(key=lambda entry: entry["timestamp"], reverse=True)
+        return entries
+
+    async def aget_authored_messages(self, query: Optional[RecapQuery] = None) -> List[Dict[str, Any]]:
+        """
+        Async counterpart of `get_authored_messages`.
+
+        Args:
+            query: What to recap (default: the fetcher's filters, see `make_query`).
+
+        Returns:
+            List[Dict[str, Any]]: Commit entries sorted chronologically.
+        """
+        query = self._query(query)
+        entries = await self.afetch_commits(query) if "commit" in query.kinds else []
+        entries.sort(key=lambda x: x["timestamp"])
+        return self.convert_timestamps_to_str(entries)
+
+    def fetch_pull_requests(self, query: Optional[RecapQuery] = None) -> List[Dict[str, Any]]:
+        """Fetch pull requests (not implemented for generic Git URLs)."""
+        return []
+
+    def fetch_issues(self, query: Optional[RecapQuery] = None) -> List[Dict[str, Any]]:
+        """Fetch issues (not implemented for generic Git URLs)."""
+        return []
+
+    def fetch_releases(self, query: Optional[RecapQuery] = None) -> List[Dict[str, Any]]:
+        """
+        Fetch releases for the repositories.
+        Not implemented for generic Git URLs.
+        Raises:
+            NotImplementedError: Always, since release fetching is not supported for URL repositories.
+        """
+        raise NotImplementedError("Release fetching is not supported for generic Git URLs (MultiURLFetcher).")
+
+    def get_branches(self, query: Optional[RecapQuery] = None) -> List[str]:
+        """
+        Get all branches of the selected repositories.
+
+        Args:
+            query: Selects the repositories (default: the fetcher's repo_filter).
+
+        Returns:
+            List[str]: List of branch names.
+        """
+        query = self._query(query)
+        branches = set()
+        for fetcher in self._selected(query):
+            branches.update(fetcher.get_branches(query))
+        return sorted(branches)
+
+    def get_valid_target_branches(self, source_branch: str, query: Optional[RecapQuery] = None) -> List[str]:
+        """
+        Get branches that can receive a pull request from the source branch.
+
+        Args:
+            source_branch (str): The source branch name.
+            query: Selects the repository (default: the fetcher's repo_filter).
+
+        Returns:
+            List[str]: List of valid target branch names.
+
+        Raises:
+            ValueError: If the source branch does not exist.
+        """
+        return self._single(query).get_valid_target_branches(source_branch)
+
+    def fetch_branch_diff_commits(
+        self,
+        source_branch: str,
+        target_branch: str,
+        query: Optional[RecapQuery] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch the commits of source_branch that are not in target_branch.
+
+        Args:
+            source_branch (str): The source branch name.
+            target_branch (str): The target branch name.
+            query: Selects the repository (default: the fetcher's repo_filter).
+
+        Returns:
+            List[Dict[str, Any]]: List of commit entries.
+
+        Raises:
+            ValueError: If either branch does not exist.
+        """
+        return self._single(query).fetch_branch_diff_commits(source_branch, target_branch)
+
+    def create_pull_request(
+        self,
+        head_branch: str,
+        base_branch: str,
+        title: str,
+        body: str,
+        draft: bool = False,
+        reviewers: Optional[List[str]] = None,
+        assignees: Optional[List[str]] = None,
+        labels: Optional[List[str]] = None,
+        query: Optional[RecapQuery] = None
+    ) -> Dict[str, Any]:
+        """
+        Create a pull request between two branches.
+
+        Raises:
+            NotImplementedError: Always, since PR creation is not supported for URL repositories.
+        """
+        raise NotImplementedError("Pull request creation is not supported for generic Git URLs (MultiURLFetcher).")
+
+    def get_authors(self, repo_names: List[str]) -> List[Dict[str, str]]:
+        """
+        Retrieve unique authors of the given repositories (all if empty).
+
+        Args:
+            repo_names: Names of the repositories to scan.
+
+        Returns:
+            List of unique author dictionaries with name and email.
+        """
+        authors = {}
+        for name, fetcher in self.fetchers.items():
+            if repo_names and name not in repo_names:
+                continue
+            for author in fetcher.get_authors([]):
+                authors.setdefault(author["email"].lower() or f"name:{author['name'].lower()}", author)
+        return sorted(authors.values(), key=lambda author: (author["name"], author["email"]))
+
+    def get_current_author(self) -> Optional[Dict[str, str]]:
+        """URL repositories have no authenticated user, so this always returns None."""
+        return None
+
+    def clear(self) -> None:
+        """Clean up the clones (or release the shared mirrors) of all repositories."""
+        for fetcher in [*getattr(self, "fetchers", {}).values(), *getattr(self, "_pending", [])]:
+            fetcher.clear()
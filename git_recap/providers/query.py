@@ -0,0 +1,69 @@
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+from typing import FrozenSet, Iterable, Optional, Tuple
+
+# Kinds of entries a recap can include: commits, pull requests (with their commits) and issues
+ENTRY_KINDS: FrozenSet[str] = frozenset({"commit", "pull_request", "issue"})
+
+
+@dataclass(frozen=True)
+class RecapQuery:
+    """
+    Immutable description of what to recap: a date window, repositories,
+    authors and entry kinds.
+
+    Fetchers take the query as an argument instead of reading filters from
+    mutable attributes, so one fetcher can serve concurrent queries. Queries
+    are normalized (naive dates as UTC, repositories and authors sorted and
+    deduplicated) and hashable, so equal queries compare and cache by value.
+
+    Attributes:
+        start_date: Only entries at or after this date (None: no lower bound).
+        end_date: Only entries at or before this date (None: no upper bound).
+        repos: Repository names to include (empty: all repositories).
+        authors: Authors to include (matched by each provider's author field).
+        kinds: Entry kinds to include, among ENTRY_KINDS.
+    """
+
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+    repos: Tuple[str, ...] = ()
+    authors: Tuple[str, ...] = ()
+    kinds: FrozenSet[str] = ENTRY_KINDS
+
+    def __post_init__(self):
+        for name in ("start_date", "end_date"):
+            value = getattr(self, name)
+            if value is not None and value.tzinfo is None:
+                object.__setattr__(self, name, value.replace(tzinfo=timezone.utc))
+        object.__setattr__(self, "repos", tuple(sorted(set(self.repos))))
+        object.__setattr__(self, "authors", tuple(sorted(set(self.authors))))
+        kinds = frozenset(self.kinds)
+        unknown = kinds - ENTRY_KINDS
+        if unknown:
+            raise ValueError(f"Unknown entry kinds: {', '.join(sorted(unknown))}")
+        object.__setattr__(self, "kinds", kinds)
+
+    def selects_repo(self, name: str) -> bool:
+        """Return whether the repository is part of the query."""
+        return not self.repos or name in self.repos
+
+    def in_window(self, moment: datetime) -> bool:
+        """Return whether a date falls within the query's date window."""
+        if self.start_date and moment < self.start_date:
+            return False
+        if self.end_date and moment > self.end_date:
+            return False
+        return True
+
+    def before_window(self, moment: datetime) -> bool:
+        """Return whether a date precedes the window (newest-first listings can stop there)."""
+        return bool(self.start_date and moment < self.start_date)
+
+    def with_repos(self, repos: Iterable[str]) -> "RecapQuery":
+        """Return a copy of the query restricted to the given repositories."""
+        return replace(self, repos=tuple(repos))
+
+    def with_dates(self, start_date: Optional[datetime], end_date: Optional[datetime]) -> "RecapQuery":
+        """Return a copy of the query over another date window."""
+        return replace(self, start_date=start_date, end_date=end_date)
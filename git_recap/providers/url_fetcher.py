@@ -1,16 +1,54 @@
+import asyncio
+import logging
 import os
 import re
 import shutil
 import subprocess
 from pathlib import Path
 import tempfile
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+from typing import List, Dict, Any, AsyncIterator, Iterator, Optional, Tuple
+from datetime import datetime, timedelta
+from git_recap.providers.async_git import aiter_git_log, run_git
 from git_recap.providers.base_fetcher import BaseFetcher
+from git_recap.providers.query import RecapQuery
+from git_recap.providers.git_log import (
+    BRANCHES_AND_TAGS,
+    author_index,
+    compare_refs,
+    iter_git_log,
+    list_branch_refs,
+    ref_state,
+    refs_containing,
+)
+from git_recap.providers.mirror_cache import MirrorCache
+
+logger = logging.getLogger(__name__)
+
+# Extra `git clone` arguments per clone mode. Recaps only read commit metadata,
+# so the partial clone modes skip blobs (and trees) that `git log` never needs.
+CLONE_MODES = {
+    "full": [],
+    "blobless": ["--filter=blob:none"],
+    "treeless": ["--filter=tree:0"],
+}
+
+# Shallow clones reach this far before start_date, so commits whose committer
+# date is slightly off from their author date are not cut out.
+SHALLOW_SINCE_MARGIN = timedelta(days=2)
+
+# Seconds before a clone or a deepening fetch is aborted
+CLONE_TIMEOUT = 300
 
 
 class URLFetcher(BaseFetcher):
-    """Fetcher implementation for generic Git repository URLs."""
+    """
+    Fetcher implementation for generic Git repository URLs.
+
+    By default the repository is cloned without blobs and trees (`clone_mode`
+    "treeless"), and, when `start_date` is set, only with the history since
+    that date. The clone is deepened on demand if a later query needs older
+    history.
+    """
 
     GIT_URL_PATTERN = re.compile(
         r'^(?:http|https|git|ssh)://'  # Protocol
@@ -25,8 +63,13 @@ class URLFetcher(BaseFetcher):
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
         repo_filter: Optional[List[str]] = None,
-        authors: Optional[List[str]] = None
+        authors: Optional[List[str]] = None,
+        clone_mode: str = "treeless",
+        mirror_cache: Optional[MirrorCache] = None,
+        clone: bool = True
     ):
+        if clone_mode not in CLONE_MODES:
+            raise ValueError(f"Invalid clone mode: {clone_mode}. Expected one of {sorted(CLONE_MODES)}")
         super().__init__(
             pat="",  # No PAT needed for URL fetcher
             start_date=start_date,
@@ -35,9 +78,15 @@ class URLFetcher(BaseFetcher):
             authors=authors
         )
         self.url = self._normalize_url(url)
+        self.clone_mode = clone_mode
+        self.mirror_cache = mirror_cache
+        self.shallow_since = None
         self.temp_dir = None
         self.repo_path = None
-        self._clone_repo()
+        # Overrides the name derived from the URL (set by MultiURLFetcher when names clash)
+        self.repo_name: Optional[str] = None
+        if clone:
+            self._clone_repo()
 
     def _normalize_url(self, url: str) -> str:
         """Normalize the Git URL to ensure consistent format."""
@@ -68,29 +117,50 @@ class URLFetcher(BaseFetcher):
         except subprocess.CalledProcessError as e:
             raise ValueError(f"Invalid Git repository URL: {self.url}. Error: {e.stderr}") from e
 
+    def _clone_command(self, extra_args: List[str]) -> List[str]:
+        return ["git", "clone", "--no-checkout", *CLONE_MODES[self.clone_mode], *extra_args, self.url, self.temp_dir]
+
+    def _git_clone(self, extra_args: List[str]) -> None:
+        """Clone the repository into the temporary directory with extra clone arguments."""
+        subprocess.run(
+            self._clone_command(extra_args),
+            check=True,
+            capture_output=True,
+            text=True,
+            timeout=CLONE_TIMEOUT
+        )
+
+    def _shallow_clone_args(self) -> List[str]:
+        # Shallow clones imply --single-branch, recaps need every branch
+        return [f"--shallow-since={self.shallow_since.isoformat()}", "--no-single-branch"]
+
+    def _reset_temp_dir(self) -> None:
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        os.makedirs(self.temp_dir, exist_ok=True)
+
     def _clone_repo(self) -> None:
-        """Clone the repository to a temporary directory with all branches."""
+        """Clone the repository metadata to a temporary directory with all branches."""
+        if self.mirror_cache is not None:
+            self.repo_path = self.mirror_cache.acquire(self.url, CLONE_MODES[self.clone_mode])
+            return
+
         self.temp_dir = tempfile.mkdtemp(prefix="gitrecap_")
         self.repo_path = self.temp_dir
         try:
-            subprocess.run(
-                ["git", "clone", "--no-checkout", self.url, self.temp_dir],
-                check=True,
-                capture_output=True,
-                text=True,
-                timeout=300
-            )
-
-            subprocess.run(
-                ["git", "-C", self.temp_dir, "fetch", "--all"],
-                check=True,
-                capture_output=True,
-                text=True,
-                timeout=300
-            )
+            if self.start_date:
+                self.shallow_since = self.start_date - SHALLOW_SINCE_MARGIN
+                try:
+                    self._git_clone(self._shallow_clone_args())
+                except subprocess.CalledProcessError:
+                    # Git refuses shallow clones that would contain no commits
+                    self._reset_temp_dir()
+                    self.shallow_since = None
+                    self._git_clone([])
+            else:
+                self._git_clone([])
 
             verify_result = subprocess.run(
-                ["git", "-C", self.temp_dir, "rev-list", "--count", "--all"],
+                ["git", "-C", self.repo_path, "rev-list", "--count", "--all"],
                 capture_output=True,
                 text=True,
                 check=True
@@ -106,11 +176,105 @@ class URLFetcher(BaseFetcher):
             self.clear()
             raise RuntimeError(f"Unexpected error during cloning: {str(e)}") from e
 
+    async def aclone(self) -> None:
+        """
+        Clone the repository without blocking the event loop.
+
+        Async counterpart of the clone done by the constructor, for fetchers
+        created with `clone=False`. Cancelling the awaiting task kills git and
+        removes the partial clone.
+
+        Raises:
+            RuntimeError: If cloning fails or times out.
+        """
+        if self.mirror_cache is not None:
+            self.repo_path = await self.mirror_cache.aacquire(self.url, CLONE_MODES[self.clone_mode])
+            return
+
+        self.temp_dir = tempfile.mkdtemp(prefix="gitrecap_")
+        self.repo_path = self.temp_dir
+        try:
+            if self.start_date:
+                self.shallow_since = self.start_date - SHALLOW_SINCE_MARGIN
+                try:
+                    await run_git(self._clone_command(self._shallow_clone_args()), timeout=CLONE_TIMEOUT)
+                except subprocess.CalledProcessError:
+                    self._reset_temp_dir()
+                    self.shallow_since = None
+                    await run_git(self._clone_command([]), timeout=CLONE_TIMEOUT)
+            else:
+                await run_git(self._clone_command([]), timeout=CLONE_TIMEOUT)
+
+            count = await run_git(["git", "-C", self.repo_path, "rev-list", "--count", "--all"])
+            if int(count.strip()) == 0:
+                raise ValueError("Cloned repository has no commits")
+        except BaseException as e:
+            self.clear()
+            if isinstance(e, subprocess.TimeoutExpired):
+                raise RuntimeError("Repository cloning timed out")
+            if isinstance(e, subprocess.CalledProcessError):
+                raise RuntimeError(f"Failed to clone repository: {e.stderr}") from e
+            if isinstance(e, Exception):
+                raise RuntimeError(f"Unexpected error during cloning: {str(e)}") from e
+            raise
+
+    def _deepen_args(self, since: Optional[datetime]) -> Optional[Tuple[Optional[datetime], List[str]]]:
+        """Return (new shallow_since, fetch arguments) to cover since, or None if already covered."""
+        if self.shallow_since is None or not self.repo_path:
+            return None
+        if since is not None and since >= self.shallow_since:
+            return None
+        if since is None:
+            return None, ["--unshallow"]
+        shallow_since = since - SHALLOW_SINCE_MARGIN
+        return shallow_since, [f"--shallow-since={shallow_since.isoformat()}"]
+
+    def _ensure_history(self, since: Optional[datetime]) -> None:
+        """
+        Deepen a shallow clone so it contains the history since the given date.
+
+        Args:
+            since: Oldest date that must be covered, or None for the full history.
+        """
+        deepen = self._deepen_args(since)
+        if deepen is None:
+            return
+        shallow_since, deepen_args = deepen
+        try:
+            subprocess.run(
+                ["git", "-C", self.repo_path, "fetch", *deepen_args, "origin"],
+                check=True,
+                capture_output=True,
+                text=True,
+                timeout=CLONE_TIMEOUT
+            )
+        except subprocess.TimeoutExpired:
+            raise RuntimeError("Deepening the repository history timed out")
+        except subprocess.CalledProcessError as e:
+            raise RuntimeError(f"Failed to deepen repository history: {e.stderr}") from e
+        self.shallow_since = shallow_since
+
+    async def _aensure_history(self, since: Optional[datetime]) -> None:
+        """Async counterpart of `_ensure_history`."""
+        deepen = self._deepen_args(since)
+        if deepen is None:
+            return
+        shallow_since, deepen_args = deepen
+        try:
+            await run_git(["git", "-C", self.repo_path, "fetch", *deepen_args, "origin"], timeout=CLONE_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            raise RuntimeError("Deepening the repository history timed out")
+        except subprocess.CalledProcessError as e:
+            raise RuntimeError(f"Failed to deepen repository history: {e.stderr}") from e
+        self.shallow_since = shallow_since
+
     @property
     def repos_names(self) -> List[str]:
         """Return list of repository names (single item for URL fetcher)."""
-        if not self.temp_dir:
+        if not self.repo_path:
             return []
+        if self.repo_name:
+            return [self.repo_name]
 
         match = self.GIT_URL_PATTERN.match(self.url)
         if not match:
@@ -123,103 +287,114 @@ class URLFetcher(BaseFetcher):
 
         return [repo_name]
 
-    def _get_all_branches(self) -> List[str]:
-        """Get list of all remote branches in the repository."""
-        if not self.temp_dir:
-            return []
+    def _branch_refs(self) -> Dict[str, str]:
+        """Map branch names to their full refs (remote-tracking refs win in regular clones)."""
+        if not self.repo_path:
+            return {}
+        return list_branch_refs(self.repo_path)
 
-        try:
-            result = subprocess.run(
-                ["git", "-C", self.temp_dir, "branch", "-r", "--format=%(refname:short)"],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            branches = [b.strip() for b in result.stdout.splitlines() if b.strip()]
-            return [b for b in branches if not b.endswith('/HEAD')]
-        except subprocess.CalledProcessError:
-            return []
+    def _branch_ref(self, branch: str, branches: Optional[Dict[str, str]] = None) -> str:
+        ref = (branches if branches is not None else self._branch_refs()).get(branch)
+        if ref is None:
+            raise ValueError(f"Branch '{branch}' does not exist")
+        return ref
 
-    def _run_git_log(self, extra_args: List[str] = None) -> List[Dict[str, Any]]:
+    @property
+    def _revisions(self) -> Tuple[str, ...]:
+        """Revisions holding the repository's history (mirrors may also hold other refs)."""
+        return BRANCHES_AND_TAGS if self.mirror_cache is not None else ("--all",)
+
+    def _iter_git_log(self, query: RecapQuery, extra_args: List[str] = None) -> Iterator[Dict[str, Any]]:
+        """Stream commit entries of all branches matching the query."""
+        if not self.repo_path:
+            return
+        self._ensure_history(query.start_date)
+        yield from iter_git_log(
+            self.repo_path,
+            self.repos_names[0],
+            revisions=self._revisions,
+            start_date=query.start_date,
+            end_date=query.end_date,
+            authors=list(query.authors),
+            extra_args=extra_args
+        )
+
+    def _run_git_log(self, query: RecapQuery, extra_args: List[str] = None) -> List[Dict[str, Any]]:
         """Run git log command with common arguments and parse output."""
-        if not self.temp_dir:
-            return []
+        return list(self._iter_git_log(query, extra_args))
 
-        args = [
-            "git",
-            "-C", self.temp_dir,
-            "log",
-            "--pretty=format:%H|%an|%ad|%s",
-            "--date=iso",
-            "--all"
-        ]
+    def iter_commits(self, query: Optional[RecapQuery] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream commits from all branches in the cloned repository.
 
-        if self.start_date:
-            args.extend(["--since", self.start_date.isoformat()])
-        if self.end_date:
-            args.extend(["--until", self.end_date.isoformat()])
-        if self.authors:
-            authors_filter = "|".join(self.authors)
-            args.extend(["--author", authors_filter])
-        if extra_args:
-            args.extend(extra_args)
+        Entries are parsed as `git log` produces them, so memory does not grow
+        with the size of the history.
 
-        try:
-            result = subprocess.run(
-                args,
-                capture_output=True,
-                text=True,
-                check=True,
-                timeout=120
-            )
-            return self._parse_git_log(result.stdout)
-        except subprocess.TimeoutExpired:
-            return []
-        except subprocess.CalledProcessError:
-            return []
+        Args:
+            query: Date window and authors (default: the fetcher's filters).
 
-    def _parse_git_log(self, log_output: str) -> List[Dict[str, Any]]:
-        """Parse git log output into structured data."""
-        entries = []
-        for line in log_output.splitlines():
-            if not line.strip():
-                continue
+        Yields:
+            Dict[str, Any]: Commit entries, newest first.
+        """
+        return self._iter_git_log(self._query(query))
 
-            try:
-                sha, author, date_str, message = line.split("|", 3)
-                timestamp = datetime.fromisoformat(date_str)
-
-                if self.start_date and timestamp < self.start_date:
-                    continue
-                if self.end_date and timestamp > self.end_date:
-                    continue
-
-                entries.append({
-                    "type": "commit",
-                    "repo": self.repos_names[0],
-                    "message": message,
-                    "sha": sha,
-                    "author": author,
-                    "timestamp": timestamp
-                })
-            except ValueError:
-                continue
-
-        return entries
-
-    def fetch_commits(self) -> List[Dict[str, Any]]:
+    def fetch_commits(self, query: Optional[RecapQuery] = None) -> List[Dict[str, Any]]:
         """Fetch commits from all branches in the cloned repository."""
-        return self._run_git_log()
+        return self._run_git_log(self._query(query))
+
+    async def aiter_commits(self, query: Optional[RecapQuery] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream commits from all branches without blocking the event loop.
+
+        Args:
+            query: Date window and authors (default: the fetcher's filters).
+
+        Yields:
+            Dict[str, Any]: Commit entries, newest first.
+        """
+        if not self.repo_path:
+            return
+        query = self._query(query)
+        await self._aensure_history(query.start_date)
+        async for entry in aiter_git_log(
+            self.repo_path,
+            self.repos_names[0],
+            revisions=self._revisions,
+            start_date=query.start_date,
+            end_date=query.end_date,
+            authors=list(query.authors)
+        ):
+            yield entry
+
+    async def afetch_commits(self, query: Optional[RecapQuery] = None) -> List[Dict[str, Any]]:
+        """Fetch commits from all branches without blocking the event loop."""
+        return [entry async for entry in self.aiter_commits(query)]
+
+    async def aget_authored_messages(self, query: Optional[RecapQuery] = None) -> List[Dict[str, Any]]:
+        """
+        Async counterpart of `get_authored_messages` (commits are the only
+        entries of generic Git URLs).
 
-    def fetch_pull_requests(self) -> List[Dict[str, Any]]:
+        Args:
+            query: What to recap (default: the fetcher's filters, see `make_query`).
+
+        Returns:
+            List[Dict[str, Any]]: Commit entries sorted chronologically.
+        """
+        query = self._query(query)
+        entries = await self.afetch_commits(query) if "commit" in query.kinds else []
+        entries.sort(key=lambda x: x["timestamp"])
+        return self.convert_timestamps_to_str(entries)
+
+    def fetch_pull_requests(self, query: Optional[RecapQuery] = None) -> List[Dict[str, Any]]:
         """Fetch pull requests (not implemented for generic Git URLs)."""
         return []
 
-    def fetch_issues(self) -> List[Dict[str, Any]]:
+    def fetch_issues(self, query: Optional[RecapQuery] = None) -> List[Dict[str, Any]]:
         """Fetch issues (not implemented for generic Git URLs)."""
         return []
 
-    def fetch_releases(self) -> List[Dict[str, Any]]:
+    def fetch_releases(self, query: Optional[RecapQuery] = None) -> List[Dict[str, Any]]:
         """
         Fetch releases for the repository.
         Not implemented for generic Git URLs.
@@ -228,32 +403,90 @@ class URLFetcher(BaseFetcher):
         """
         raise NotImplementedError("Release fetching is not supported for generic Git URLs (URLFetcher).")
 
-    def get_branches(self) -> List[str]:
+    def get_branches(self, query: Optional[RecapQuery] = None) -> List[str]:
         """
-        Get all branches in the repository.
-        
+        Get all branches in the repository from the local refs.
+
+        Args:
+            query: Selects the repository (default: the fetcher's repo_filter).
+
         Returns:
             List[str]: List of branch names.
-        
-        Raises:
-            NotImplementedError: Always, since branch listing is not yet implemented for URLFetcher.
         """
-        raise NotImplementedError("Branch listing is not yet implemented for generic Git URLs (URLFetcher).")
+        if self.repos_names and not self._query(query).selects_repo(self.repos_names[0]):
+            return []
+        return sorted(self._branch_refs())
 
-    def get_valid_target_branches(self, source_branch: str) -> List[str]:
+    def get_valid_target_branches(self, source_branch: str, query: Optional[RecapQuery] = None) -> List[str]:
         """
         Get branches that can receive a pull request from the source branch.
-        
+
+        A branch is a valid target if it is not the source branch and the source
+        branch has commits that are not in it.
+
         Args:
             source_branch (str): The source branch name.
-        
+            query: Not used for URL fetcher (single repo only).
+
         Returns:
             List[str]: List of valid target branch names.
-        
+
+        Raises:
+            ValueError: If the source branch does not exist.
+        """
+        branches = self._branch_refs()
+        self._branch_ref(source_branch, branches)
+        self._ensure_history(None)
+        containing = set(refs_containing(self.repo_path, branches[source_branch]))
+        return [
+            branch for branch in sorted(branches)
+            if branch != source_branch and branches[branch] not in containing
+        ]
+
+    def compare_branches(self, source_branch: str, target_branch: str) -> Dict[str, Any]:
+        """
+        Compare two branches in a single walk of their symmetric difference.
+
+        Args:
+            source_branch (str): The source branch name.
+            target_branch (str): The target branch name.
+
+        Returns:
+            Dict with the number of commits the source is "ahead" of and "behind"
+            the target, and the "commits" entries of source not in target
+            (newest first).
+
         Raises:
-            NotImplementedError: Always, since PR target validation is not supported for URLFetcher.
+            ValueError: If either branch does not exist.
         """
-        raise NotImplementedError("Pull request target branch validation is not supported for generic Git URLs (URLFetcher).")
+        branches = self._branch_refs()
+        source_ref = self._branch_ref(source_branch, branches)
+        target_ref = self._branch_ref(target_branch, branches)
+        # The merge base may be older than a shallow clone's boundary
+        self._ensure_history(None)
+        return compare_refs(self.repo_path, self.repos_names[0], source_ref, target_ref)
+
+    def fetch_branch_diff_commits(
+        self,
+        source_branch: str,
+        target_branch: str,
+        query: Optional[RecapQuery] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch the commits of source_branch that are not in target_branch (`target..source`).
+
+        Args:
+            source_branch (str): The source branch name.
+            target_branch (str): The target branch name.
+            query: Not used for URL fetcher (single repo only).
+
+        Returns:
+            List[Dict[str, Any]]: List of commit entries.
+
+        Raises:
+            ValueError: If either branch does not exist.
+        """
+        return self.compare_branches(source_branch, target_branch)["commits"]
 
     def create_pull_request(
         self,
@@ -264,7 +497,8 @@ class URLFetcher(BaseFetcher):
         draft: bool = False,
         reviewers: Optional[List[str]] = None,
         assignees: Optional[List[str]] = None,
-        labels: Optional[List[str]] = None
+        labels: Optional[List[str]] = None,
+        query: Optional[RecapQuery] = None
     ) -> Dict[str, Any]:
         """
         Create a pull request between two branches.
@@ -278,6 +512,7 @@ class URLFetcher(BaseFetcher):
             reviewers: List of reviewer usernames (optional).
             assignees: List of assignee usernames (optional).
             labels: List of label names (optional).
+            query: Not used for URL fetcher (single repo only).
         
         Returns:
             Dict[str, Any]: Dictionary containing PR metadata or error information.
@@ -289,70 +524,34 @@ class URLFetcher(BaseFetcher):
 
     def get_authors(self, repo_names: List[str]) -> List[Dict[str, str]]:
         """
-        Retrieve unique authors from cloned repository using git log.
-        
+        Retrieve unique authors and committers of the cloned repository.
+
+        Identities are read in one pass over the history, mapped through the
+        repository's .mailmap and deduplicated by email. The result is cached
+        until the refs of the repository move.
+
         Args:
             repo_names: Not used for URL fetcher (single repo only).
-        
+
         Returns:
             List of unique author dictionaries with name and email.
         """
-        authors_set = set()
-        
+        if not self.repo_path or not os.path.exists(self.repo_path):
+            logger.warning("Repository not cloned yet")
+            return []
         try:
-            if not hasattr(self, 'repo_path') or not os.path.exists(self.repo_path):
-                print("Repository not cloned yet")
-                return []
-            
-            cmd = [
-                'git', '-C', self.repo_path, 'log',
-                '--all',
-                '--format=%an|%ae'
-            ]
-            
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                check=True
+            self._ensure_history(self.start_date)
+            # Clones have no working tree, so the mailmap is read from HEAD
+            identities = author_index(
+                self.repo_path,
+                ref_state(self.repo_path),
+                ("mailmap.blob=HEAD:.mailmap",),
+                self._revisions
             )
-            
-            for line in result.stdout.strip().split('\n'):
-                if '|' in line:
-                    name, email = line.split('|', 1)
-                    authors_set.add((name.strip(), email.strip()))
-            
-            cmd_committer = [
-                'git', '-C', self.repo_path, 'log',
-                '--all',
-                '--format=%cn|%ce'
-            ]
-            
-            result_committer = subprocess.run(
-                cmd_committer,
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            
-            for line in result_committer.stdout.strip().split('\n'):
-                if '|' in line:
-                    name, email = line.split('|', 1)
-                    authors_set.add((name.strip(), email.strip()))
-            
-            authors_list = [
-                {"name": name, "email": email}
-                for name, email in sorted(authors_set)
-            ]
-            
-            return authors_list
-        
-        except subprocess.CalledProcessError as e:
-            print(f"Git command failed: {e}")
-            return []
-        except Exception as e:
-            print(f"Error in get_authors: {e}")
+        except (subprocess.CalledProcessError, RuntimeError) as e:
+            logger.error(f"Failed to list authors of {self.url}: {e}")
             return []
+        return [{"name": name, "email": email} for name, email in identities]
 
     def get_current_author(self) -> Optional[Dict[str, str]]:
         """
@@ -367,7 +566,10 @@ class URLFetcher(BaseFetcher):
         return None
 
     def clear(self) -> None:
-        """Clean up temporary directory."""
+        """Clean up temporary directory (or release the shared mirror)."""
+        if self.mirror_cache is not None and self.repo_path:
+            self.mirror_cache.release(self.url)
+            self.repo_path = None
         if self.temp_dir and os.path.exists(self.temp_dir):
             try:
                 shutil.rmtree(self.temp_dir, ignore_errors=True)
@@ -375,4 +577,4 @@ class URLFetcher(BaseFetcher):
                 pass
             finally:
                 self.temp_dir = None
-                self.repo_path = None
\ No newline at end of file
+                self.repo_path = None
@@ -0,0 +1,146 @@
+import asyncio
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+import main
+from git_recap.providers.base_fetcher import BaseFetcher
+from services.fetcher_service import fetchers
+from services.llm_service import llm_sessions
+from services.recap_service import (
+    BOOTSTRAP_SECTIONS,
+    DEFAULT_BOOTSTRAP_SECTIONS,
+    aiter_bootstrap,
+    bootstrap,
+    default_query,
+    default_sections,
+)
+
+
+class FakeFetcher(BaseFetcher):
+    """Fetcher serving canned data, with an optionally slow async actions call."""
+
+    def __init__(self, actions_delay=0.0):
+        super().__init__(pat="token")
+        self.actions_delay = actions_delay
+        self.actions_cancelled = False
+        self.calls = []
+
+    @property
+    def repos_names(self):
+        self.calls.append("repos")
+        return ["api", "web"]
+
+    def fetch_commits(self, query=None):
+        return []
+
+    def fetch_pull_requests(self, query=None):
+        return []
+
+    def fetch_issues(self, query=None):
+        return []
+
+    def fetch_releases(self, query=None):
+        return []
+
+    def get_branches(self, query=None):
+        return []
+
+    def get_valid_target_branches(self, source_branch, query=None):
+        return []
+
+    def create_pull_request(self, *args, **kwargs):
+        raise NotImplementedError
+
+    def get_authors(self, repo_names):
+        self.calls.append("authors")
+        return [{"name": "Alice", "email": "alice@example.com"}]
+
+    def get_current_author(self):
+        self.calls.append("current_author")
+        return {"name": "Alice", "email": "alice@example.com"}
+
+    async def aget_authored_messages(self, query=None):
+        self.calls.append("actions")
+        try:
+            await asyncio.sleep(self.actions_delay)
+        except asyncio.CancelledError:
+            self.actions_cancelled = True
+            raise
+        now = datetime.now(timezone.utc) - timedelta(days=1)
+        return [{"type": "commit", "repo": "api", "message": "feat: one", "timestamp": now, "sha": "1"}]
+
+
+def _session(fetcher):
+    session_id = str(uuid.uuid4())
+    fetchers.set(session_id, fetcher)
+    llm_sessions.set(session_id, SimpleNamespace(tokenizer=str.split, config=SimpleNamespace(model="fake")))
+    return session_id
+
+
+def test_default_sections_include_authors_only_with_a_repo_filter():
+    fetcher = FakeFetcher()
+    assert "authors" not in DEFAULT_BOOTSTRAP_SECTIONS
+    assert default_sections(default_query(fetcher)) == DEFAULT_BOOTSTRAP_SECTIONS
+    assert default_sections(default_query(fetcher, repos=["api"])) == BOOTSTRAP_SECTIONS
+
+
+def test_bootstrap_collects_every_section():
+    fetcher = FakeFetcher()
+    session_id = _session(fetcher)
+    result = asyncio.run(bootstrap(session_id, fetcher, default_query(fetcher, repos=["api"])))
+    assert result["errors"] == {}
+    assert result["repos"] == ["api", "web"]
+    assert result["current_author"] == {"author": {"name": "Alice", "email": "alice@example.com"}}
+    assert result["authors"]["total_count"] == 1 and result["authors"]["repo_count"] == 1
+    assert "feat: one" in result["actions"]["actions"]
+
+
+def test_failed_sections_are_reported():
+    fetcher = FakeFetcher()
+    session_id = _session(fetcher)
+    llm_sessions.pop(session_id)
+    result = asyncio.run(bootstrap(session_id, fetcher, default_query(fetcher), ["repos", "actions"]))
+    assert result["repos"] == ["api", "web"]
+    assert result["errors"] == {"actions": "Session not found"}
+
+
+def test_remaining_sections_are_cancelled_when_the_stream_stops():
+    fetcher = FakeFetcher(actions_delay=10)
+    session_id = _session(fetcher)
+
+    async def run():
+        stream = aiter_bootstrap(session_id, fetcher, default_query(fetcher), ["repos", "actions"])
+        first = await stream.__anext__()
+        await stream.aclose()
+        for _ in range(10):
+            await asyncio.sleep(0)
+        # Checked before asyncio.run cancels whatever is left
+        return first, fetcher.actions_cancelled
+
+    first, cancelled = asyncio.run(run())
+    assert first["section"] == "repos"
+    assert "actions" in fetcher.calls
+    assert cancelled
+
+
+def test_bootstrap_route_streams_ndjson():
+    fetcher = FakeFetcher()
+    session_id = _session(fetcher)
+    with TestClient(main.app) as client:
+        response = client.get("/bootstrap", params={"session_id": session_id, "stream": "true"})
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        items = [json.loads(line) for line in response.text.splitlines()]
+        assert sorted(item["section"] for item in items) == sorted(DEFAULT_BOOTSTRAP_SECTIONS)
+        assert all("data" in item for item in items)
+        assert "authors" not in fetcher.calls
+
+        response = client.get("/bootstrap", params={"session_id": session_id, "stream": "true", "repo_filter": "api"})
+        sections = [json.loads(line)["section"] for line in response.text.splitlines()]
+        assert sorted(sections) == sorted(BOOTSTRAP_SECTIONS)
+
+        response = client.get("/bootstrap", params={"session_id": session_id, "sections": "repos,unknown"})
+        assert response.status_code == 400
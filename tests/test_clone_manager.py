@@ -0,0 +1,158 @@
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from services.clone_manager import CLONE_DIR_PREFIX, CloneManager
+
+
+def _clone(root, name, size=0, age=0):
+    path = root / f"{CLONE_DIR_PREFIX}{name}"
+    path.mkdir()
+    (path / "pack").write_bytes(b"x" * size)
+    if age:
+        then = time.time() - age
+        os.utime(path, (then, then))
+    return path
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return CloneManager(
+        quota_bytes=1000,
+        clone_estimate_bytes=300,
+        max_wait_seconds=0.3,
+        temp_root=str(tmp_path),
+        usage_ttl_seconds=60,
+        poll_seconds=0.05
+    )
+
+
+def test_usage_counts_clones_and_mirrors(tmp_path, manager):
+    _clone(tmp_path, "a", 100)
+    (tmp_path / "other").mkdir()
+    (tmp_path / "other" / "f").write_bytes(b"x" * 1000)
+    mirrors = tmp_path / "mirrors"
+    mirrors.mkdir()
+    (mirrors / "m").write_bytes(b"x" * 50)
+    manager.extra_dirs = [str(mirrors)]
+    assert asyncio.run(manager.ausage()) == 150
+
+
+def test_usage_is_measured_off_the_event_loop(tmp_path, manager):
+    _clone(tmp_path, "a", 100)
+    threads = []
+    measure = manager.measure
+    manager.measure = lambda: threads.append(threading.current_thread()) or measure()
+
+    async def run():
+        return await asyncio.gather(manager.ausage(), manager.ausage(), manager.astats())
+
+    usage, cached, stats = asyncio.run(run())
+    assert usage == cached == stats["usage_bytes"] == 100
+    # One walk for the concurrent callers, in the git executor thread pool
+    assert len(threads) == 1 and threads[0] is not threading.main_thread()
+
+    _clone(tmp_path, "b", 100)
+    assert asyncio.run(manager.ausage()) == 100
+    manager.invalidate()
+    assert asyncio.run(manager.ausage()) == 200
+
+
+def test_admit_reserves_and_releases(manager):
+    async def run():
+        async with manager.admit(2):
+            inside = manager.reserved_bytes
+        return inside
+
+    assert asyncio.run(run()) == 600
+    assert manager.reserved_bytes == 0
+
+
+def test_admit_reservation_is_capped_to_the_quota(manager):
+    async def run():
+        async with manager.admit(10):
+            return manager.reserved_bytes
+
+    assert asyncio.run(run()) == 1000
+
+
+def test_admit_waits_for_budget(manager):
+    order = []
+
+    async def clone(name, hold):
+        async with manager.admit(2):
+            order.append(name)
+            await asyncio.sleep(hold)
+
+    async def run():
+        first = asyncio.create_task(clone("first", 0.1))
+        await asyncio.sleep(0)
+        await clone("second", 0)
+        await first
+
+    asyncio.run(run())
+    assert order == ["first", "second"]
+    assert manager.reserved_bytes == 0 and manager.rejected == 0
+
+
+def test_admit_rejects_with_503_after_waiting(tmp_path, manager):
+    _clone(tmp_path, "a", 800)
+
+    async def run():
+        async with manager.admit():
+            pass
+
+    started = time.monotonic()
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(run())
+    assert error.value.status_code == 503
+    assert error.value.headers["Retry-After"]
+    assert time.monotonic() - started >= manager.max_wait_seconds
+    assert manager.rejected == 1 and manager.reserved_bytes == 0
+
+
+def test_admit_rechecks_usage_while_waiting(tmp_path, manager):
+    clone = _clone(tmp_path, "a", 800)
+
+    async def run():
+        async def expire():
+            await asyncio.sleep(0.1)
+            (clone / "pack").unlink()
+        remover = asyncio.create_task(expire())
+        async with manager.admit():
+            reserved = manager.reserved_bytes
+        await remover
+        return reserved
+
+    assert asyncio.run(run()) == 300
+    assert manager.rejected == 0
+
+
+def test_release_after_failure(manager):
+    async def run():
+        async with manager.admit():
+            raise ValueError("clone failed")
+
+    with pytest.raises(ValueError):
+        asyncio.run(run())
+    assert manager.reserved_bytes == 0
+
+
+def test_sweep_orphans(tmp_path, manager):
+    live = _clone(tmp_path, "live", age=3600)
+    orphan = _clone(tmp_path, "orphan", age=3600)
+    recent = _clone(tmp_path, "recent")
+    unrelated = tmp_path / "unrelated"
+    unrelated.mkdir()
+
+    removed = manager.sweep_orphans([str(live)], min_age_seconds=600)
+    assert removed == [str(orphan)]
+    assert live.exists() and recent.exists() and unrelated.exists()
+    assert not orphan.exists()
+
+    # Without the age guard, clones of other workers are removed too
+    assert manager.sweep_orphans([str(live)], min_age_seconds=0) == [str(recent)]
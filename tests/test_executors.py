@@ -0,0 +1,109 @@
+import asyncio
+import contextvars
+import threading
+import time
+
+import pytest
+
+from fastapi.testclient import TestClient
+
+import main
+from services.executors import LoopLagMonitor, MonitoredExecutor, executor_stats, git_executor
+
+
+def test_run_returns_results_and_errors():
+    executor = MonitoredExecutor("test", 2)
+    assert asyncio.run(executor.run(lambda a, b=0: a + b, 1, b=2)) == 3
+    with pytest.raises(ZeroDivisionError):
+        asyncio.run(executor.run(lambda: 1 / 0))
+    stats = executor.stats()
+    assert (stats["running"], stats["queued"], stats["completed"]) == (0, 0, 2)
+
+
+def test_running_queued_and_wait_statistics():
+    executor = MonitoredExecutor("test", 2)
+    release = threading.Event()
+    snapshots = []
+
+    async def run():
+        calls = [asyncio.create_task(executor.run(release.wait)) for _ in range(3)]
+        while executor.stats()["running"] < 2:
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.05)
+        snapshots.append(executor.stats())
+        release.set()
+        await asyncio.gather(*calls)
+
+    asyncio.run(run())
+    during = snapshots[0]
+    assert (during["running"], during["queued"], during["saturation"]) == (2, 1, 1.0)
+    after = executor.stats()
+    assert (after["running"], after["queued"], after["saturation"], after["completed"]) == (0, 0, 0.0, 3)
+    # The third call waited for a thread at least as long as the first two ran
+    assert after["max_wait_ms"] >= 50
+    assert 0 < after["avg_wait_ms"] < after["max_wait_ms"]
+
+
+def test_cancelled_queued_calls_leave_the_queue():
+    executor = MonitoredExecutor("test", 1)
+    release = threading.Event()
+
+    async def run():
+        running = asyncio.create_task(executor.run(release.wait))
+        queued = asyncio.create_task(executor.run(time.sleep, 0))
+        while executor.stats()["queued"] < 1 or executor.stats()["running"] < 1:
+            await asyncio.sleep(0.01)
+        queued.cancel()
+        await asyncio.gather(queued, return_exceptions=True)
+        stats = executor.stats()
+        release.set()
+        await running
+        return stats
+
+    stats = asyncio.run(run())
+    assert (stats["running"], stats["queued"]) == (1, 0)
+    assert executor.stats()["queued"] == 0
+
+
+def test_context_variables_are_propagated():
+    var = contextvars.ContextVar("var", default="unset")
+    executor = MonitoredExecutor("test", 1)
+
+    async def run():
+        var.set("request")
+        return await executor.run(var.get)
+
+    assert asyncio.run(run()) == "request"
+
+
+def test_loop_lag_monitor_measures_blocking():
+    monitor = LoopLagMonitor(interval_seconds=0.01)
+
+    async def run():
+        monitor.start()
+        await asyncio.sleep(0.03)
+        time.sleep(0.1)  # Block the loop
+        await asyncio.sleep(0.03)
+        await monitor.stop()
+
+    asyncio.run(run())
+    assert monitor.stats()["max_lag_ms"] >= 80
+
+
+def test_health_reports_executor_saturation():
+    assert set(executor_stats()) == {"provider_io", "git", "event_loop"}
+    release = threading.Event()
+    busy = threading.Thread(target=lambda: asyncio.run(git_executor.run(release.wait)))
+    busy.start()
+    try:
+        while git_executor.stats()["running"] < 1:
+            time.sleep(0.01)
+        with TestClient(main.app) as client:
+            health = client.get("/health").json()["executors"]
+    finally:
+        release.set()
+        busy.join()
+    assert health["git"]["running"] >= 1
+    assert health["git"]["saturation"] == round(health["git"]["running"] / git_executor.max_workers, 3)
+    assert set(health["provider_io"]) == set(health["git"])
+    assert set(health["event_loop"]) == {"last_lag_ms", "max_lag_ms"}
@@ -0,0 +1,77 @@
+import os
+import subprocess
+import pytest
+from datetime import datetime, timezone
+from git_recap.providers import LocalRepoFetcher
+
+
+def _git(repo, *args, date=None):
+    env = dict(os.environ)
+    if date:
+        env.update({"GIT_AUTHOR_DATE": date, "GIT_COMMITTER_DATE": date})
+    subprocess.run(
+        ["git", "-C", str(repo), "-c", "user.name=Alice", "-c", "user.email=alice@example.com", *args],
+        check=True,
+        capture_output=True,
+        text=True,
+        env=env
+    )
+
+
+def _make_repo(path, messages):
+    path.mkdir()
+    _git(path, "init", "-q", "-b", "main")
+    for message, date in messages:
+        _git(path, "commit", "-q", "--allow-empty", "-m", message, date=date)
+    return path
+
+
+@pytest.fixture
+def repos(tmp_path):
+    """Create two local repositories with interleaved commit dates."""
+    api = _make_repo(tmp_path / "api", [("feat: api 1", "2025-01-01T10:00:00Z"), ("feat: api | 2", "2025-01-03T10:00:00Z")])
+    web = _make_repo(tmp_path / "web", [("feat: web 1", "2025-01-02T10:00:00Z")])
+    return api, web
+
+
+class TestLocalRepoFetcher:
+    def test_rejects_non_repositories(self, tmp_path):
+        with pytest.raises(ValueError):
+            LocalRepoFetcher(str(tmp_path))
+
+    def test_merges_commits_of_all_repositories(self, repos):
+        fetcher = LocalRepoFetcher([str(path) for path in repos])
+        assert fetcher.repos_names == ["api", "web"]
+        commits = fetcher.fetch_commits()
+        assert [(c["repo"], c["message"]) for c in commits] == [
+            ("api", "feat: api | 2"),
+            ("web", "feat: web 1"),
+            ("api", "feat: api 1")
+        ]
+
+    def test_filters(self, repos):
+        fetcher = LocalRepoFetcher(
+            [str(path) for path in repos],
+            start_date=datetime(2025, 1, 2, tzinfo=timezone.utc),
+            repo_filter=["api"]
+        )
+        assert [c["message"] for c in fetcher.fetch_commits()] == ["feat: api | 2"]
+        fetcher.authors = ["Bob"]
+        assert fetcher.fetch_commits() == []
+
+    def test_branches_and_diff(self, repos):
+        api, _ = repos
+        _git(api, "checkout", "-q", "-b", "feature")
+        _git(api, "commit", "-q", "--allow-empty", "-m", "feat: on feature")
+        fetcher = LocalRepoFetcher(str(api))
+        assert fetcher.get_branches() == ["feature", "main"]
+        assert fetcher.get_valid_target_branches("feature") == ["main"]
+        assert [c["message"] for c in fetcher.fetch_branch_diff_commits("feature", "main")] == ["feat: on feature"]
+
+    def test_does_not_modify_the_repository(self, repos):
+        api, _ = repos
+        before = sorted(os.listdir(api / ".git"))
+        fetcher = LocalRepoFetcher(str(api))
+        fetcher.get_authored_messages()
+        fetcher.get_authors([])
+        assert sorted(os.listdir(api / ".git")) == before
@@ -197,6 +197,36 @@ def test_fetch_releases_github_exception_handling(mock_github_class):
     assert len(releases) == 0
 
 
+@patch('git_recap.providers.github_fetcher.Github')
+def test_github_repos_are_listed_once_and_shared_by_get_authors(mock_github_class):
+    """
+    The repository listing is materialized once, and get_authors reuses it.
+    """
+    mock_github = Mock()
+    mock_user = Mock()
+    mock_repo = Mock()
+    mock_commit = Mock()
+    mock_github_class.return_value = mock_github
+    mock_github.get_user.return_value = mock_user
+    mock_user.login = "testuser"
+    mock_user.get_repos.return_value = iter([mock_repo])  # a one-shot iterator, like a page stream
+
+    mock_repo.name = "test-repo"
+    mock_repo.full_name = "testuser/test-repo"
+    mock_commit.commit.author.name = "Alice"
+    mock_commit.commit.author.email = "alice@example.com"
+    mock_commit.commit.committer = None
+    mock_repo.get_commits.return_value = [mock_commit]
+
+    fetcher = GitHubFetcher(pat="dummy_token")
+    assert fetcher.repos_names == ["test-repo"]
+    assert fetcher.repos_names == ["test-repo"]
+    assert fetcher.get_authors([]) == [{"name": "Alice", "email": "alice@example.com"}]
+    assert fetcher.get_authors(["test-repo"]) == [{"name": "Alice", "email": "alice@example.com"}]
+    mock_user.get_repos.assert_called_once()
+    mock_github.get_repo.assert_not_called()
+
+
 def test_fetch_releases_not_implemented_providers():
     """
     Test that other providers raise NotImplementedError for releases.
@@ -0,0 +1,64 @@
+import re
+from datetime import date
+
+import pytest
+
+from services.prompt_builder import (
+    TRIGGER_PROMPT,
+    TRIGGER_PULL_REQUEST_PROMPT,
+    TRIGGER_RELEASE_PROMPT,
+    build_prompt,
+    build_system_prompt,
+    render_request,
+    shared_prefix_length,
+)
+
+TEMPLATES = {
+    "recap": TRIGGER_PROMPT,
+    "release": TRIGGER_RELEASE_PROMPT,
+    "pull_request": TRIGGER_PULL_REQUEST_PROMPT,
+}
+
+
+def test_shared_prefix_length():
+    assert shared_prefix_length("", "abc") == 0
+    assert shared_prefix_length("abc", "abc") == 3
+    assert shared_prefix_length("abcdef", "abcxef") == 3
+    assert shared_prefix_length("abc", "abcdef") == 3
+    assert shared_prefix_length("xbc", "abc") == 0
+
+
+@pytest.mark.parametrize("action_type", list(TEMPLATES))
+def test_system_prompt_is_byte_identical_within_a_day(action_type):
+    day = date(2025, 3, 14)
+    assert render_request(build_system_prompt(action_type, day), "") == render_request(build_system_prompt(action_type, day), "")
+    assert build_system_prompt(action_type) == build_system_prompt(action_type)
+
+
+def test_recap_system_prompt_changes_across_days():
+    prompts = {render_request(build_system_prompt("recap", date(2025, 3, day)), "") for day in range(1, 8)}
+    assert len(prompts) > 1
+
+
+@pytest.mark.parametrize("action_type", list(TEMPLATES))
+def test_templates_keep_the_variable_part_last(action_type):
+    template = TEMPLATES[action_type]
+    static = template[:template.index("{")]
+    # Nothing but whitespace follows the last placeholder
+    assert not template[template.rindex("}") + 1:].strip()
+    # Only short labels sit between the placeholders, after every instruction
+    assert len(re.sub(r"\{[A-Z]+\}", "", template[len(static):])) < 60
+
+    system = build_system_prompt(action_type, date(2025, 3, 14))
+    first = render_request(system, build_prompt(action_type, "2025-03-14:\n - [Commit] in a: one\n", n=3, src_branch="f1", target_branch="main"))
+    second = render_request(system, build_prompt(action_type, "2025-03-15:\n - [Commit] in b: two\n", n=4, src_branch="f2", target_branch="dev"))
+    system_text = render_request(system, "")
+    # Consecutive requests share the system prompt and every static instruction
+    assert shared_prefix_length(first, second) >= len(system_text) + len(static)
+
+
+def test_unknown_action_type():
+    with pytest.raises(ValueError):
+        build_system_prompt("unknown")
+    with pytest.raises(ValueError):
+        build_prompt("unknown", "")
@@ -0,0 +1,58 @@
+import os
+import subprocess
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from git_recap.providers import LocalRepoFetcher, RecapQuery
+from git_recap.providers.base_fetcher import BaseFetcher
+
+
+def _make_repo(path, commits):
+    path.mkdir()
+    subprocess.run(["git", "-C", str(path), "init", "-q", "-b", "main"], check=True)
+    for message, date in commits:
+        subprocess.run(
+            ["git", "-C", str(path), "-c", "user.name=Alice", "-c", "user.email=alice@example.com",
+             "commit", "-q", "--allow-empty", "-m", message],
+            check=True,
+            capture_output=True,
+            env={**os.environ, "GIT_AUTHOR_DATE": date, "GIT_COMMITTER_DATE": date}
+        )
+    return str(path)
+
+
+def test_query_normalization():
+    query = RecapQuery(start_date=datetime(2025, 1, 2), repos=("web", "api", "web"))
+    assert query.start_date.tzinfo is timezone.utc
+    assert query.repos == ("api", "web")
+    assert query == RecapQuery(start_date=datetime(2025, 1, 2, tzinfo=timezone.utc), repos=("api", "web"))
+    assert hash(query) == hash(query.with_repos(["web", "api"]))
+    with pytest.raises(ValueError):
+        RecapQuery(kinds={"release"})
+
+
+def test_make_query_defaults_to_the_fetcher_filters(tmp_path):
+    repo = _make_repo(tmp_path / "api", [("feat: api 1", "2025-01-01T10:00:00Z")])
+    fetcher = LocalRepoFetcher(repo, start_date=datetime(2025, 1, 1), repo_filter=["api"], authors=["Alice"])
+    query = fetcher.make_query(end_date=datetime(2025, 2, 1))
+    assert query.start_date == datetime(2025, 1, 1, tzinfo=timezone.utc)
+    assert query.end_date == datetime(2025, 2, 1, tzinfo=timezone.utc)
+    assert query.repos == ("api",) and query.authors == ("Alice",)
+    assert fetcher.make_query(repos=[]).repos == ()
+
+
+def test_queries_do_not_modify_the_fetcher(tmp_path):
+    fetcher = LocalRepoFetcher([
+        _make_repo(tmp_path / "api", [("feat: api 1", "2025-01-01T10:00:00Z"), ("feat: api 2", "2025-01-03T10:00:00Z")]),
+        _make_repo(tmp_path / "web", [("feat: web 1", "2025-01-02T10:00:00Z")])
+    ])
+    api_only = fetcher.make_query(repos=["api"])
+    since_jan_2 = fetcher.make_query(start_date=datetime(2025, 1, 2))
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        results = list(pool.map(fetcher.fetch_commits, [api_only, since_jan_2] * 4))
+    assert {len(commits) for commits in results[::2]} == {2}
+    assert {len(commits) for commits in results[1::2]} == {2}
+    assert all(c["repo"] == "api" for c in results[0])
+    assert fetcher.repo_filter == [] and fetcher.start_date is None
+    assert len(fetcher.fetch_commits()) == 3
+    assert fetcher.get_authored_messages(fetcher.make_query(kinds=["issue"])) == []
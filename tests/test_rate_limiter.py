@@ -0,0 +1,63 @@
+import pytest
+from midleware import SlidingWindowLimiter, parse_route_limits
+
+
+def test_parse_route_limits():
+    assert parse_route_limits("/clone-repo=5, /actions=10,") == {"/clone-repo": 5, "/actions": 10}
+    assert parse_route_limits("") == {}
+
+
+def test_limit_within_a_window():
+    limiter = SlidingWindowLimiter(limit=2, window_seconds=10)
+    assert limiter.hit("ip", now=0) == 0
+    assert limiter.hit("ip", now=1) == 0
+    assert limiter.hit("ip", now=2) == pytest.approx(8)
+    assert limiter.hit("other", now=2) == 0
+
+
+def test_previous_window_is_weighted_by_its_overlap():
+    limiter = SlidingWindowLimiter(limit=2, window_seconds=10)
+    limiter.hit("ip", now=0)
+    limiter.hit("ip", now=1)
+    # Rollover: the previous window still fully overlaps the sliding window
+    assert limiter.hit("ip", now=10) == pytest.approx(10)
+    # Halfway through, it only counts for one request
+    assert limiter.hit("ip", now=15) == 0
+    assert limiter.hit("ip", now=16) == 0
+    assert limiter.hit("ip", now=17) == pytest.approx(3)
+
+
+def test_rejected_requests_are_not_counted():
+    limiter = SlidingWindowLimiter(limit=1, window_seconds=10)
+    limiter.hit("ip", now=0)
+    for now in (1, 2, 3):
+        assert limiter.hit("ip", now=now) > 0
+    # Only the accepted request carries over, weighted 0.4
+    assert limiter.hit("ip", now=16) == 0
+
+
+def test_counts_reset_after_two_idle_windows():
+    limiter = SlidingWindowLimiter(limit=2, window_seconds=10)
+    limiter.hit("ip", now=8)
+    limiter.hit("ip", now=9)
+    assert limiter.hit("ip", now=20) == 0
+    assert limiter.hit("ip", now=20.5) == 0
+
+
+def test_idle_keys_are_evicted():
+    limiter = SlidingWindowLimiter(limit=2, window_seconds=10)
+    limiter.hit("idle", now=0)
+    limiter.hit("active", now=15)
+    assert len(limiter) == 2
+    limiter.hit("new", now=25)
+    assert len(limiter) == 2
+    assert "idle" not in limiter._counters
+
+
+def test_max_keys_evicts_the_least_recently_used():
+    limiter = SlidingWindowLimiter(limit=2, window_seconds=10, max_keys=2)
+    limiter.hit("a", now=0)
+    limiter.hit("b", now=0)
+    limiter.hit("a", now=1)
+    limiter.hit("c", now=1)
+    assert list(limiter._counters) == ["a", "c"]
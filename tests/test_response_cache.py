@@ -0,0 +1,67 @@
+from unittest.mock import patch
+
+from aicore.llm.config import LlmConfig
+
+from services import response_cache as cache_module
+from services.response_cache import ResponseCache
+
+
+def _config(**kwargs):
+    return LlmConfig(**{"provider": "openai", "model": "gpt-4o", "api_key": "sk-1", **kwargs})
+
+
+def _at(seconds):
+    return patch.object(cache_module.time, "monotonic", return_value=seconds)
+
+
+def test_make_key_ignores_the_api_key():
+    system, prompt = "system", ["prompt"]
+    assert ResponseCache.make_key(_config(), system, prompt) == ResponseCache.make_key(_config(api_key="sk-2"), system, prompt)
+
+
+def test_make_key_changes_with_the_request():
+    key = ResponseCache.make_key(_config(), "system", ["prompt"])
+    assert ResponseCache.make_key(_config(model="gpt-4o-mini"), "system", ["prompt"]) != key
+    assert ResponseCache.make_key(_config(temperature=0.5), "system", ["prompt"]) != key
+    assert ResponseCache.make_key(_config(), "other system", ["prompt"]) != key
+    assert ResponseCache.make_key(_config(), ["system"], ["prompt"]) != key
+    assert ResponseCache.make_key(_config(), "system", ["other prompt"]) != key
+
+
+def test_sessions_with_different_histories_never_share_an_entry():
+    cache = ResponseCache()
+    first = ["recap prompt"]
+    followed_up = ["recap prompt", "previous answer", "make it shorter"]
+    cache.set(ResponseCache.make_key(_config(), "system", first), ["a", "b"])
+    assert cache.get(ResponseCache.make_key(_config(), "system", followed_up)) is None
+    assert cache.get(ResponseCache.make_key(_config(api_key="sk-other"), "system", first)) == ["a", "b"]
+
+
+def test_entries_expire_after_the_ttl():
+    cache = ResponseCache(ttl_seconds=60)
+    with _at(1000):
+        cache.set("key", ["chunk"])
+    with _at(1060):
+        assert cache.get("key") == ["chunk"]
+    with _at(1061):
+        assert cache.get("key") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_lru_bound():
+    cache = ResponseCache(max_entries=2)
+    cache.set("a", ["1"])
+    cache.set("b", ["2"])
+    assert cache.get("a") == ["1"]  # "b" becomes the least recently used
+    cache.set("c", ["3"])
+    assert cache.get("b") is None
+    assert cache.get("a") == ["1"] and cache.get("c") == ["3"]
+
+
+def test_hits_are_copies():
+    cache = ResponseCache()
+    chunks = ["a"]
+    cache.set("key", chunks)
+    chunks.append("b")
+    cache.get("key").append("c")
+    assert cache.get("key") == ["a"]
@@ -0,0 +1,83 @@
+import json
+from unittest.mock import patch
+from fastapi import Request
+from services.result_cache import ResultCache, conditional_response
+
+
+def _request(if_none_match=None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match is not None else []
+    return Request({"type": "http", "method": "GET", "path": "/actions", "headers": headers})
+
+
+def test_make_key_normalizes_the_query():
+    key = ResultCache.make_key("s", "actions", repos=["b", "a"], map_reduce=False)
+    assert key == ResultCache.make_key("s", "actions", map_reduce=False, repos=["a", "b"])
+    assert key != ResultCache.make_key("s", "actions", repos=["a", "b"], map_reduce=True)
+    assert key[0] == "s"
+
+
+def test_etag_identifies_the_payload():
+    etag = ResultCache.make_etag({"actions": "x", "total_count": 1})
+    assert etag == ResultCache.make_etag({"total_count": 1, "actions": "x"})
+    assert etag != ResultCache.make_etag({"actions": "y", "total_count": 1})
+    assert etag.startswith('"') and etag.endswith('"')
+
+
+def test_set_returns_the_etag_served_by_get():
+    cache = ResultCache()
+    key = cache.make_key("s", "actions")
+    etag = cache.set(key, {"actions": "x"})
+    assert cache.get(key) == (etag, {"actions": "x"})
+    assert cache.stats() == {"entries": 1, "hits": 1, "misses": 0}
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResultCache(max_entries=2)
+    a, b, c = (cache.make_key("s", name) for name in "abc")
+    cache.set(a, {"v": "a"})
+    cache.set(b, {"v": "b"})
+    cache.get(a)
+    cache.set(c, {"v": "c"})
+    assert cache.get(b) is None
+    assert cache.get(a)[1] == {"v": "a"}
+    assert cache.get(c)[1] == {"v": "c"}
+
+
+def test_entries_expire_after_the_ttl():
+    cache = ResultCache(ttl_seconds=10)
+    key = cache.make_key("s", "actions")
+    with patch("services.result_cache.time.monotonic", return_value=100.0):
+        cache.set(key, {"actions": "x"})
+    with patch("services.result_cache.time.monotonic", return_value=110.0):
+        assert cache.get(key) is not None
+    with patch("services.result_cache.time.monotonic", return_value=110.5):
+        assert cache.get(key) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_invalidate_session():
+    cache = ResultCache()
+    mine, other = cache.make_key("s1", "actions"), cache.make_key("s2", "actions")
+    cache.set(mine, {})
+    cache.set(other, {})
+    cache.invalidate_session("s1")
+    assert cache.get(mine) is None
+    assert cache.get(other) is not None
+
+
+def test_conditional_response_serves_the_result_with_its_etag():
+    etag = ResultCache.make_etag({"actions": "x"})
+    response = conditional_response(_request(), etag, {"actions": "x"})
+    assert response.status_code == 200
+    assert response.headers["etag"] == etag
+    assert json.loads(response.body) == {"actions": "x"}
+
+
+def test_conditional_response_revalidates_with_if_none_match():
+    etag = ResultCache.make_etag({"actions": "x"})
+    for header in (etag, f'"stale", W/{etag}', "*"):
+        response = conditional_response(_request(header), etag, {"actions": "x"})
+        assert response.status_code == 304
+        assert response.body == b""
+        assert response.headers["etag"] == etag
+    assert conditional_response(_request('"stale"'), etag, {"actions": "x"}).status_code == 200
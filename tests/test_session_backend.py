@@ -0,0 +1,207 @@
+import asyncio
+import os
+import subprocess
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from cryptography.fernet import Fernet
+from fastapi import HTTPException
+
+from git_recap.providers.mirror_cache import MirrorCache
+from git_recap.providers.url_fetcher import URLFetcher
+from services import fetcher_service, llm_service, session_backend as backend_module
+from services.session_backend import (
+    MemorySessionBackend,
+    SQLiteSessionBackend,
+    _load_cipher,
+    create_session_backend,
+    decrypt_secret,
+    encrypt_secret,
+    session_backend,
+)
+from services.session_expiry import session_expiry
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return MemorySessionBackend()
+    return SQLiteSessionBackend(str(tmp_path / "sessions.db"))
+
+
+def _at(seconds):
+    return patch.object(backend_module.time, "time", return_value=seconds)
+
+
+def test_round_trip(backend):
+    descriptor = {"provider": "URL", "token": "secret", "filters": {"authors": ["Alice"]}}
+    backend.set("fetcher:s1", descriptor, 60)
+    restored = backend.get("fetcher:s1")
+    assert restored == descriptor and restored is not descriptor
+    assert backend.get("fetcher:other") is None
+    backend.delete("fetcher:s1")
+    assert backend.get("fetcher:s1") is None
+
+
+def test_async_round_trip(backend):
+    async def run():
+        await backend.aset("llm:s1", {"config": None}, 60)
+        await backend.atouch("llm:s1", 60)
+        found = await backend.aget("llm:s1")
+        await backend.adelete("llm:s1")
+        return found, await backend.aget("llm:s1")
+
+    assert asyncio.run(run()) == ({"config": None}, None)
+
+
+def test_descriptors_expire_unless_touched(backend):
+    with _at(1000):
+        backend.set("a", {"n": 1}, 60)
+        backend.set("b", {"n": 2}, 60)
+    with _at(1050):
+        backend.touch("a", 60)
+    with _at(1070):
+        assert backend.get("a") == {"n": 1}
+        assert backend.get("b") is None
+
+
+def test_expire_keeps_descriptors_renewed_elsewhere(backend):
+    with _at(1000):
+        backend.set("idle", {}, 60)
+        backend.set("renewed", {}, 60)
+    with _at(1050):
+        backend.touch("renewed", 60)
+    # The local session expired at 1060; another worker renewed "renewed" at 1050
+    with _at(1058):
+        backend.expire("idle")
+        backend.expire("renewed")
+        backend.expire("missing")
+        assert backend.get("idle") is None
+        assert backend.get("renewed") == {}
+
+
+def test_create_session_backend(tmp_path):
+    assert isinstance(create_session_backend("memory://"), MemorySessionBackend)
+    assert create_session_backend(f"sqlite:///{tmp_path}/s.db").shared
+    with pytest.raises(ValueError):
+        create_session_backend("ftp://host")
+
+
+def test_secrets_round_trip():
+    token = encrypt_secret({"api_key": "sk-123"})
+    assert "sk-123" not in token
+    assert decrypt_secret(token) == {"api_key": "sk-123"}
+
+
+def test_secrets_of_another_key_are_rejected():
+    with patch.object(backend_module, "_cipher", Fernet(Fernet.generate_key())):
+        token = encrypt_secret("ghp_token")
+    assert decrypt_secret(token) is None
+
+
+def test_cipher_keys(monkeypatch):
+    monkeypatch.delenv("SESSION_ENCRYPTION_KEY", raising=False)
+    monkeypatch.setenv("SECRET_KEY", "jwt secret")
+    # Every worker derives the same key from SECRET_KEY
+    assert _load_cipher(True).decrypt(_load_cipher(True).encrypt(b"x")) == b"x"
+
+    key = Fernet.generate_key()
+    monkeypatch.setenv("SESSION_ENCRYPTION_KEY", key.decode())
+    assert Fernet(key).decrypt(_load_cipher(True).encrypt(b"x")) == b"x"
+
+
+def test_shared_sessions_require_a_key(monkeypatch):
+    monkeypatch.delenv("SESSION_ENCRYPTION_KEY", raising=False)
+    monkeypatch.delenv("SECRET_KEY", raising=False)
+    assert _load_cipher(False)
+    with pytest.raises(RuntimeError, match="SESSION_ENCRYPTION_KEY"):
+        _load_cipher(True)
+
+
+class TestRestore:
+    """Sessions rebuilt from their descriptors, as by another worker."""
+
+    def test_restore_llm(self):
+        built = []
+
+        def build(session_id, config_dict=None):
+            built.append(config_dict)
+            return SimpleNamespace(session_id=session_id)
+
+        session_backend.set("llm:restore-1", {"config": encrypt_secret({"model": "m"})}, 60)
+        try:
+            with patch.object(llm_service, "_build_llm", build):
+                llm = asyncio.run(llm_service.aget_llm("restore-1"))
+            assert llm.session_id == "restore-1"
+            assert built == [{"model": "m"}]
+            assert llm_service.llm_sessions.get("restore-1") is llm
+        finally:
+            session_expiry.expire(["restore-1"])
+            session_backend.delete("llm:restore-1")
+
+    def test_restore_llm_of_another_key(self):
+        with patch.object(backend_module, "_cipher", Fernet(Fernet.generate_key())):
+            config = encrypt_secret({"model": "m"})
+        session_backend.set("llm:restore-2", {"config": config}, 60)
+        try:
+            with pytest.raises(HTTPException) as error:
+                asyncio.run(llm_service.aget_llm("restore-2"))
+            assert error.value.status_code == 404
+        finally:
+            session_backend.delete("llm:restore-2")
+
+    @pytest.fixture
+    def repo(self, tmp_path):
+        repo = tmp_path / "repo"
+        repo.mkdir()
+        subprocess.run(["git", "-C", str(repo), "init", "-q", "-b", "main"], check=True)
+        subprocess.run(
+            ["git", "-C", str(repo), "-c", "user.name=Alice", "-c", "user.email=alice@example.com",
+             "commit", "-q", "--allow-empty", "-m", "feat: one"],
+            check=True,
+            env={**os.environ, "GIT_AUTHOR_DATE": "2025-01-01T10:00:00Z", "GIT_COMMITTER_DATE": "2025-01-01T10:00:00Z"}
+        )
+        return repo
+
+    def test_aget_fetcher_rebuilds_url_sessions(self, repo, tmp_path, monkeypatch):
+        monkeypatch.setattr(fetcher_service, "url_mirror_cache", MirrorCache(str(tmp_path / "mirrors")))
+        descriptor = {
+            "provider": "URL",
+            "token": encrypt_secret(f"file://{repo}"),
+            "filters": {"start_date": None, "end_date": None, "repo_filter": [], "authors": ["Alice"]}
+        }
+        session_backend.set("fetcher:restore-3", descriptor, 60)
+        try:
+            with patch.object(URLFetcher, "_normalize_url", lambda self, url: url):
+                fetcher = asyncio.run(fetcher_service.aget_fetcher("restore-3"))
+            assert fetcher.authors == ["Alice"]
+            assert [c["message"] for c in fetcher.fetch_commits()] == ["feat: one"]
+            assert fetcher_service.fetchers.get("restore-3") is fetcher
+        finally:
+            session_expiry.expire(["restore-3"])
+            session_backend.delete("fetcher:restore-3")
+        assert fetcher.repo_path is None
+
+    def test_expired_sessions_cannot_be_restored(self):
+        # Idle descriptors are deleted with the session; renewed ones survive
+        session_backend.set("fetcher:restore-4", {"provider": "GitHub", "token": encrypt_secret("ghp")}, 1)
+        session_backend.set("llm:restore-4", {"config": None}, 1)
+        session_backend.set("fetcher:restore-5", {"provider": "GitHub", "token": encrypt_secret("ghp")}, 60)
+        session_expiry.expire(["restore-4", "restore-5"])
+        try:
+            assert session_backend.get("fetcher:restore-4") is None
+            assert session_backend.get("llm:restore-4") is None
+            assert session_backend.get("fetcher:restore-5") is not None
+            with pytest.raises(HTTPException) as error:
+                asyncio.run(fetcher_service.aget_fetcher("restore-4"))
+            assert error.value.status_code == 404
+        finally:
+            session_backend.delete("fetcher:restore-5")
+
+    def test_expire_session_deletes_descriptors(self):
+        session_backend.set("fetcher:restore-6", {"provider": "GitHub", "token": encrypt_secret("ghp")}, 60)
+        session_backend.set("llm:restore-6", {"config": None}, 60)
+        asyncio.run(llm_service.expire_session("restore-6"))
+        assert session_backend.get("fetcher:restore-6") is None
+        assert session_backend.get("llm:restore-6") is None
@@ -0,0 +1,98 @@
+import asyncio
+import threading
+from unittest.mock import patch
+
+from services import session_expiry as expiry_module
+from services.session_expiry import SessionExpiry
+
+
+def _at(seconds):
+    return patch.object(expiry_module.time, "monotonic", return_value=seconds)
+
+
+def test_touch_and_pop_expired():
+    expiry = SessionExpiry(ttl_seconds=10)
+    with _at(100):
+        expiry.touch("a")
+    with _at(105):
+        expiry.touch("b")
+    assert expiry.pop_expired(now=109) == []
+    assert expiry.pop_expired(now=110) == ["a"]
+    assert expiry.pop_expired(now=200) == ["b"]
+    assert expiry.pop_expired(now=300) == []
+    assert expiry.stats()["tracked"] == 0
+
+
+def test_touch_slides_the_deadline():
+    expiry = SessionExpiry(ttl_seconds=10)
+    for now in (100, 104, 108):
+        with _at(now):
+            expiry.touch("a")
+    # Touching updates the deadline without adding heap entries
+    assert len(expiry._heap) == 1
+    assert expiry.pop_expired(now=110) == []
+    # The stale entry was re-pushed with the current deadline
+    assert expiry._heap == [(118, "a")]
+    assert expiry.pop_expired(now=117.9) == []
+    assert expiry.pop_expired(now=118) == ["a"]
+
+
+def test_discarded_sessions_are_not_expired():
+    expiry = SessionExpiry(ttl_seconds=10)
+    with _at(100):
+        expiry.touch("a")
+    expiry.discard("a")
+    assert expiry.pop_expired(now=200) == []
+    assert expiry._heap == []
+    # A session tracked again after being discarded gets a fresh entry
+    with _at(300):
+        expiry.touch("a")
+    assert expiry.pop_expired(now=310) == ["a"]
+
+
+def test_expire_runs_every_hook():
+    expiry = SessionExpiry(ttl_seconds=10)
+    calls = []
+
+    def failing(session_id):
+        calls.append(("failing", session_id))
+        raise RuntimeError("boom")
+
+    expiry.add_hook(failing)
+    expiry.add_hook(lambda session_id: calls.append(("ok", session_id)))
+    expiry.touch("a")
+    expiry.expire(["a", "b"])
+    # A failing hook does not stop the others
+    assert calls == [("failing", "a"), ("ok", "a"), ("failing", "b"), ("ok", "b")]
+    assert expiry.stats()["expired"] == 2
+    assert expiry.pop_expired(now=float("inf")) == []
+
+
+def test_sweep_runs_hooks_off_the_event_loop():
+    expiry = SessionExpiry(ttl_seconds=0)
+    threads = []
+    expiry.add_hook(lambda session_id: threads.append((session_id, threading.current_thread())))
+    expiry.touch("a")
+    assert asyncio.run(expiry.sweep()) == 1
+    assert asyncio.run(expiry.sweep()) == 0
+    assert [session_id for session_id, _ in threads] == ["a"]
+    assert threads[0][1] is not threading.main_thread()
+
+
+def test_sweeper_expires_idle_sessions():
+    expiry = SessionExpiry(ttl_seconds=0.05, sweep_seconds=0.01)
+    expired = []
+    expiry.add_hook(expired.append)
+
+    async def run():
+        expiry.start()
+        expiry.touch("idle")
+        expiry.touch("active")
+        for _ in range(20):
+            await asyncio.sleep(0.01)
+            expiry.touch("active")
+        await expiry.stop()
+
+    asyncio.run(run())
+    assert expired == ["idle"]
+    assert expiry.stats() == {"tracked": 1, "ttl_seconds": 0.05, "expired": 1}
@@ -0,0 +1,164 @@
+import asyncio
+import threading
+import time
+
+from services import fetcher_service
+from services.session_store import InMemorySessionStore, approximate_size
+
+
+class Recorder:
+    """Eviction hook recording the evicted sessions and the thread it ran on."""
+
+    def __init__(self):
+        self.evicted = []
+        self.threads = []
+
+    def __call__(self, session_id, value):
+        self.evicted.append((session_id, value))
+        self.threads.append(threading.current_thread())
+
+
+def _store(hook=None, **kwargs):
+    return InMemorySessionStore("test", on_evict=hook, size_fn=lambda value: value["size"], **kwargs)
+
+
+def test_entry_cap_evicts_least_recently_used():
+    hook = Recorder()
+    store = _store(hook, max_entries=2)
+    a, b, c = {"size": 1}, {"size": 1}, {"size": 1}
+    store.set("a", a)
+    store.set("b", b)
+    assert store.get("a") is a  # "b" becomes the least recently used
+    store.set("c", c)
+    assert hook.evicted == [("b", b)]
+    assert store.get("b") is None and "a" in store and "c" in store
+    assert store.stats()["evictions"] == 1
+
+
+def test_byte_cap_evicts_until_it_fits():
+    hook = Recorder()
+    store = _store(hook, max_bytes=100)
+    for name in "abc":
+        store.set(name, {"size": 40})
+    assert [session_id for session_id, _ in hook.evicted] == ["a"]
+    store.set("big", {"size": 90})
+    assert [session_id for session_id, _ in hook.evicted] == ["a", "b", "c"]
+    assert store.stats()["bytes"] == 90
+
+
+def test_new_session_is_kept_even_above_the_cap():
+    store = _store(max_bytes=10)
+    store.set("a", {"size": 50})
+    assert "a" in store and store.stats()["bytes"] == 50
+
+
+def test_replacing_a_session_recounts_its_size():
+    hook = Recorder()
+    store = _store(hook, max_bytes=100)
+    store.set("a", {"size": 60})
+    store.set("a", {"size": 30})
+    assert hook.evicted == [] and store.stats()["bytes"] == 30
+
+
+def test_pop_skips_the_hook_and_evict_runs_it():
+    hook = Recorder()
+    store = _store(hook)
+    a, b = {"size": 1}, {"size": 1}
+    store.set("a", a)
+    store.set("b", b)
+    assert store.pop("a") is a
+    store.evict("b")
+    store.evict("missing")
+    assert hook.evicted == [("b", b)]
+    assert len(store) == 0 and store.stats()["bytes"] == 0
+
+
+def test_eviction_hook_waits_for_leases():
+    hook = Recorder()
+    store = _store(hook, max_entries=1)
+    a = {"size": 1}
+    store.set("a", a)
+    store.acquire(a)
+    store.acquire(a)
+    store.set("b", {"size": 1})
+    assert hook.evicted == [] and store.get("a") is None
+    assert store.stats()["retired"] == 1
+    store.release(a)
+    assert hook.evicted == []
+    store.release(a)
+    assert hook.evicted == [("a", a)]
+    assert store.stats()["leased"] == store.stats()["retired"] == 0
+
+
+def test_released_objects_are_evicted_immediately():
+    hook = Recorder()
+    store = _store(hook)
+    a = {"size": 1}
+    store.set("a", a)
+    store.acquire(a)
+    store.release(a)
+    store.evict("a")
+    assert hook.evicted == [("a", a)]
+
+
+def test_async_paths_run_sizing_and_hooks_off_the_loop():
+    hook = Recorder()
+    sized = []
+    store = InMemorySessionStore(
+        "test",
+        max_entries=1,
+        on_evict=hook,
+        size_fn=lambda value: sized.append(threading.current_thread()) or 1
+    )
+    a = {}
+
+    async def run():
+        await store.aset("a", a)
+        store.acquire(a)
+        await store.aset("b", {})
+        store.release_in_background(a)
+        while not hook.evicted:
+            await asyncio.sleep(0.01)
+
+    asyncio.run(run())
+    assert hook.evicted == [("a", a)]
+    assert threading.main_thread() not in sized + hook.threads
+
+
+def test_approximate_size():
+    small = approximate_size({"a": 1})
+    assert approximate_size({"a": 1, "b": "x" * 10000}) > small + 10000
+    shared = "y" * 10000
+    # Objects are counted once, and the walk stops at max_objects
+    assert approximate_size([shared, shared]) < 2 * 10000
+    assert approximate_size(list(range(1000)), max_objects=10) < approximate_size(list(range(1000)))
+
+
+class FakeFetcher:
+    def __init__(self):
+        self.cleared = 0
+
+    def clear(self):
+        self.cleared += 1
+
+
+def test_fetchers_expired_during_a_request_are_released_after_it():
+    fetcher = FakeFetcher()
+    fetcher_service.fetchers.set("lease-1", fetcher)
+
+    async def request():
+        assert await fetcher_service.aget_fetcher("lease-1") is fetcher
+        fetcher_service.expire_fetcher("lease-1")
+        await asyncio.sleep(0)
+        return fetcher.cleared
+
+    async def run():
+        during = await asyncio.create_task(request())
+        deadline = time.monotonic() + 5
+        while not fetcher.cleared and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+        return during
+
+    assert asyncio.run(run()) == 0
+    assert fetcher.cleared == 1
+    assert "lease-1" not in fetcher_service.fetchers
@@ -0,0 +1,94 @@
+import asyncio
+import pytest
+from services.result_cache import ResultCache
+from services.single_flight import SingleFlight
+
+
+def test_make_key_normalizes_the_query():
+    a = SingleFlight.make_key("s", "repos", repos=["b", "a"], start=None)
+    assert a == SingleFlight.make_key("s", "repos", start=None, repos=["a", "b", "a"])
+    assert a != SingleFlight.make_key("other", "repos", repos=["a", "b"], start=None)
+    # Both layers key a request the same way
+    assert a == ResultCache.make_key("s", "repos", repos=["a", "b"], start=None)
+
+
+def test_identical_calls_share_one_computation():
+    flight = SingleFlight()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "result"
+
+    async def run():
+        results = await asyncio.gather(flight.do("key", compute), flight.do("key", compute))
+        return results, flight.stats()
+
+    results, stats = asyncio.run(run())
+    assert results == ["result", "result"]
+    assert calls == [1]
+    assert stats == {"in_flight": 0, "started": 1, "coalesced": 1}
+
+
+def test_exceptions_reach_every_waiter_and_the_key_is_forgotten():
+    flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def run():
+        results = await asyncio.gather(flight.do("key", fail), flight.do("key", fail), return_exceptions=True)
+        return results, await flight.do("key", lambda: asyncio.sleep(0, "again"))
+
+    results, again = asyncio.run(run())
+    assert [str(e) for e in results] == ["boom", "boom"]
+    assert again == "again"
+    assert flight.stats()["started"] == 2
+
+
+def test_computation_survives_until_the_last_waiter_leaves():
+    flight = SingleFlight()
+    release = None
+
+    async def compute():
+        await release.wait()
+        return "result"
+
+    async def run():
+        nonlocal release
+        release = asyncio.Event()
+        first = asyncio.ensure_future(flight.do("key", compute))
+        second = asyncio.ensure_future(flight.do("key", compute))
+        await asyncio.sleep(0)
+        task = flight._calls["key"].task
+
+        first.cancel()
+        await asyncio.sleep(0)
+        assert first.cancelled() and not task.cancelled()
+
+        release.set()
+        return await second, task
+
+    result, task = asyncio.run(run())
+    assert result == "result"
+    assert not task.cancelled()
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_computation_is_cancelled_with_the_last_waiter():
+    flight = SingleFlight()
+
+    async def run():
+        waiters = [asyncio.ensure_future(flight.do("key", lambda: asyncio.sleep(10))) for _ in range(2)]
+        await asyncio.sleep(0)
+        task = flight._calls["key"].task
+        for waiter in waiters:
+            waiter.cancel()
+            await asyncio.sleep(0)
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return flight.stats()
+
+    assert asyncio.run(run())["in_flight"] == 0
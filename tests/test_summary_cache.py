@@ -0,0 +1,118 @@
+import asyncio
+import re
+from unittest.mock import patch
+
+from git_recap.utils import parse_entries_to_txt
+from services import summary_cache as cache_module
+from services.summary_cache import SummaryCache, get_summary_cache
+from services.summary_service import incremental_summarize_actions
+
+
+class FakeLlm:
+    """Records the map calls and answers with the slice label."""
+
+    def __init__(self, model="model-a"):
+        self.config = type("Config", (), {"model": model})()
+        self.prompts = []
+
+    def tokenizer(self, text):
+        return text.split()
+
+    async def acomplete(self, prompt, system_prompt=None, stream=True):
+        self.prompts.append(prompt)
+        return "notes for " + re.search(r"Slice: (.+)", prompt).group(1)
+
+
+def _entry(day, repo, message):
+    return {"type": "commit", "repo": repo, "message": message, "timestamp": f"{day}T10:00:00"}
+
+
+ENTRIES = [
+    _entry("2025-03-03", "api", "feat: add login"),
+    _entry("2025-03-04", "api", "fix: token refresh"),
+    _entry("2025-03-05", "web", "feat: dark mode"),
+]
+
+
+def test_make_key():
+    key = SummaryCache.make_key(["bob", "alice"], ["web", "api"], "2025-03-03", ["a", "b"], "m")
+    assert key == SummaryCache.make_key(["alice", "bob", "bob"], ["api", "web"], "2025-03-03", ["a", "b"], "m")
+    for other in (
+        SummaryCache.make_key(["alice"], ["web", "api"], "2025-03-03", ["a", "b"], "m"),
+        SummaryCache.make_key(["bob", "alice"], ["api"], "2025-03-03", ["a", "b"], "m"),
+        SummaryCache.make_key(["bob", "alice"], ["web", "api"], "2025-03-04", ["a", "b"], "m"),
+        SummaryCache.make_key(["bob", "alice"], ["web", "api"], "2025-03-03", ["a", "c"], "m"),
+        SummaryCache.make_key(["bob", "alice"], ["web", "api"], "2025-03-03", ["a", "b"], "n"),
+    ):
+        assert other != key
+
+
+def test_get_set_and_expiry(tmp_path):
+    cache = SummaryCache(str(tmp_path / "cache.sqlite3"), ttl_days=1)
+    with patch.object(cache_module.time, "time", return_value=1000.0):
+        cache.set("a", "2025-03-03", "old")
+        cache.set("a", "2025-03-03", "new")
+        cache.set_many([("b", "2025-03-04", "b notes")])
+    with patch.object(cache_module.time, "time", return_value=1000.0 + 3600):
+        assert cache.get("a") == "new"
+        assert cache.get_many(["a", "b", "missing"]) == {"a": "new", "b": "b notes"}
+        # Persisted on disk
+        reopened = SummaryCache(str(tmp_path / "cache.sqlite3"), ttl_days=1)
+        assert reopened.get("a") == "new"
+    with patch.object(cache_module.time, "time", return_value=1000.0 + 2 * 86400):
+        assert reopened.get("a") is None
+        assert reopened.prune() == 2
+        assert reopened.get_many(["a", "b"]) == {}
+
+
+def test_shared_cache_is_opened_lazily(tmp_path, monkeypatch):
+    path = tmp_path / "shared.sqlite3"
+    monkeypatch.setattr(cache_module, "SUMMARY_CACHE_PATH", str(path))
+    monkeypatch.setattr(cache_module, "_summary_cache", None)
+    assert not path.exists()
+    cache = get_summary_cache()
+    assert get_summary_cache() is cache
+    assert path.exists()
+
+
+def test_unchanged_days_are_served_from_the_cache(tmp_path):
+    cache = SummaryCache(str(tmp_path / "cache.sqlite3"))
+    llm = FakeLlm()
+
+    def summarize(entries, authors=("alice",)):
+        return asyncio.run(incremental_summarize_actions(llm, parse_entries_to_txt(entries), list(authors), cache))
+
+    first = summarize(ENTRIES)
+    assert len(llm.prompts) == 3
+    assert first == "\n\n".join(
+        f"{day}:\nnotes for 2025-W10" for day in ("2025-03-03", "2025-03-04", "2025-03-05")
+    )
+
+    # The same window again: no LLM call
+    assert summarize(ENTRIES) == first
+    assert len(llm.prompts) == 3
+
+    # A rolling window: only the new day is summarized
+    summarize(ENTRIES[1:] + [_entry("2025-03-06", "web", "fix: contrast")])
+    assert len(llm.prompts) == 4
+    assert "2025-03-06" in llm.prompts[-1]
+
+    # A changed day is summarized again
+    summarize(ENTRIES[:2] + [_entry("2025-03-05", "web", "feat: dark mode v2")])
+    assert len(llm.prompts) == 5
+    assert "dark mode v2" in llm.prompts[-1]
+
+    # Other authors or another model do not share summaries
+    summarize(ENTRIES, authors=("bob",))
+    assert len(llm.prompts) == 8
+    llm.config.model = "model-b"
+    summarize(ENTRIES)
+    assert len(llm.prompts) == 11
+
+
+def test_text_without_days_is_returned_untouched(tmp_path):
+    cache = SummaryCache(str(tmp_path / "cache.sqlite3"))
+    llm = FakeLlm()
+    text = "Date: 2025-03-01\nRelease v1"
+    assert asyncio.run(incremental_summarize_actions(llm, text, [], cache)) == text
+    assert llm.prompts == []
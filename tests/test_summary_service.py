@@ -0,0 +1,121 @@
+import asyncio
+import re
+
+from git_recap.utils import parse_entries_to_txt, parse_releases_to_txt
+from services.summary_service import _split_to_budget, chunk_actions, map_reduce_actions, split_actions_txt
+
+
+def tokenizer(text):
+    """Stand-in tokenizer: one token per whitespace-separated word."""
+    return text.split()
+
+
+def count(text):
+    return len(tokenizer(text))
+
+
+class FakeLlm:
+    def __init__(self):
+        self.prompts = []
+
+    tokenizer = staticmethod(tokenizer)
+
+    async def acomplete(self, prompt, system_prompt=None, stream=True):
+        self.prompts.append(prompt)
+        return "notes for " + re.search(r"Slice: (.+)", prompt).group(1)
+
+
+def _entry(day, repo, message, typ="commit"):
+    return {"type": typ, "repo": repo, "message": message, "timestamp": f"{day}T10:00:00"}
+
+
+def _days(entries):
+    return split_actions_txt(parse_entries_to_txt(entries))[0]
+
+
+def test_split_actions_txt_round_trip():
+    entries = [
+        _entry("2025-03-03", "api", "feat: add login\n\nLong body line"),
+        _entry("2025-03-04", "web", "fix: typo"),
+    ]
+    releases = parse_releases_to_txt([{"tag_name": "v1", "published_at": "2025-02-01T00:00:00", "body": "First"}])
+    days, passthrough = split_actions_txt(parse_entries_to_txt(entries) + "\n\n" + releases)
+    assert days == {
+        "2025-03-03": [" - [Commit] in api: feat: add login\n\nLong body line"],
+        "2025-03-04": [" - [Commit] in web: fix: typo"],
+    }
+    assert passthrough == releases.strip()
+
+
+def test_weeks_that_fit_are_one_chunk_each():
+    days = _days([
+        _entry("2025-03-02", "api", "sunday"),  # ISO week 9
+        _entry("2025-03-03", "api", "monday"),  # ISO week 10
+        _entry("2025-03-09", "web", "sunday"),
+    ])
+    chunks = chunk_actions(days, tokenizer, max_tokens=1000)
+    assert [chunk["label"] for chunk in chunks] == ["2025-W09", "2025-W10"]
+    assert "2025-03-03:" in chunks[1]["text"] and "2025-03-09:" in chunks[1]["text"]
+
+
+def test_large_weeks_split_by_repo_then_entries():
+    words = " ".join(["word"] * 20)
+    days = _days(
+        [_entry("2025-03-03", "api", f"api change {i} {words}") for i in range(6)]
+        + [_entry("2025-03-04", "web", f"web change {words}")]
+    )
+    max_tokens = 60
+    chunks = chunk_actions(days, tokenizer, max_tokens=max_tokens)
+    labels = [chunk["label"] for chunk in chunks]
+    assert labels == [
+        "2025-W10 in api (1/3)", "2025-W10 in api (2/3)", "2025-W10 in api (3/3)",
+        "2025-W10 in web",
+    ]
+    for chunk in chunks:
+        assert count(chunk["text"]) <= max_tokens
+    # Every entry ends up in exactly one chunk, in chronological order
+    api_text = "".join(chunk["text"] for chunk in chunks[:3])
+    assert [int(i) for i in re.findall(r"api change (\d+)", api_text)] == list(range(6))
+    assert "web change" in chunks[3]["text"] and "api change" not in chunks[3]["text"]
+
+
+def test_split_to_budget_packs_greedily():
+    days = {"2025-03-03": ["a b c", "d e f"], "2025-03-04": ["g h i j"]}
+    # Each entry also pays for its day header (one token)
+    parts = _split_to_budget(days, count, max_tokens=8)
+    assert parts == [{"2025-03-03": ["a b c", "d e f"]}, {"2025-03-04": ["g h i j"]}]
+    # An entry larger than the budget still gets a part of its own
+    assert _split_to_budget({"2025-03-03": ["a b c d e f g h i j"]}, count, max_tokens=3) == [
+        {"2025-03-03": ["a b c d e f g h i j"]}
+    ]
+
+
+def test_map_reduce_passes_every_partial_summary():
+    words = " ".join(["word"] * 20)
+    entries = (
+        [_entry("2025-03-03", "api", f"api change {i} {words}") for i in range(6)]
+        + [_entry("2025-03-04", "web", f"web change {words}")]
+        + [_entry("2025-03-12", "api", "next week")]
+    )
+    releases = parse_releases_to_txt([{"tag_name": "v1", "published_at": "2025-02-01T00:00:00", "body": "First"}])
+    llm = FakeLlm()
+    result = asyncio.run(map_reduce_actions(llm, parse_entries_to_txt(entries) + "\n\n" + releases, max_tokens=60))
+
+    labels = [re.search(r"Slice: (.+)", prompt).group(1) for prompt in llm.prompts]
+    assert sorted(labels) == sorted([
+        "2025-W10 in api (1/3)", "2025-W10 in api (2/3)", "2025-W10 in api (3/3)",
+        "2025-W10 in web", "2025-W11",
+    ])
+    # The reduce input holds each partial summary under its label, then the releases
+    sections = result.split("\n\n")
+    assert sections[:5] == [
+        f"{label}:\nnotes for {label}"
+        for label in ["2025-W10 in api (1/3)", "2025-W10 in api (2/3)", "2025-W10 in api (3/3)", "2025-W10 in web", "2025-W11"]
+    ]
+    assert result.endswith(releases.strip())
+
+
+def test_map_reduce_without_days_is_a_no_op():
+    llm = FakeLlm()
+    assert asyncio.run(map_reduce_actions(llm, "nothing dated here")) == "nothing dated here"
+    assert llm.prompts == []
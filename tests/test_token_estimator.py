@@ -0,0 +1,63 @@
+from git_recap.utils import parse_entries_to_txt
+from services.token_estimator import (
+    TOKEN_RATIOS,
+    calibrate,
+    estimate_tokens,
+    estimation_errors,
+    get_model_family,
+    upper_bound_tokens,
+)
+
+ENTRIES = [
+    {"type": "commit", "repo": "git-recap", "message": "Fix race condition in file watcher initialization",
+     "timestamp": "2024-05-02T09:00:00+00:00"},
+    {"type": "commit", "repo": "git-recap", "message": "Broken in dcca61c0bc9747a8886bf7a1d790d902c2426ed0",
+     "timestamp": "2024-05-02T10:00:00+00:00"},
+    {"type": "pull_request", "repo": "api", "message": "Add support for custom key bindings", "pr_number": 12,
+     "timestamp": "2024-05-03T09:00:00+00:00"},
+    {"type": "commit_from_pr", "repo": "api", "message": "Refactor parser for better error messages",
+     "pr_title": "Add support for custom key bindings", "timestamp": "2024-05-03T10:00:00+00:00"},
+    {"type": "issue", "repo": "docs", "message": "Traduction française et résumé 日本語のドキュメント",
+     "timestamp": "2024-05-04T09:00:00+00:00"},
+]
+
+# The lines `/actions` sends to the LLM, split as the benchmark does
+SAMPLES = [line for line in parse_entries_to_txt(ENTRIES).splitlines() if line.strip()]
+
+
+def tokenize(text):
+    # Stand-in tokenizer: words, with long words split every 4 characters
+    return [word[i:i + 4] for word in text.split() for i in range(0, len(word), 4)]
+
+
+def test_calibration_bounds_every_sample(monkeypatch):
+    ratio = calibrate(SAMPLES, tokenize)
+    monkeypatch.setitem(TOKEN_RATIOS, "default", ratio)
+    assert estimation_errors(SAMPLES, tokenize)["bound_violations"] == 0
+    # The bound is tight: without its margins some samples exceed it
+    monkeypatch.setitem(TOKEN_RATIOS, "default", ratio._replace(rel_error=0.0, abs_error=0))
+    assert estimation_errors(SAMPLES, tokenize)["bound_violations"] > 0
+
+
+def test_upper_bound_covers_the_measured_error():
+    ratio = TOKEN_RATIOS["deepseek"]
+    estimate = estimate_tokens("x" * 349, "deepseek-chat")
+    assert estimate == 100
+    assert upper_bound_tokens(estimate, "deepseek-chat", count=2) == 136 + 2 * ratio.abs_error
+
+
+def test_model_families():
+    assert get_model_family("gpt-4o-mini") == "openai"
+    assert get_model_family("claude-sonnet") == "anthropic"
+    assert get_model_family(None) == "default"
+
+
+def test_model_family_markers_match_name_parts():
+    assert get_model_family("o3-mini") == "openai"
+    assert get_model_family("openai/o1") == "openai"
+    assert get_model_family("meta-llama/Llama-3.1-8B-Instruct") == "llama"
+    assert get_model_family("gemma2-9b-it") == "gemini"
+    # Markers inside other names do not match
+    assert get_model_family("pro3-chat") == "default"
+    assert get_model_family("kairo1-7b") == "default"
+    assert get_model_family("o3x") == "default"
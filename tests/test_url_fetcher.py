@@ -0,0 +1,461 @@
+import asyncio
+import os
+import subprocess
+import threading
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import patch
+from git_recap.providers.async_git import aiter_git_records, run_git
+from git_recap.providers.git_log import iter_git_records, iter_identities
+from git_recap.providers.mirror_cache import MirrorCache
+from git_recap.providers.multi_url_fetcher import MultiURLFetcher
+from git_recap.providers.url_fetcher import URLFetcher
+
+
+def _git(repo, *args, date=None):
+    env = dict(os.environ)
+    if date:
+        env.update({"GIT_AUTHOR_DATE": date, "GIT_COMMITTER_DATE": date})
+    subprocess.run(
+        ["git", "-C", str(repo), "-c", "user.name=Alice", "-c", "user.email=alice@example.com", *args],
+        check=True,
+        capture_output=True,
+        text=True,
+        env=env
+    )
+
+
+@pytest.fixture
+def source_repo(tmp_path):
+    """Create a local repository with one commit per month of 2025 (Jan-Apr)."""
+    repo = tmp_path / "source-repo"
+    repo.mkdir()
+    _git(repo, "init", "-q", "-b", "main")
+    _git(repo, "config", "uploadpack.allowFilter", "true")
+    for month in range(1, 5):
+        (repo / f"file{month}.txt").write_text(str(month))
+        _git(repo, "add", ".")
+        _git(repo, "commit", "-q", "-m", f"feat: change {month}", date=f"2025-0{month}-01T10:00:00Z")
+    return repo
+
+
+@pytest.fixture
+def make_fetcher(source_repo):
+    """Build URLFetchers over the local source repository."""
+    fetchers = []
+
+    def _make(**kwargs):
+        with patch.object(URLFetcher, "_normalize_url", lambda self, url: url):
+            fetcher = URLFetcher(url=f"file://{source_repo}", **kwargs)
+        fetchers.append(fetcher)
+        return fetcher
+
+    yield _make
+    for fetcher in fetchers:
+        fetcher.clear()
+
+
+def _commit_count(fetcher):
+    result = subprocess.run(
+        ["git", "-C", fetcher.repo_path, "rev-list", "--count", "--all"],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return int(result.stdout.strip())
+
+
+class TestURLFetcherCloneModes:
+    """Tests for partial and date-bounded clones."""
+
+    def test_invalid_clone_mode_raises(self):
+        with pytest.raises(ValueError):
+            URLFetcher(url="https://github.com/owner/repo", clone_mode="sparse")
+
+    @patch("git_recap.providers.url_fetcher.subprocess.run")
+    def test_clone_uses_partial_clone_filter_without_fetch_all(self, mock_run):
+        mock_run.return_value.stdout = "3"
+        fetcher = URLFetcher(url="https://github.com/owner/repo")
+        commands = [call.args[0] for call in mock_run.call_args_list]
+        assert "--filter=tree:0" in commands[0]
+        assert not any("fetch" in command for command in commands)
+        fetcher.clear()
+
+    def test_shallow_clone_since_start_date(self, make_fetcher):
+        fetcher = make_fetcher(start_date=datetime(2025, 3, 15, tzinfo=timezone.utc))
+        assert fetcher.shallow_since is not None
+        assert _commit_count(fetcher) == 1
+        assert [c["message"] for c in fetcher.fetch_commits()] == ["feat: change 4"]
+
+    def test_deepens_on_demand_for_older_queries(self, make_fetcher):
+        fetcher = make_fetcher(start_date=datetime(2025, 3, 15, tzinfo=timezone.utc))
+        fetcher.start_date = datetime(2025, 1, 15, tzinfo=timezone.utc)
+        messages = {c["message"] for c in fetcher.fetch_commits()}
+        assert messages == {"feat: change 2", "feat: change 3", "feat: change 4"}
+
+        fetcher.start_date = None
+        assert len(fetcher.fetch_commits()) == 4
+        assert fetcher.shallow_since is None
+
+    def test_falls_back_to_full_history_when_window_is_empty(self, make_fetcher):
+        fetcher = make_fetcher(start_date=datetime(2030, 1, 1, tzinfo=timezone.utc))
+        assert fetcher.shallow_since is None
+        assert _commit_count(fetcher) == 4
+        assert fetcher.fetch_commits() == []
+
+
+class TestURLFetcherGitLog:
+    """Tests for the streaming git log parser."""
+
+    def test_messages_with_pipes_are_parsed(self, source_repo, make_fetcher):
+        (source_repo / "pipe.txt").write_text("|")
+        _git(source_repo, "add", ".")
+        _git(source_repo, "commit", "-q", "-m", "fix: a | b || c", date="2025-05-01T10:00:00Z")
+        commits = make_fetcher().fetch_commits()
+        assert commits[0]["message"] == "fix: a | b || c"
+        assert commits[0]["author"] == "Alice"
+        assert commits[0]["timestamp"] == datetime(2025, 5, 1, 10, tzinfo=timezone.utc)
+        assert {c["repo"] for c in commits} == {"source-repo"}
+
+    def test_filters_by_date_and_author(self, make_fetcher):
+        fetcher = make_fetcher()
+        fetcher.start_date = datetime(2025, 1, 15, tzinfo=timezone.utc)
+        fetcher.end_date = datetime(2025, 3, 15, tzinfo=timezone.utc)
+        assert [c["message"] for c in fetcher.fetch_commits()] == ["feat: change 3", "feat: change 2"]
+        fetcher.authors = ["Bob", "Alice"]
+        assert len(fetcher.fetch_commits()) == 2
+        fetcher.authors = ["Bob"]
+        assert fetcher.fetch_commits() == []
+
+    def test_iter_commits_streams_entries(self, make_fetcher):
+        commits = make_fetcher().iter_commits()
+        assert next(commits)["message"] == "feat: change 4"
+        commits.close()
+
+
+class TestURLFetcherBranches:
+    """Tests for local branch listing and branch diffs."""
+
+    @pytest.fixture
+    def branched_repo(self, source_repo):
+        _git(source_repo, "checkout", "-q", "-b", "feature")
+        _git(source_repo, "commit", "-q", "--allow-empty", "-m", "feat: on feature | 1", date="2025-05-01T10:00:00Z")
+        _git(source_repo, "commit", "-q", "--allow-empty", "-m", "feat: on feature 2", date="2025-05-02T10:00:00Z")
+        _git(source_repo, "checkout", "-q", "main")
+        _git(source_repo, "commit", "-q", "--allow-empty", "-m", "fix: on main", date="2025-05-03T10:00:00Z")
+        _git(source_repo, "branch", "merged", "HEAD~1")
+        return source_repo
+
+    def test_get_branches(self, branched_repo, make_fetcher):
+        assert make_fetcher().get_branches() == ["feature", "main", "merged"]
+
+    def test_get_branches_from_mirror(self, branched_repo, make_fetcher, tmp_path):
+        fetcher = make_fetcher(mirror_cache=MirrorCache(str(tmp_path / "mirrors")))
+        assert fetcher.get_branches() == ["feature", "main", "merged"]
+
+    def test_shallow_clone_keeps_every_branch(self, branched_repo, make_fetcher):
+        # --shallow-since implies --single-branch, which would drop "feature"
+        fetcher = make_fetcher(start_date=datetime(2025, 4, 15, tzinfo=timezone.utc))
+        assert fetcher.shallow_since is not None
+        assert fetcher.get_branches() == ["feature", "main", "merged"]
+        assert [c["message"] for c in fetcher.fetch_commits()] == [
+            "fix: on main", "feat: on feature 2", "feat: on feature | 1"
+        ]
+
+        async_fetcher = make_fetcher(start_date=datetime(2025, 4, 15, tzinfo=timezone.utc), clone=False)
+        asyncio.run(async_fetcher.aclone())
+        assert async_fetcher.get_branches() == ["feature", "main", "merged"]
+
+    def test_valid_target_branches(self, branched_repo, make_fetcher):
+        fetcher = make_fetcher()
+        assert fetcher.get_valid_target_branches("feature") == ["main", "merged"]
+        assert fetcher.get_valid_target_branches("merged") == []
+        with pytest.raises(ValueError):
+            fetcher.get_valid_target_branches("missing")
+
+    def test_compare_branches(self, branched_repo, make_fetcher):
+        comparison = make_fetcher().compare_branches("feature", "main")
+        assert comparison["ahead"] == 2
+        assert comparison["behind"] == 1
+        assert [c["message"] for c in comparison["commits"]] == ["feat: on feature 2", "feat: on feature | 1"]
+
+    def test_branch_diff_deepens_shallow_clones(self, branched_repo, make_fetcher):
+        fetcher = make_fetcher(start_date=datetime(2025, 5, 2, tzinfo=timezone.utc))
+        commits = fetcher.fetch_branch_diff_commits("feature", "main")
+        assert [c["message"] for c in commits] == ["feat: on feature 2", "feat: on feature | 1"]
+
+
+class TestMultiURLFetcher:
+    """Tests for sessions over several repository URLs."""
+
+    @pytest.fixture
+    def other_repo(self, tmp_path):
+        repo = tmp_path / "other-repo"
+        repo.mkdir()
+        _git(repo, "init", "-q", "-b", "main")
+        _git(repo, "commit", "-q", "--allow-empty", "-m", "feat: other", date="2025-02-15T10:00:00Z")
+        return repo
+
+    @pytest.fixture
+    def make_multi_fetcher(self):
+        fetchers = []
+
+        def _make(repos, **kwargs):
+            with patch.object(URLFetcher, "_normalize_url", lambda self, url: url):
+                fetcher = MultiURLFetcher(urls=[f"file://{repo}" for repo in repos], **kwargs)
+            fetchers.append(fetcher)
+            return fetcher
+
+        yield _make
+        for fetcher in fetchers:
+            fetcher.clear()
+
+    def test_merges_repositories_into_one_stream(self, source_repo, other_repo, make_multi_fetcher):
+        fetcher = make_multi_fetcher([source_repo, other_repo])
+        assert fetcher.repos_names == ["source-repo", "other-repo"]
+        fetcher.start_date = datetime(2025, 1, 15, tzinfo=timezone.utc)
+        assert [(c["repo"], c["message"]) for c in fetcher.fetch_commits()] == [
+            ("source-repo", "feat: change 4"),
+            ("source-repo", "feat: change 3"),
+            ("other-repo", "feat: other"),
+            ("source-repo", "feat: change 2"),
+        ]
+        fetcher.repo_filter = ["other-repo"]
+        assert [c["message"] for c in fetcher.fetch_commits()] == ["feat: other"]
+
+    def test_clones_concurrently(self, source_repo, other_repo, make_multi_fetcher):
+        barrier = threading.Barrier(2, timeout=10)
+        clone_repo = URLFetcher._clone_repo
+
+        def waiting_clone(self):
+            barrier.wait()
+            clone_repo(self)
+
+        with patch.object(URLFetcher, "_clone_repo", waiting_clone):
+            fetcher = make_multi_fetcher([source_repo, other_repo], max_workers=2)
+        assert len(fetcher.fetchers) == 2
+
+    def test_failed_clone_cleans_up_the_others(self, source_repo, tmp_path, make_multi_fetcher):
+        with patch.object(URLFetcher, "clear", autospec=True, side_effect=URLFetcher.clear) as clear:
+            with pytest.raises(RuntimeError, match="missing-repo"):
+                make_multi_fetcher([source_repo, tmp_path / "missing-repo"])
+        assert clear.call_count >= 1
+
+    def test_clashing_names_are_disambiguated(self, tmp_path, make_multi_fetcher):
+        repos = []
+        for owner in ("alice", "bob"):
+            repo = tmp_path / owner / "app"
+            repo.mkdir(parents=True)
+            _git(repo, "init", "-q", "-b", "main")
+            _git(repo, "commit", "-q", "--allow-empty", "-m", f"feat: {owner}", date="2025-02-15T10:00:00Z")
+            repos.append(repo)
+        fetcher = make_multi_fetcher(repos)
+        assert fetcher.repos_names == ["alice/app", "bob/app"]
+        assert sorted((c["repo"], c["message"]) for c in fetcher.fetch_commits()) == [
+            ("alice/app", "feat: alice"),
+            ("bob/app", "feat: bob"),
+        ]
+        fetcher.repo_filter = ["bob/app"]
+        assert [c["message"] for c in fetcher.fetch_commits()] == ["feat: bob"]
+
+    def test_path_name_falls_back_to_the_url(self):
+        fetcher = MultiURLFetcher.__new__(MultiURLFetcher)
+        same = [URLFetcher.__new__(URLFetcher) for _ in range(2)]
+        for clone, url in zip(same, ["https://host/a/app", "https://host/a/app.git"]):
+            clone.url, clone.repo_path, clone.repo_name = url, "/clone", None
+        fetcher._disambiguate(same)
+        assert [clone.repos_names[0] for clone in same] == ["https://host/a/app", "https://host/a/app.git"]
+
+
+class TestURLFetcherAsync:
+    """Tests for the non-blocking git operations."""
+
+    def _make(self, source_repo, **kwargs):
+        with patch.object(URLFetcher, "_normalize_url", lambda self, url: url):
+            return URLFetcher(url=f"file://{source_repo}", clone=False, **kwargs)
+
+    def test_aclone_and_afetch_commits(self, source_repo):
+        fetcher = self._make(source_repo, start_date=datetime(2025, 3, 15, tzinfo=timezone.utc))
+
+        async def run():
+            await fetcher.aclone()
+            first = [c["message"] for c in await fetcher.afetch_commits()]
+            fetcher.start_date = datetime(2025, 1, 15, tzinfo=timezone.utc)
+            return first, await fetcher.aget_authored_messages()
+
+        try:
+            first, messages = asyncio.run(run())
+            assert first == ["feat: change 4"]
+            assert [m["message"] for m in messages] == ["feat: change 2", "feat: change 3", "feat: change 4"]
+            assert messages == fetcher.get_authored_messages()
+        finally:
+            fetcher.clear()
+
+    def test_cancelled_clone_kills_git_and_cleans_up(self, source_repo):
+        fetcher = self._make(source_repo)
+        started = []
+
+        async def slow_run_git(args, timeout=None):
+            started.append(args)
+            await asyncio.sleep(10)
+
+        async def run():
+            with patch("git_recap.providers.url_fetcher.run_git", slow_run_git):
+                task = asyncio.ensure_future(fetcher.aclone())
+                await asyncio.sleep(0.05)
+                temp_dir = fetcher.temp_dir
+                task.cancel()
+                with pytest.raises(asyncio.CancelledError):
+                    await task
+                return temp_dir
+
+        temp_dir = asyncio.run(run())
+        assert started and not os.path.exists(temp_dir)
+        assert fetcher.repo_path is None
+
+    def test_run_git_kills_process_on_cancel(self, tmp_path):
+        marker = tmp_path / "done"
+
+        async def run():
+            task = asyncio.ensure_future(run_git(["git", "-c", f"alias.slow=!sleep 2 && touch {marker}", "slow"]))
+            await asyncio.sleep(0.2)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            await asyncio.sleep(2.5)
+
+        asyncio.run(run())
+        assert not marker.exists()
+
+    def test_record_streams_raise_on_timeout(self, tmp_path):
+        # Writes a first record, then hangs: the stream must fail, not end early
+        args = ["git", "-c", "alias.hang=!printf 'first\\0' && sleep 2", "hang"]
+
+        async def run():
+            records = []
+            with pytest.raises(subprocess.TimeoutExpired):
+                async for fields in aiter_git_records(args, timeout=0.5):
+                    records.append(fields)
+            return records
+
+        assert asyncio.run(run()) == [[b"first"]]
+        records = []
+        with pytest.raises(subprocess.TimeoutExpired):
+            for fields in iter_git_records(args, timeout=0.5):
+                records.append(fields)
+        assert records == [[b"first"]]
+
+    def test_multi_url_aclone(self, source_repo, tmp_path):
+        other = tmp_path / "other-repo"
+        other.mkdir()
+        _git(other, "init", "-q", "-b", "main")
+        _git(other, "commit", "-q", "--allow-empty", "-m", "feat: other", date="2025-02-15T10:00:00Z")
+        with patch.object(URLFetcher, "_normalize_url", lambda self, url: url):
+            fetcher = MultiURLFetcher(urls=[f"file://{source_repo}", f"file://{other}"], clone=False)
+        try:
+            asyncio.run(fetcher.aclone())
+            assert fetcher.repos_names == ["source-repo", "other-repo"]
+            messages = asyncio.run(fetcher.aget_authored_messages())
+            assert [m["message"] for m in messages][:3] == ["feat: change 1", "feat: change 2", "feat: other"]
+        finally:
+            fetcher.clear()
+
+    def test_multi_url_aclone_disambiguates_names(self, tmp_path):
+        repos = []
+        for owner in ("alice", "bob"):
+            repo = tmp_path / owner / "app.git"
+            repo.mkdir(parents=True)
+            _git(repo, "init", "-q", "-b", "main")
+            _git(repo, "commit", "-q", "--allow-empty", "-m", f"feat: {owner}", date="2025-02-15T10:00:00Z")
+            repos.append(repo)
+        with patch.object(URLFetcher, "_normalize_url", lambda self, url: url):
+            fetcher = MultiURLFetcher(urls=[f"file://{repo}" for repo in repos], clone=False)
+        try:
+            asyncio.run(fetcher.aclone())
+            assert fetcher.repos_names == ["alice/app", "bob/app"]
+            messages = asyncio.run(fetcher.aget_authored_messages())
+            assert sorted((m["repo"], m["message"]) for m in messages) == [
+                ("alice/app", "feat: alice"),
+                ("bob/app", "feat: bob"),
+            ]
+        finally:
+            fetcher.clear()
+
+    def test_multi_url_aclone_is_bounded_by_max_workers(self, tmp_path):
+        running, peak = [0], [0]
+
+        async def counting_aclone(self):
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+            await asyncio.sleep(0.01)
+            running[0] -= 1
+            self.repo_path = str(tmp_path)
+
+        with patch.object(URLFetcher, "_normalize_url", lambda self, url: url):
+            fetcher = MultiURLFetcher(urls=[f"file://{tmp_path}/repo-{i}" for i in range(4)], max_workers=2, clone=False)
+        with patch.object(URLFetcher, "aclone", counting_aclone):
+            asyncio.run(fetcher.aclone())
+        assert peak[0] == 2
+        assert fetcher.repos_names == ["repo-0", "repo-1", "repo-2", "repo-3"]
+
+    def test_multi_url_orders_by_author_date(self, source_repo, tmp_path):
+        other = tmp_path / "other-repo"
+        other.mkdir()
+        _git(other, "init", "-q", "-b", "main")
+        _git(other, "commit", "-q", "--allow-empty", "-m", "feat: other", date="2025-04-15T10:00:00Z")
+        # Cherry-picked after the April commit, authored in January
+        subprocess.run(
+            ["git", "-C", str(source_repo), "-c", "user.name=Alice", "-c", "user.email=alice@example.com",
+             "commit", "-q", "--allow-empty", "-m", "fix: picked"],
+            check=True,
+            env={**os.environ, "GIT_AUTHOR_DATE": "2025-01-15T10:00:00Z", "GIT_COMMITTER_DATE": "2025-05-01T10:00:00Z"}
+        )
+        with patch.object(URLFetcher, "_normalize_url", lambda self, url: url):
+            fetcher = MultiURLFetcher(urls=[f"file://{source_repo}", f"file://{other}"])
+        try:
+            expected = ["feat: change 1", "fix: picked", "feat: change 2", "feat: change 3", "feat: change 4", "feat: other"]
+            messages = asyncio.run(fetcher.aget_authored_messages())
+            assert [m["message"] for m in messages] == expected
+            assert [c["message"] for c in fetcher.fetch_commits()] == expected[::-1]
+        finally:
+            fetcher.clear()
+
+
+class TestURLFetcherAuthors:
+    """Tests for the cached, mailmap-aware author index."""
+
+    @pytest.fixture
+    def authors_repo(self, source_repo):
+        subprocess.run(
+            ["git", "-C", str(source_repo), "-c", "user.name=A. Smith", "-c", "user.email=ALICE@example.com",
+             "commit", "-q", "--allow-empty", "-m", "chore: other spelling"],
+            check=True
+        )
+        subprocess.run(
+            ["git", "-C", str(source_repo), "-c", "user.name=bob", "-c", "user.email=bob@old.example.com",
+             "commit", "-q", "--allow-empty", "-m", "chore: old email"],
+            check=True
+        )
+        (source_repo / ".mailmap").write_text("Bob Jones <bob@example.com> <bob@old.example.com>\n")
+        _git(source_repo, "add", ".mailmap")
+        _git(source_repo, "commit", "-q", "-m", "chore: mailmap")
+        return source_repo
+
+    def test_authors_are_mailmapped_and_deduplicated(self, authors_repo, make_fetcher):
+        authors = make_fetcher().get_authors([])
+        assert authors == [
+            {"name": "Alice", "email": "alice@example.com"},
+            {"name": "Bob Jones", "email": "bob@example.com"},
+        ]
+
+    def test_author_index_is_cached_until_refs_move(self, authors_repo, make_fetcher):
+        fetcher = make_fetcher()
+        with patch("git_recap.providers.git_log.iter_identities", wraps=iter_identities) as walk:
+            first = fetcher.get_authors([])
+            assert fetcher.get_authors([]) == first
+            assert walk.call_count == 1
+
+            _git(authors_repo, "commit", "-q", "--allow-empty", "-m", "feat: more")
+            subprocess.run(["git", "-C", fetcher.repo_path, "fetch", "-q", "origin"], check=True)
+            fetcher.get_authors([])
+            assert walk.call_count == 2
@@ -0,0 +1,85 @@
+import asyncio
+import logging
+from services.warm_up import SessionWarmUp
+
+
+def test_one_warm_up_per_session():
+    warm_ups = SessionWarmUp()
+    runs = []
+
+    async def warm():
+        runs.append(1)
+        await asyncio.sleep(0.01)
+
+    async def run():
+        assert warm_ups.start("s1", warm)
+        assert not warm_ups.start("s1", warm)
+        await asyncio.gather(*warm_ups._tasks.values())
+        await asyncio.sleep(0)
+        # Finished warm-ups are forgotten, so the session can be warmed up again
+        assert warm_ups.start("s1", warm)
+        await asyncio.gather(*warm_ups._tasks.values())
+
+    asyncio.run(run())
+    assert runs == [1, 1]
+    assert warm_ups.stats() == {"running": 0, "started": 2, "skipped": 1, "cancelled": 0}
+
+
+def test_concurrency_limit_skips_new_sessions():
+    warm_ups = SessionWarmUp(max_concurrent=1)
+
+    async def run():
+        assert warm_ups.start("s1", lambda: asyncio.sleep(10))
+        assert not warm_ups.start("s2", lambda: asyncio.sleep(10))
+        warm_ups.cancel("s1")
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+    assert warm_ups.stats() == {"running": 0, "started": 1, "skipped": 1, "cancelled": 1}
+
+
+def test_cancel_stops_the_running_warm_up():
+    warm_ups = SessionWarmUp()
+
+    async def run():
+        warm_ups.start("s1", lambda: asyncio.sleep(10))
+        task = warm_ups._tasks["s1"]
+        warm_ups.cancel("s1")
+        warm_ups.cancel("s1")
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        return task
+
+    assert asyncio.run(run()).cancelled()
+    assert warm_ups.stats()["cancelled"] == 1
+
+
+def test_cancel_from_another_thread():
+    # Session expiry hooks run on the sweeper thread
+    warm_ups = SessionWarmUp()
+
+    async def run():
+        warm_ups.start("s1", lambda: asyncio.sleep(10))
+        task = warm_ups._tasks["s1"]
+        await asyncio.to_thread(warm_ups.cancel, "s1")
+        await asyncio.sleep(0)
+        return task
+
+    assert asyncio.run(run()).cancelled()
+
+
+def test_failures_are_logged_not_raised(caplog):
+    warm_ups = SessionWarmUp()
+
+    async def fail():
+        raise RuntimeError("provider down")
+
+    async def run():
+        warm_ups.start("s1", fail)
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+    with caplog.at_level(logging.WARNING, logger="services.warm_up"):
+        asyncio.run(run())
+    assert "provider down" in caplog.text
+    assert warm_ups.stats()["running"] == 0